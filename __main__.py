@@ -21,9 +21,79 @@ Moving any of these folders or files will prevent the game from working properly
 Author: Walker M. White (wmw2)
 Date:   November 1, 2020
 """
-from consts import *
-from app import *
+import consts
+import sys
+
+
+def parse_args(argv):
+    """
+    Changes the constants in consts.py from the command line arguments of the game
+
+    sys.argv is a list of the command line arguments when you run python. These
+    arguments are everything after the word python. So if you start the game typing
+
+        python froggit default.json 1
+
+    Python puts ['froggit', 'default.json', '1'] into sys.argv.  The first argument
+    after the script changes the constant DEFAULT_LEVEL.  This is the level file to
+    be used when you start the game.
+
+    The second argument is the FROG_SPEED, which is the amount of time between move
+    steps.  A large value means a much slower moving frog.
+
+    The optional third argument is the UPDATE_RATE.  Giving it a value (such as 120)
+    runs the game in fixed-step mode, so that it plays the same on fast and slow
+    machines.
+
+    Finally, the options --record=FILE and --replay=FILE (which can go anywhere) set
+    the RECORD_FILE and REPLAY_FILE, and the option --pixels turns on PIXEL_COLLISIONS.
+    They are not counted as arguments above.
+
+    This must be called before the rest of the game is imported, since the other
+    modules copy the constants when they import consts.py.
+
+    Parameter argv: The command line arguments (with the script name)
+    Precondition: argv is a list of strings
+    """
+    args = []
+    for arg in argv:
+        if arg.startswith('--record='):
+            consts.RECORD_FILE = arg[len('--record='):]
+        elif arg.startswith('--replay='):
+            consts.REPLAY_FILE = arg[len('--replay='):]
+        elif arg == '--pixels':
+            consts.PIXEL_COLLISIONS = True
+        else:
+            args.append(arg)
+
+    try:
+        file = args[1]
+        if file[-5:].lower() == '.json':
+            consts.DEFAULT_LEVEL = file
+        else:
+            consts.DEFAULT_LEVEL = file+'.json'
+    except:
+        pass # Use original value
+
+    try:
+        value = float(args[2])
+        consts.FROG_SPEED = value
+    except:
+        pass # Use original value
+
+    try:
+        value = float(args[3])
+        if value > 0:
+            consts.UPDATE_RATE = value
+    except:
+        pass # Use original value
+
 
 # Application code
 if __name__ == '__main__':
-    Froggit(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    parse_args(sys.argv)
+    from consts import *
+    from app import *
+    step = None if UPDATE_RATE is None else 1.0/UPDATE_RATE
+    Froggit(width=GAME_WIDTH,height=GAME_HEIGHT,timestep=step,maxsteps=MAX_UPDATES,
+            voices=SOUND_VOICES).run()
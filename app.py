@@ -12,13 +12,17 @@ Nicholas J. Runje (njr85)
 from consts import *
 from game2d import *
 from level import *
+from simulation import Session
+from levelcache import load_level, level_images
 import introcs
 
 from kivy.logger import Logger
 
 
 # PRIMARY RULE: Froggit can only access attributes in level.py via getters/setters
-# Froggit is NOT allowed to access anything in lanes.py or models.py.
+# Froggit is NOT allowed to access anything in lanes.py or models.py.  The only thing
+# it uses from simulation.py is the Session, which decides the game state, and the
+# only things it uses from levelcache.py are load_level and level_images.
 
 
 class Froggit(GameApp):
@@ -69,8 +73,19 @@ class Froggit(GameApp):
 
     # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
     #
-    # Attribute _determineKeyPress: Indicates whether the key 'S' is pressed down
-    # Invariant: _determineKeyPress is a boolean
+    # Attribute _session: The game states, run without drawing (see simulation.py)
+    # Invariant: _session is a Session, and _state is always its state
+    #
+    # Attribute _leveldata: The level to play
+    # Invariant: _leveldata is a LevelData (see levelcache.py), or None if the level
+    #            file is not valid
+    #
+    # Attribute _preloader: Loads the images, fonts and sounds while the title shows
+    # Invariant: _preloader is a GPreloader
+    #
+    # Attribute _sounds: The sound effect for each event of the simulation
+    # Invariant: _sounds is a SoundLibrary with the keys of EVENT_SOUNDS, or None if
+    #            no level is currently active
     #
     # Attribute _determineUnpauseKeyPress: Indicates whether key 'C' is pressed
     # Invariant: _determineUnpauseKeyPress is a boolean
@@ -81,6 +96,9 @@ class Froggit(GameApp):
     # Attribute _youlosemessage: Displays label after user has lost the game
     # Invariant: _youlosemessage is a GLabel, or None if no message to display
     #
+    # Attribute _youwinmessage: Displays label after user has won the game
+    # Invariant: _youwinmessage is a GLabel, or None if no message to display
+    #
     # DO NOT MAKE A NEW INITIALIZER!
 
     # THREE MAIN GAMEAPP METHODS
@@ -99,6 +117,10 @@ class Froggit(GameApp):
         _text) saying that the user should press a key to play a game.
         """
 
+        #Set the drawing layers
+        for (name,static) in LAYERS:
+            self.view.add_layer(name,static)
+
         #Set loading title
         #Find Center
         new_x = self.width//2
@@ -116,9 +138,37 @@ class Froggit(GameApp):
 
         #Set level
         self._level = None
+        self._sounds = None
+        self._pausemessage = None
+        self._youlosemessage = None
+        self._youwinmessage = None
+
+        #Set up recording or replay of the key presses
+        level = DEFAULT_LEVEL
+        speed = FROG_SPEED
+        pixels = PIXEL_COLLISIONS
+        if not REPLAY_FILE is None:
+            self.input.replay(REPLAY_FILE)
+            level = self.input.info.get('level',level)
+            speed = self.input.info.get('speed',speed)
+            pixels = self.input.info.get('pixels',pixels)
+        elif not RECORD_FILE is None:
+            self.input.record(RECORD_FILE,{'level':level,'speed':speed,'pixels':pixels})
 
         #Set the state
+        self._leveldata = load_level(level)
+        self._session = Session(self._leveldata,speed,pixels)
         self._state = STATE_INACTIVE
+        if self._leveldata is None:
+            self._text.text = "LEVEL "+level+" IS NOT VALID (SEE validate.py)"
+
+        #Start loading the assets in the background
+        images = [FROG_SAFE,FROG_HEAD]
+        if not self._leveldata is None:
+            images = level_images(self._leveldata)+images
+        fonts = [(ALLOY_FONT,size) for size in (ALLOY_LARGE,ALLOY_MEDIUM,ALLOY_SMALL)]
+        sounds = list(EVENT_SOUNDS.values())
+        self._preloader = GPreloader(images,fonts,sounds)
 
     def update(self,dt):
         """
@@ -139,7 +189,8 @@ class Froggit(GameApp):
         STATE_INACTIVE: This is the state when the application first opens.
         It is a paused state, waiting for the player to start the game.  It
         displays the title and a simple message on the screen. The application
-        remains in this state so long as the player never presses a key.
+        remains in this state so long as the player never presses a key.  The
+        images, fonts and sounds are loaded in the background in the meantime.
 
         STATE_LOADING: This is the state that creates a new level and shows it on
         the screen. The application switches to this state if the state was
@@ -169,42 +220,30 @@ class Froggit(GameApp):
         You are allowed to add more states if you wish. Should you do so, you should
         describe them here.
 
+        The state changes themselves are made by the Session in simulation.py, so
+        that a recorded game can be played back without a window.  This method only
+        sets up what is drawn for each state.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
-        if (self._determineKeyPress() == True) and \
-        (self._state == STATE_INACTIVE):
+        if self._leveldata is None:
+            return      # The level file is not valid, so the game cannot start
+        self._session.update(dt,self.input)
+        self._state = self._session.getState()
+
+        if (self._state != STATE_INACTIVE) and (self._level is None):
             self._methodFrogStateInactive()
+            self._preloader.finish()
+            self._methodLoadLevel()
 
-        if (self._state == STATE_LOADING):
-            dict_level = self.load_json(DEFAULT_LEVEL)
-            level_width = dict_level['size'][0] * GRID_SIZE
-            level_height = (dict_level['size'][1] + 1) * GRID_SIZE
-            self.width = level_width
-            self.height = level_height
-            self._level = Level(dict_level,level_width,level_height)
-            self._state = STATE_ACTIVE
-
-        if self._state == STATE_ACTIVE:
-            if (self._level.getFrogVisible() == True) and \
-            (self._level.getWonGame() == False):
-                self._level.update(dt,self.input)
-            elif (self._level.getFrogVisible() == False) and \
-            (self._level.getFrogLives() > 0):
-                self._state = STATE_PAUSED
-            else:
-                self._state = STATE_COMPLETE
+        for event in self._session.getEvents():
+            self._sounds[event].play()
 
         if (self._determineUnpauseKeyPress() == False) and \
         (self._state == STATE_PAUSED):
             self._methodStatePausedandUnpressed()
 
-        if (self._determineUnpauseKeyPress() == True) and \
-        (self._state == STATE_PAUSED):
-            self._level.setFrogOriginalLocation()
-            self._level.setFrogVisible(True)
-            self._state = STATE_ACTIVE
-
         if self._state == STATE_COMPLETE:
             self._methodStateComplete()
 
@@ -220,17 +259,25 @@ class Froggit(GameApp):
         getters for these attributes or you need to add a draw method to
         those two classes.  We suggest the latter.  See the example subcontroller.py
         from the lesson videos.
+
+        Everything is drawn to one of the layers in LAYERS (see consts.py), which
+        start adds to the view.  This also lets the preloader finish a few more of
+        the assets, since there is exactly one draw for every animation frame (while
+        update may be called any number of times).
         """
+        if not self._preloader.done:
+            self._preloader.step()
+
         if self._state == STATE_INACTIVE:
-            self._title.draw(self.view)
-            self._text.draw(self.view)
+            self._title.draw(self.view,LAYER_HUD)
+            self._text.draw(self.view,LAYER_HUD)
 
         if self._state == STATE_ACTIVE:
-            self._level.draw(self.view)
+            self._level.draw(self.view,self.interpolation)
 
         if self._state == STATE_PAUSED:
             self._level.draw(self.view)
-            self._pausemessage.draw(self.view)
+            self._pausemessage.draw(self.view,LAYER_HUD)
 
         if self._state == STATE_CONTINUE:
             pass
@@ -238,15 +285,20 @@ class Froggit(GameApp):
         if (self._state == STATE_COMPLETE):
             self._level.draw(self.view)
             if self._level.getWonGame() == False:
-                self._youlosemessage.draw(self.view)
+                self._youlosemessage.draw(self.view,LAYER_HUD)
             elif self._level.getWonGame() == True:
-                self._youwinmessage.draw(self.view)
+                self._youwinmessage.draw(self.view,LAYER_HUD)
 
     # HELPER METHODS FOR THE STATES GO HERE
     def _methodStateComplete(self):
         """
         Displays the type of message for ending game
+
+        The message is only made once, so the view does not have to replace it on
+        every frame.
         """
+        if (self._youlosemessage != None) or (self._youwinmessage != None):
+            return
         if self._level.getWonGame() == False:
             self._youlosemessage = GLabel(text="YOU ARE A LOSER!")
             self._youlosemessage.font_name = ALLOY_FONT
@@ -263,7 +315,12 @@ class Froggit(GameApp):
     def _methodStatePausedandUnpressed(self):
         """
         Displays the paused text to continue
+
+        The message is only made once, so the view does not have to replace it on
+        every frame.
         """
+        if self._pausemessage != None:
+            return
         self._pausemessage = GLabel(text="PRESS 'C' TO CONTINUE")
         self._pausemessage.font_name = ALLOY_FONT
         self._pausemessage.font_size = ALLOY_SMALL
@@ -272,22 +329,26 @@ class Froggit(GameApp):
 
     def _methodFrogStateInactive(self):
         """
-        Sets the properties when self._state == STATE_INACTIVE
+        Removes the title and text once the game leaves STATE_INACTIVE
         """
         self._title = None
         self._text = None
-        self._state = STATE_LOADING
 
-    def _determineKeyPress(self):
+    def _methodLoadLevel(self):
         """
-        Returns a boolean indicating whether the key 'S' is currently held down.
+        Creates the Level for the session's simulation, resizes the window and loads
+        the sound effects for the events of the simulation
         """
-        change = self.input.is_key_down('s')
-
-        if change:
-            return True
-        else:
-            return False
+        sim = self._session.getSimulation()
+        level_width = sim.getWidth()
+        level_height = sim.getHeight()
+        self.width = level_width
+        self.height = level_height
+        self._level = Level(self._leveldata,level_width,level_height,sim)
+
+        self._sounds = SoundLibrary()
+        for event in EVENT_SOUNDS:
+            self._sounds[event] = EVENT_SOUNDS[event]
 
     def _determineUnpauseKeyPress(self):
         """
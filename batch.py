@@ -0,0 +1,310 @@
+"""
+Batch runner for Froggit
+
+This module plays Froggit levels many times over without a window, to measure how a
+level plays.  Each run is a level file together with an input script, which is either
+a random seed (the frog hops around at random) or a recording saved with --record.
+The runs are spread over a pool of worker processes, and the results come back in
+batches as soon as they are done.
+
+To run every level 1000 times with random input, type
+
+    python batch.py --runs=1000
+
+You can also list the level files (and recordings) to use on the command line, and
+add --pixels to play the random scripts with pixel collisions.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+from consts import *
+from simulation import *
+import concurrent.futures
+import multiprocessing
+import random
+import sys
+import os
+
+# PRIMARY RULE: The batch runner is only allowed to access the simulation (and
+# consts.py).  Like the simulation, it must never import game2d or Kivy.
+
+# The time step for scripts that do not come with their own
+BATCH_STEP  = 1/60
+# The number of seconds a run may take before it is stopped
+BATCH_LIMIT = 120.0
+# The number of runs each worker does before sending its results back
+BATCH_SIZE  = 64
+
+# The keys that a random script presses
+RANDOM_KEYS = ('w','a','s','d')
+# The chance that a random script changes keys at each step
+RANDOM_CHANGE = 0.1
+
+# The compiled levels in a worker process, by file name
+_LEVELS = None
+
+
+def random_steps(seed,dt=BATCH_STEP):
+    """
+    Yields the steps (dt, changes) of a random input script
+
+    The script presses 'S' to start the game and holds down 'C', so that the game
+    continues right after every lost life.  After that, it holds down at most one
+    direction key at a time, switching keys at random.
+
+    Parameter seed: The seed for the random choices
+    Precondition: seed is an int
+
+    Parameter dt: The time step
+    Precondition: dt is a number (int or float) > 0
+    """
+    rand = random.Random(seed)
+    yield (dt,['+s','+c'])
+    yield (dt,['-s'])
+    held = None
+    while True:
+        changes = []
+        if rand.random() < RANDOM_CHANGE:
+            if not held is None:
+                changes.append('-'+held)
+            held = rand.choice(RANDOM_KEYS+(None,))
+            if not held is None:
+                changes.append('+'+held)
+        yield (dt,changes)
+
+
+def simulate(level,script,limit=BATCH_LIMIT,pixels=PIXEL_COLLISIONS):
+    """
+    Returns the result of playing a level with an input script
+
+    The result is a dictionary with the following keys:
+
+        'won':      whether every exit was filled
+        'deaths':   a list with the number of lives lost in each lane, bottom to top
+        'exittime': the level time when a frog first reached an exit, or None
+        'time':     the level time when the run ended
+
+    The run ends when the game is complete, the script runs out, or the level time
+    reaches limit.  A recording is played with the frog speed and the collision mode
+    that it was recorded with, as in the function replay.
+
+    Parameter level: The level to play, compiled or as read from the JSON file
+    Precondition: level is a LevelData or a valid JSON level
+
+    Parameter script: The input script
+    Precondition: script is an int (a random seed) or the path to a recording
+
+    Parameter limit: The longest level time to play, in seconds
+    Precondition: limit is a number (int or float) > 0
+
+    Parameter pixels: Whether a random script uses pixel collisions
+    Precondition: pixels is a bool
+    """
+    speed = FROG_SPEED
+    if type(script) == int:
+        steps = random_steps(script)
+    else:
+        (info,steps) = load_recording(script)
+        speed = info['speed']
+        pixels = info['pixels']
+
+    if not isinstance(level,LevelData):
+        level = compile_level(level)
+    session = Session(level,speed,pixels)
+    keys = ScriptedInput()
+    deaths = [0]*level.getLaneCount()
+    exittime = None
+    sim = None
+    for (dt,changes) in steps:
+        keys.apply(changes)
+        lives = FROG_LIVES if sim is None else sim.getFrogLives()
+        session.update(dt,keys)
+        sim = session.getSimulation()
+        if sim is None:
+            continue
+
+        lost = lives-sim.getFrogLives()
+        if lost > 0:
+            row = int(sim.getFrog().y//GRID_SIZE)
+            deaths[min(max(row,0),len(deaths)-1)] += lost
+        if exittime is None:
+            if any(len(lane.getListofSafe()) > 0 for lane in sim.getLanes()):
+                exittime = sim.getTime()
+        if session.getState() == STATE_COMPLETE or sim.getTime() >= limit:
+            break
+
+    return {'won': False if sim is None else sim.getWonGame(), 'deaths': deaths,
+            'exittime': exittime, 'time': 0.0 if sim is None else sim.getTime()}
+
+
+def run(levels,scripts,workers=None,batchsize=BATCH_SIZE,limit=BATCH_LIMIT,
+        pixels=PIXEL_COLLISIONS):
+    """
+    Yields lists of results from playing every level with every script
+
+    Each worker process loads the compiled levels once when it starts.  As they are
+    memory-mapped from the level cache, the workers share them instead of parsing
+    their own copies.  The runs are then sent to the workers in batches of batchsize, and each
+    batch is yielded as a list as soon as it is done (so not in order).  Every result
+    is a dictionary as returned by simulate, with two more keys: 'level' (the level
+    file) and 'script' (the script).
+
+    Parameter levels: The level files to play
+    Precondition: levels is a list of JSON level files in the JSON folder
+
+    Parameter scripts: The input scripts to play each level with
+    Precondition: scripts is a list of ints (random seeds) and recording paths
+
+    Parameter workers: The number of worker processes, or None for one per core
+    Precondition: workers is an int > 0 or None
+
+    Parameter batchsize: The number of runs in a batch
+    Precondition: batchsize is an int > 0
+
+    Parameter limit: The longest level time to play, in seconds
+    Precondition: limit is a number (int or float) > 0
+
+    Parameter pixels: Whether the random scripts use pixel collisions
+    Precondition: pixels is a bool
+    """
+    for name in levels:
+        load_level(name)    # Compile the levels that are not in the cache yet
+    tasks = [(name,script) for name in levels for script in scripts]
+    batches = [tasks[pos:pos+batchsize] for pos in range(0,len(tasks),batchsize)]
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+        mp_context=context,initializer=_startWorker,initargs=(levels,)) as pool:
+        futures = [pool.submit(_runBatch,batch,limit,pixels) for batch in batches]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+def _startWorker(levels):
+    """
+    Loads the compiled levels in a new worker process
+
+    Parameter levels: The level files to load
+    Precondition: levels is a list of valid level files in the JSON folder
+    """
+    global _LEVELS
+    _LEVELS = {}
+    for name in levels:
+        _LEVELS[name] = load_level(name)
+
+
+def _runBatch(batch,limit,pixels):
+    """
+    Returns the list of results for a batch of runs, in a worker process
+
+    Parameter batch: The runs to do
+    Precondition: batch is a list of pairs (level file, script)
+
+    Parameter limit: The longest level time to play, in seconds
+    Precondition: limit is a number (int or float) > 0
+
+    Parameter pixels: Whether the random scripts use pixel collisions
+    Precondition: pixels is a bool
+    """
+    results = []
+    for (name,script) in batch:
+        result = simulate(_LEVELS[name],script,limit,pixels)
+        result['level'] = name
+        result['script'] = script
+        results.append(result)
+    return results
+
+
+def _isPlayable(name):
+    """
+    Returns True if name is a level file that the simulation can load
+
+    Parameter name: The file name
+    Precondition: name is a string
+    """
+    return name != OBJECT_DATA and not load_level(name) is None
+
+
+def _main(argv):
+    """
+    Runs the batch runner from the command line, returning the exit status
+
+    The options are --runs=N (random scripts per level, default 100), --workers=N,
+    --batch=N and --pixels (random scripts use pixel collisions).  An argument naming
+    a file in the JSON folder (by name or by path) is a level file, and any other file
+    is a recording.  With no level files, every level in the JSON folder is run.
+    Level files that are not valid are reported and skipped.  An unknown option, an
+    option without a valid number, or a missing recording stops the runner with exit
+    status 2.
+
+    Parameter argv: The command line arguments (without the script name)
+    Precondition: argv is a list of strings
+    """
+    # The smallest value of each numeric option
+    least = {'--runs': 0, '--workers': 1, '--batch': 1}
+    numbers = {'--runs': 100, '--workers': None, '--batch': BATCH_SIZE}
+    pixels = False
+    levels = []
+    recordings = []
+    for arg in argv:
+        (name,equals,value) = arg.partition('=')
+        if name in least and equals and value.isdigit() and int(value) >= least[name]:
+            numbers[name] = int(value)
+        elif arg == '--pixels':
+            pixels = True
+        elif arg.startswith('-'):
+            print('%s option %s' % ('invalid' if name in least else 'unknown',arg))
+            print('usage: python batch.py [--runs=N] [--workers=N] [--batch=N] '
+                  '[--pixels] [level.json ...] [recording ...]')
+            return 2
+        elif not level_file(arg) is None:
+            levels.append(level_file(arg))
+        elif os.path.isfile(arg):
+            recordings.append(arg)
+        else:
+            print('%s: no such level or recording' % arg)
+            return 2
+
+    if levels == []:
+        for name in sorted(os.listdir(JSON_FOLDER)):
+            if _isPlayable(name):
+                levels.append(name)
+    else:
+        playable = []
+        for name in levels:
+            if not _isPlayable(name):
+                print('%s: not a valid level' % name)
+            elif not name in playable:
+                playable.append(name)
+        levels = playable
+    if levels == []:
+        return 1
+
+    totals = {}
+    for name in levels:
+        totals[name] = {'runs': 0, 'won': 0, 'exits': [], 'deaths': None}
+    scripts = list(range(numbers['--runs']))+recordings
+    for batch in run(levels,scripts,numbers['--workers'],numbers['--batch'],
+                     BATCH_LIMIT,pixels):
+        for result in batch:
+            total = totals[result['level']]
+            total['runs'] += 1
+            total['won'] += result['won']
+            if not result['exittime'] is None:
+                total['exits'].append(result['exittime'])
+            if total['deaths'] is None:
+                total['deaths'] = result['deaths']
+            else:
+                total['deaths'] = [a+b for (a,b) in zip(total['deaths'],result['deaths'])]
+
+    for name in levels:
+        total = totals[name]
+        exits = total['exits']
+        exit = 'never' if exits == [] else '%.2fs' % (sum(exits)/len(exits))
+        print('%s: %d runs, %d won, first exit %s, deaths by lane %s' %
+              (name,total['runs'],total['won'],exit,total['deaths']))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(_main(sys.argv[1:]))
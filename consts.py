@@ -10,7 +10,6 @@ access them.
 # DATE COMPLETED HERE
 """
 import introcs
-import sys
 
 ### WINDOW CONSTANTS (all coordinates are in pixels) ###
 
@@ -30,6 +29,8 @@ FROG_IMAGE  = 'frog1.png'
 FROG_SPEED  = 0.25
 # The image file for a frog that made it to safety
 FROG_SAFE   = 'safe.png'
+# The size in pixels of the FROG_SAFE image
+FROG_SAFE_SIZE = (60,60)
 # The image file for a frog life
 FROG_HEAD   = 'froghead.png'
 # The number of lives the frog has before losing
@@ -50,6 +51,33 @@ DEATH_SPRITE = 'skulls'
 DEATH_SPEED  = 0.5
 
 
+### TIMING CONSTANTS ###
+
+# The number of fixed simulation steps per second, or None to update once per frame
+UPDATE_RATE  = None
+# The maximum number of fixed steps to run in a single animation frame
+MAX_UPDATES  = 8
+# The number of seconds in each time slice of a lane occupancy table
+OCCUPANCY_STEP = 1/60
+
+
+### COLLISION CONSTANTS ###
+
+# Whether the frog only collides with the solid pixels of the obstacles inside their
+# hitboxes, instead of the whole hitboxes
+PIXEL_COLLISIONS = False
+# The smallest alpha value (0..255) of a solid pixel in a collision mask
+MASK_ALPHA = 128
+
+
+### RECORDING CONSTANTS ###
+
+# The file to record the key presses to, or None to not record them
+RECORD_FILE  = None
+# The recording to play back instead of the keyboard, or None to use the keyboard
+REPLAY_FILE  = None
+
+
 ### GAME CONSTANTS ###
 
 # The state before the game has started
@@ -78,6 +106,23 @@ ALLOY_MEDIUM = 64
 ALLOY_SMALL  = 48
 
 
+### DRAWING LAYERS (bottom to top) ###
+
+# The lane backgrounds (static, as they never change)
+LAYER_BACKGROUND = 'background'
+# The cars, logs and other obstacles
+LAYER_OBSTACLES  = 'obstacles'
+# The frogs that reached an exit (static, as they only change when one is added)
+LAYER_EXITS      = 'exits'
+# The frog
+LAYER_FROG       = 'frog'
+# The lives, titles and messages (static, as they change only a few times a level)
+LAYER_HUD        = 'hud'
+# Whether each layer is static (drawn off-screen until something in it changes)
+LAYERS = ((LAYER_BACKGROUND,True),(LAYER_OBSTACLES,False),(LAYER_EXITS,True),
+          (LAYER_FROG,False),(LAYER_HUD,True))
+
+
 ### SOUND EFFECTS ###
 
 # The jumping sound
@@ -86,6 +131,17 @@ CROAK_SOUND = 'croak.wav'
 SPLAT_SOUND = 'splat.wav'
 # The succes sound
 TRILL_SOUND = 'trill.wav'
+# The number of copies of each sound that can play at the same time
+SOUND_VOICES = 4
+
+# The frog hopped one square
+EVENT_HOP   = 'hop'
+# The frog was killed
+EVENT_DEATH = 'death'
+# The frog reached an exit
+EVENT_EXIT  = 'exit'
+# The sound played for each event
+EVENT_SOUNDS = {EVENT_HOP: CROAK_SOUND, EVENT_DEATH: SPLAT_SOUND, EVENT_EXIT: TRILL_SOUND}
 
 
 ### JSON FILES ###
@@ -96,34 +152,13 @@ DEFAULT_LEVEL  = 'easy2.json'
 OBJECT_DATA    = 'objects.json'
 
 
-### USE COMMAND LINE ARGUMENTS TO CHANGE DEFAULT LEVEL FILE AND FROG SPEED
+### COMMAND LINE ARGUMENTS ###
 """
-sys.argv is a list of the command line arguments when you run python. These arguments are
-everything after the word python. So if you start the game typing
-
-    python froggit default.json 1
-
-Python puts ['froggit', 'default.json', '1'] into sys.argv. Below, we take advantage of 
-this fact to change the constant DEFAULT_LEVEL. This is the level file to be used when 
-you start the game.  
-
-The second argument is the FROG_SPEED, which is the amount of time between move steps.  
-A large value means a much slower moving frog.
+The game (and only the game) changes some of these constants from its command line
+arguments before it starts: DEFAULT_LEVEL, FROG_SPEED, UPDATE_RATE, RECORD_FILE,
+REPLAY_FILE and PIXEL_COLLISIONS.  See __main__.py for the arguments.  The other
+scripts (batch.py, solver.py and validate.py) have their own options instead.
 """
-try:
-    file = sys.argv[1]
-    if file[-5:].lower() == '.json':
-        DEFAULT_LEVEL = file
-    else:
-        DEFAULT_LEVEL = file+'.json'
-except:
-    pass # Use original value
-
-try:
-    value = float(sys.argv[2])
-    FROG_SPEED = value
-except:
-    pass # Use original value
 
 
 ### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
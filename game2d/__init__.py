@@ -7,11 +7,15 @@ simpler for students in CS 1110.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from .gobject import GObject, GScene
+from .gobject import GObject, GScene, GBatch
 from .grectangle import GRectangle, GEllipse, GImage, GLabel
 from .gsprite import GSprite
-from .gtile import GTile
+from .gtile import GTile, GTileMap
+from .gatlas import GAtlas
+from .gtexture import GTextureCache
+from .gmixer import GMixer, KivySink, NullSink
 from .gpath import GPath, GTriangle, GPolygon
 from .gview import GInput, GView
-from .sound import Sound, SoundLibrary
+from .sound import Sound, SoundLibrary, preload_sound
+from .gpreload import GPreloader
 from .app import GameApp
\ No newline at end of file
@@ -17,6 +17,10 @@ from kivy.clock  import Clock
 from kivy.core.window import Window
 from kivy.logger import Logger
 
+from .gtexture import GTextureCache
+from .gmixer import GMixer, KivySink
+from .gstep import fixed_steps
+
 import traceback
 import os.path
 import json
@@ -45,8 +49,12 @@ class GameApp(kivy.app.App):
     :meth:`draw`: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to ``self.view.draw()``.
     """
-    # Class attribute for tracking textures (to reduce memory footprint)
-    TEXTURE_CACHE = {}
+    # Class attribute for tracking textures (a GTextureCache, made after the class)
+    TEXTURE_CACHE = None
+    # Class attribute for the atlas of the Images folder (None if there is no atlas)
+    ATLAS = None
+    # Class attribute for playing sounds (a GMixer, made after the class)
+    MIXER = None
     
     
     # MUTABLE ATTRIBUTES
@@ -71,6 +79,51 @@ class GameApp(kivy.app.App):
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
+    @property
+    def timestep(self):
+        """
+        The fixed simulation step in seconds, or None to update once per frame
+        
+        By default this value is None, and :meth:`update` is called once per animation
+        frame with the time since the last frame.  If it is a number, the game runs in
+        fixed-step mode instead.  The frame time is added to an accumulator, and 
+        :meth:`update` is called with exactly this step for as long as a whole step is 
+        left in the accumulator (but no more than ``maxsteps`` times a frame).  That 
+        way the game state does not depend on how fast the machine is.  Use the
+        attribute ``interpolation`` in :meth:`draw` to smooth out the motion.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._timestep
+    
+    @timestep.setter
+    def timestep(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._timestep = value
+        self._accumulator = 0.0
+        self._alpha = 1.0
+    
+    @property
+    def maxsteps(self):
+        """
+        The maximum number of fixed steps to run in a single animation frame
+        
+        This value only matters if ``timestep`` is not None.  It bounds the amount of
+        work done after a stall (such as dragging the window).  Any time left over after
+        that many steps is dropped, so the game slows down rather than falling further
+        and further behind.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._maxsteps
+    
+    @maxsteps.setter
+    def maxsteps(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._maxsteps = value
+    
     @property
     def width(self):
         """
@@ -117,6 +170,23 @@ class GameApp(kivy.app.App):
         """
         return self._view
     
+    @property
+    def interpolation(self):
+        """
+        How far the current animation frame is between the last two fixed steps.
+        
+        In fixed-step mode, the time of an animation frame usually falls between two
+        steps.  This value is the fraction of a step that is still in the accumulator,
+        so drawing each object at ``previous+(current-previous)*interpolation`` shows it
+        where it would be at the frame time.  If ``timestep`` is None, this value is 
+        always 1.
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be a float in the range 0..1.
+        """
+        return self._alpha
+    
     @property
     def input(self):
         """
@@ -213,27 +283,40 @@ class GameApp(kivy.app.App):
         has already been loaded, it will return the cached texture.  Otherwise, it will
         load the texture and cache it before returning it.
         
+        If the image is in the atlas, the texture is its region of an atlas page (see
+        :class:`GAtlas`).  Regions can be drawn just like textures.
+        
+        A texture returned by this method may be dropped from the cache if the cache
+        goes over its memory budget.  Drawables should use :meth:`hold_texture` instead.
+        
         :param name: The file name
         :type name:  ``str``
         """
         if not cls.is_image(name):
             Logger.info('GameApp: No image file named %s.' % repr(name))
             return None
-        elif name in cls.TEXTURE_CACHE:
-            return cls.TEXTURE_CACHE[name]
+        return cls.TEXTURE_CACHE.get(name)
+    
+    @classmethod
+    def hold_texture(cls,owner,name):
+        """
+        Returns: The texture for the given file name, or None if it cannot be loaded
         
-        try:
-            from kivy.core.image import Image
-            texture = Image(name).texture
-            cls.TEXTURE_CACHE[name] = texture
-        except:
-            Logger.info('GameApp: Image %s is not properly formatted.' % repr(name))
-            exc_type, exc_value, exc_tb = sys.exc_info()
-            items = traceback.format_exception(exc_type, exc_value, exc_tb)
-            Logger.info(items[-1].strip())
-            texture = None
+        This is the same as :meth:`load_texture`, except that it also records that
+        ``owner`` uses the texture.  A texture is never dropped from the cache while
+        something uses it.  The owner stops using the texture when it holds another
+        one (or None), or when it is garbage collected.
+        
+        :param owner: The drawable that uses the texture
+        :type owner:  :class:`GObject`
         
-        return texture
+        :param name: The file name
+        :type name:  ``str`` or None
+        """
+        if not name is None and not cls.is_image(name):
+            Logger.info('GameApp: No image file named %s.' % repr(name))
+            name = None
+        return cls.TEXTURE_CACHE.hold(owner,name)
     
     @classmethod
     def unload_texture(cls,name):
@@ -248,12 +331,48 @@ class GameApp(kivy.app.App):
         :type name:  ``str``
         """
         assert type(name) == str, '%s is not a valid texture name' % repr(name)
-        if name in cls.TEXTURE_CACHE:
-            texture = cls.TEXTURE_CACHE[name]
-            del cls.TEXTURE_CACHE[name]
-            return texture
+        return cls.TEXTURE_CACHE.remove(name)
+    
+    @classmethod
+    def texture_stats(cls):
+        """
+        Returns: The statistics of the texture cache, as a dictionary
         
-        return None
+        This has the keys of :attr:`GTextureCache.stats` and one more, 'atlas', which
+        is the memory used by the atlas pages (0 if they have not been drawn).  The
+        textures from the atlas do not count towards the memory of the cache, as they
+        are all part of the atlas pages.
+        """
+        stats = cls.TEXTURE_CACHE.stats
+        stats['atlas'] = 0
+        if not cls.ATLAS is None and not cls.ATLAS.pages is None:
+            for page in cls.ATLAS.pages:
+                stats['atlas'] += page.width*page.height*4
+        return stats
+    
+    @classmethod
+    def _load_texture(cls,name):
+        """
+        Returns: The pair (texture,bytes) for the given file name, or None on failure
+        
+        This is the loader for the texture cache.  Kivy is told not to cache the image
+        itself, so that the texture cache decides when its memory is freed.
+        
+        :param name: The file name
+        :type name:  ``str``
+        """
+        try:
+            if not cls.ATLAS is None and name in cls.ATLAS:
+                return (cls.ATLAS.get(name),0)
+            from kivy.core.image import Image
+            texture = Image(name,nocache=True).texture
+            return (texture,texture.width*texture.height*len(texture.colorfmt))
+        except:
+            Logger.info('GameApp: Image %s is not properly formatted.' % repr(name))
+            exc_type, exc_value, exc_tb = sys.exc_info()
+            items = traceback.format_exception(exc_type, exc_value, exc_tb)
+            Logger.info(items[-1].strip())
+            return None
     
     @classmethod
     def load_json(cls,name):
@@ -297,6 +416,17 @@ class GameApp(kivy.app.App):
             
             GameApp(width=400,height=400)
         
+        To update the game at a fixed rate (say 120 times a second) no matter the frame
+        rate, add the keyword ``timestep``::
+            
+            GameApp(width=400,height=400,timestep=1/120)
+        
+        The images in the **Images** folder are packed into a texture atlas.  To load
+        every image as its own texture instead, add the keyword ``atlas=False``.  The
+        textures that are not in the atlas are kept within a memory budget, which is
+        64 MB unless you give the keyword ``texturebudget`` (in bytes).  Every sound
+        can play 4 times at once, unless you give the keyword ``voices``.
+        
         The game window will not show until you start the game. To start the game, use 
         the method ``run()``.
         
@@ -309,6 +439,11 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        t = keywords.pop('timestep', None)
+        m = keywords.pop('maxsteps', 8)
+        a = keywords.pop('atlas', True)
+        b = keywords.pop('texturebudget', None)
+        v = keywords.pop('voices', None)
         
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -320,6 +455,8 @@ class GameApp(kivy.app.App):
         Window.size = (self.width,self.height)
         
         self._fps = f
+        self.timestep = t
+        self.maxsteps = m
         
         x = keywords.pop('left', None)
         y = keywords.pop('top', None)
@@ -342,6 +479,13 @@ class GameApp(kivy.app.App):
             Window.top = y+self.height
         
         self._setpaths()
+        if a:
+            from .gatlas import GAtlas
+            GameApp.ATLAS = GAtlas(GameApp.images)
+        if not b is None:
+            GameApp.TEXTURE_CACHE.budget = b
+        if not v is None:
+            GameApp.MIXER = GMixer(KivySink(),v)
         
         # Tell Kivy to build the application
         kivy.app.App.__init__(self,**keywords)
@@ -376,10 +520,13 @@ class GameApp(kivy.app.App):
         """
         Closes the game window and exit Python.
         
+        If the input is recording key presses, the recording is saved first.
+        
         This is a Kivy reserved method.  It is part of the Kivy application process.  
         It should **never** be overridden.
         """
         import sys
+        self.input.save()
         kivy.app.App.stop(self)
         sys.exit(0)
     
@@ -441,14 +588,29 @@ class GameApp(kivy.app.App):
         Processes a single animation frame.
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
-        important issues behind the scenes, particularly with clearing the window.
+        important issues behind the scenes, particularly with clearing the window.  Once
+        the frame is drawn, the view puts the changes on the canvas.
+        
+        If ``timestep`` is set, this method runs the fixed-step accumulator, calling
+        `update` zero or more times before it draws.  When the input is replaying a 
+        recording, it calls `update` exactly once with the recorded ``dt`` instead.
         
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
         self.view.clear()
-        self.update(dt)
+        if self.input.replaying:
+            self.update(self.input._step(dt))
+            self._alpha = 1.0
+        elif self._timestep is None:
+            self.update(self.input._step(dt))
+        else:
+            (steps,self._accumulator,self._alpha) = \
+                fixed_steps(self._accumulator+dt,self._timestep,self._maxsteps)
+            for step in range(steps):
+                self.update(self.input._step(self._timestep))
         self.draw()
+        self.view._commit()
         self.input.refresh()
     
     def _setpaths(self):
@@ -473,3 +635,8 @@ class GameApp(kivy.app.App):
         kivy.resources.resource_add_path(GameApp.sounds)
         kivy.resources.resource_add_path(GameApp.images)
 
+
+# The texture cache needs the class to load textures, so it is made here
+GameApp.TEXTURE_CACHE = GTextureCache(GameApp._load_texture)
+# The mixer plays sounds through Kivy (a game can swap in a NullSink to play nothing)
+GameApp.MIXER = GMixer(KivySink())
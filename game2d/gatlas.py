@@ -0,0 +1,274 @@
+"""
+A module to support texture atlases.
+
+Every image file is normally its own texture, so drawing a frame switches textures
+each time the next image comes from a different file.  An atlas packs the images in
+a folder into a few large textures (called pages) at startup, so that the images on
+the same page can be drawn one after another without switching.  The images are
+then drawn from regions of the pages.  Images with exactly the same contents share
+a region.
+
+The packing itself does not need Kivy.  It only reads the sizes of the PNG files, and
+it produces a manifest that says where every image is.  The pages are drawn from the
+manifest the first time a region is needed, once there is a window to draw with.
+
+Author: Nicholas J. Runje (njr85)
+Date:   October 18, 2026
+"""
+import hashlib
+import struct
+import os
+
+
+# The width and height of an atlas page in pixels
+ATLAS_SIZE = 2048
+# The empty space around every image in a page, so that regions do not bleed together
+ATLAS_PADDING = 2
+
+# The first bytes of every PNG file
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def png_size(path):
+    """
+    Returns: The (width,height) of a PNG file, or None if it is not a PNG file
+
+    This only reads the header of the file.
+
+    :param path: The path to the file
+    :type path:  ``str``
+    """
+    try:
+        with open(path,'rb') as file:
+            header = file.read(24)
+    except OSError:
+        return None
+
+    if len(header) < 24 or header[:8] != _PNG_SIGNATURE or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II',header[16:24])
+
+
+def pack_images(folder,names=None,pagesize=ATLAS_SIZE,padding=ATLAS_PADDING):
+    """
+    Returns: The manifest of an atlas for the images in a folder
+
+    The manifest is a dictionary that can be saved as JSON.  It has the following keys:
+
+        'pagesize': The [width,height] of each page
+        'pages':    A list of pages, each a list of the files drawn on that page
+        'images':   A dictionary from file name to [page,x,y,width,height]
+
+    The position of an image is the bottom left corner of its region, with y going up.
+    Only PNG files are packed, and only those that fit on a page.  Files with the same
+    contents (the same SHA-1 hash) share a region, and only the first of them is on
+    the list of files for its page.
+
+    The images are packed into shelves, tallest first.  A shelf is a row of images as
+    tall as its first image, and a new shelf starts above the last one when an image
+    does not fit.  This wastes a little space, but it is fast and it works well when
+    most images are about the same height.
+
+    :param folder: The folder with the images
+    :type folder:  ``str``
+
+    :param names: The files to pack (None for every file in the folder)
+    :type names:  ``list`` of ``str`` or None
+
+    :param pagesize: The width and height of a page
+    :type pagesize:  ``int`` > 0
+
+    :param padding: The empty space around every image
+    :type padding:  ``int`` >= 0
+    """
+    if names is None:
+        names = sorted(os.listdir(folder))
+
+    images = []
+    hashes = {}
+    aliases = {}
+    for name in names:
+        path = os.path.join(folder,name)
+        size = png_size(path)
+        if size is None or max(size)+2*padding > pagesize:
+            continue
+        with open(path,'rb') as file:
+            key = hashlib.sha1(file.read()).hexdigest()
+        if key in hashes:
+            aliases[name] = hashes[key]
+        else:
+            hashes[key] = name
+            images.append((size[1],size[0],name))
+    images.sort(key=lambda image: (-image[0],-image[1],image[2]))
+
+    pages = []
+    regions = {}
+    (x, y, shelf) = (pagesize, 0, 0)
+    for (height,width,name) in images:
+        if x+width+2*padding > pagesize:
+            (x, y, shelf) = (0, y+shelf, height+2*padding)
+            if y+shelf > pagesize or pages == []:
+                pages.append([])
+                y = 0
+        pages[-1].append(name)
+        regions[name] = [len(pages)-1,x+padding,y+padding,width,height]
+        x += width+2*padding
+
+    for name in aliases:
+        regions[name] = regions[aliases[name]]
+    return {'pagesize': [pagesize,pagesize], 'pages': pages, 'images': regions}
+
+
+class GAtlas(object):
+    """
+    A class representing the texture atlas for a folder of images.
+
+    The method :meth:`get` returns the region of an image, which can be used anywhere
+    that a texture is used.  The pages are only drawn the first time that this method
+    is called, as Kivy cannot make textures before the window exists.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def folder(self):
+        """
+        The folder with the images in this atlas.
+
+        **Invariant**: Value is a string naming a folder.
+        """
+        return self._folder
+
+    @property
+    def manifest(self):
+        """
+        The manifest saying where every image is (see :func:`pack_images`).
+
+        This attribute should never be changed.
+
+        **Invariant**: Value is a dictionary that can be saved as JSON.
+        """
+        return self._manifest
+
+    @property
+    def pages(self):
+        """
+        The textures of the pages, or None if they have not been drawn yet.
+
+        **Invariant**: Value is a list of textures or None.
+        """
+        return None if self._fbos is None else [fbo.texture for fbo in self._fbos]
+
+
+    # BUILT-IN METHODS
+    def __init__(self,folder,names=None,pagesize=ATLAS_SIZE,padding=ATLAS_PADDING):
+        """
+        Creates a new atlas for the images in a folder.
+
+        This packs the images (see :func:`pack_images`), but it does not draw the pages.
+
+        :param folder: The folder with the images
+        :type folder:  ``str``
+
+        :param names: The files to pack (None for every file in the folder)
+        :type names:  ``list`` of ``str`` or None
+
+        :param pagesize: The width and height of a page
+        :type pagesize:  ``int`` > 0
+
+        :param padding: The empty space around every image
+        :type padding:  ``int`` >= 0
+        """
+        assert os.path.isdir(folder), '%s is not a folder' % repr(folder)
+        self._folder = folder
+        self._padding = padding
+        self._manifest = pack_images(folder,names,pagesize,padding)
+        self._fbos = None
+        self._regions = {}
+        self._supplied = {}
+
+    def __contains__(self,name):
+        """
+        Returns: True if the image file is in this atlas
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        return name in self._manifest['images']
+
+
+    # PUBLIC METHODS
+    def supply(self,name,texture):
+        """
+        Gives the atlas a texture for one of its images, loaded somewhere else
+
+        When the pages are drawn, the atlas uses this texture instead of loading the
+        image itself.  This does nothing if the pages have been drawn already.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param texture: The texture made from that file
+        :type texture:  a texture
+        """
+        if self._fbos is None and name in self._manifest['images']:
+            self._supplied[name] = texture
+
+    def build(self):
+        """
+        Draws the pages now, if they have not been drawn yet
+        """
+        if self._fbos is None:
+            self._draw()
+
+    def get(self,name):
+        """
+        Returns: The texture region of an image, or None if it is not in this atlas
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        if not name in self._manifest['images']:
+            return None
+        self.build()
+        if not name in self._regions:
+            (page, x, y, width, height) = self._manifest['images'][name]
+            texture = self._fbos[page].texture
+            self._regions[name] = texture.get_region(x,y,width,height)
+        return self._regions[name]
+
+
+    # HIDDEN METHODS
+    def _draw(self):
+        """
+        Draws every page into a frame buffer.
+
+        Blending is turned off while drawing, so that every pixel (including its alpha)
+        is copied exactly.  Each image is first drawn stretched over its padding, and
+        then drawn again at its real size on top.  That fills the padding with the colors
+        at the edge of the image, so that scaled or tiled regions do not pick up the
+        empty space around them.
+        """
+        from kivy.core.image import Image
+        from kivy.graphics import Fbo, Callback, ClearColor, ClearBuffers, Color, Rectangle
+        from kivy.graphics.opengl import glEnable, glDisable, GL_BLEND
+
+        pad = self._padding
+        self._fbos = []
+        for files in self._manifest['pages']:
+            fbo = Fbo(size=tuple(self._manifest['pagesize']))
+            with fbo:
+                ClearColor(0,0,0,0)
+                ClearBuffers()
+                Callback(lambda instr: glDisable(GL_BLEND))
+                Color(1,1,1,1)
+                for name in files:
+                    (page, x, y, width, height) = self._manifest['images'][name]
+                    texture = self._supplied.get(name)
+                    if texture is None:
+                        texture = Image(os.path.join(self._folder,name),nocache=True).texture
+                    Rectangle(pos=(x-pad,y-pad),size=(width+2*pad,height+2*pad),texture=texture)
+                    Rectangle(pos=(x,y),size=(width,height),texture=texture)
+                Callback(lambda instr: glEnable(GL_BLEND))
+            fbo.draw()
+            self._fbos.append(fbo)
+        self._supplied = {}
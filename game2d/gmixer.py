@@ -0,0 +1,432 @@
+"""
+A module to support playing overlapping sound effects.
+
+A Kivy sound can only play once at a time, so a sound effect that fires again before
+it finishes is either cut off or dropped.  The mixer in this module keeps a pool of
+voices for every sound file instead.  A voice is a copy of the sound that can play on
+its own, and the voices are all loaded the first time the file is used (or preloaded),
+never when the sound is played.  Playing a sound starts the first voice that is not
+playing.  If every voice is playing, it steals the one that started first and starts
+it over.  So a sound always starts in the frame that asks for it.
+
+The mixer does not play anything itself.  It is given a sink, which makes the voices.
+The sink :class:`KivySink` plays them with Kivy, while :class:`NullSink` plays nothing
+but keeps track of which voices would be playing, so the mixer can be used (and
+tested) without Kivy or a sound card.
+
+Author: Nicholas J. Runje (njr85)
+Date:   October 18, 2026
+"""
+import threading
+import wave
+import time
+import os
+
+
+# The default number of voices for every sound file
+MIXER_VOICES = 4
+
+
+class GMixer(object):
+    """
+    A class representing a mixer that plays sound files through pools of voices.
+
+    The method :meth:`load` makes the voices for a file.  It may be called from any
+    thread, so sounds can be loaded in the background.  The other methods should be
+    called from the main thread.  Every file has a single volume, which is shared by
+    all of its voices.
+
+    The mixer keeps statistics on the number of plays, steals (plays that had to cut
+    off a voice) and loads (files that had to be loaded).
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def sink(self):
+        """
+        The sink that makes the voices of this mixer.
+
+        **Invariant**: Value is a :class:`KivySink`, a :class:`NullSink` or an object
+        with the same ``load`` method.
+        """
+        return self._sink
+
+    @property
+    def voices(self):
+        """
+        The number of voices for every file loaded by this mixer.
+
+        **Invariant**: Value is an int > 0.
+        """
+        return self._voices
+
+    @property
+    def stats(self):
+        """
+        The statistics for this mixer, as a new dictionary.
+
+        The keys are 'plays', 'steals', 'loads', 'sounds' (the number of files loaded)
+        and 'playing' (the number of voices playing right now).
+
+        **Invariant**: Value is a dictionary from strings to ints.
+        """
+        with self._lock:
+            playing = 0
+            for entry in self._entries.values():
+                playing += len([voice for voice in entry[1] if voice.playing])
+            return {'plays': self._plays, 'steals': self._steals, 'loads': self._loads,
+                    'sounds': len(self._entries), 'playing': playing}
+
+
+    # BUILT-IN METHODS
+    def __init__(self,sink,voices=MIXER_VOICES):
+        """
+        Creates a new mixer with no sounds loaded.
+
+        :param sink: The sink that makes the voices
+        :type sink:  :class:`KivySink`, :class:`NullSink` or similar
+
+        :param voices: The number of voices for every file
+        :type voices:  ``int`` > 0
+        """
+        assert type(voices) == int and voices > 0, 'voices %s is not a positive int' % repr(voices)
+        self._sink = sink
+        self._voices = voices
+        self._lock = threading.RLock()
+        # Every entry is a list [volume,voices,starts], where starts orders the voices
+        self._entries = {}
+        self._clock = 0
+        self._plays = 0
+        self._steals = 0
+        self._loads = 0
+
+    def __contains__(self,source):
+        """
+        Returns: True if the sound file is loaded in this mixer
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+        """
+        return source in self._entries
+
+
+    # PUBLIC METHODS
+    def load(self,source):
+        """
+        Returns: True if the voices for a sound file are ready
+
+        The voices are made the first time this is called for a file.  It returns False
+        if the sink cannot load the file.
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+        """
+        with self._lock:
+            if source in self._entries:
+                return True
+        voices = []
+        for pos in range(self._voices):
+            voice = self._sink.load(source)
+            if voice is None:
+                return False
+            voices.append(voice)
+        with self._lock:
+            if not source in self._entries:
+                self._entries[source] = [1.0,voices,[0]*len(voices)]
+                self._loads += 1
+        return True
+
+    def unload(self,source):
+        """
+        Stops a sound file and removes its voices from this mixer
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+        """
+        with self._lock:
+            entry = self._entries.pop(source,None)
+        if not entry is None:
+            for voice in entry[1]:
+                voice.stop()
+
+    def play(self,source,loop=False):
+        """
+        Returns: True if the sound file started playing
+
+        The file is loaded first if it is not loaded already, so it is best to load
+        every file ahead of time.  This starts a voice that is not playing, or steals
+        the voice that started first if they are all playing.
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        """
+        if not self.load(source):
+            return False
+        with self._lock:
+            (volume, voices, starts) = self._entries[source]
+            pos = None
+            for num in range(len(voices)):
+                if not voices[num].playing and (pos is None or starts[num] < starts[pos]):
+                    pos = num
+            if pos is None:
+                pos = starts.index(min(starts))
+                voices[pos].stop()
+                self._steals += 1
+
+            self._clock += 1
+            starts[pos] = self._clock
+            self._plays += 1
+            voices[pos].volume = volume
+            voices[pos].play(loop)
+        return True
+
+    def stop(self,source=None):
+        """
+        Stops every voice of a sound file, or of every file if source is None
+
+        :param source: The name of a sound file
+        :type source:  ``str`` or None
+        """
+        with self._lock:
+            sources = list(self._entries) if source is None else [source]
+            for name in sources:
+                if name in self._entries:
+                    for voice in self._entries[name][1]:
+                        voice.stop()
+
+    def is_playing(self,source):
+        """
+        Returns: True if any voice of a sound file is playing
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+        """
+        with self._lock:
+            if not source in self._entries:
+                return False
+            return any(voice.playing for voice in self._entries[source][1])
+
+    def get_volume(self,source):
+        """
+        Returns: The volume of a sound file (1 if it is not loaded)
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+        """
+        with self._lock:
+            return self._entries[source][0] if source in self._entries else 1.0
+
+    def set_volume(self,source,value):
+        """
+        Sets the volume of a sound file, including the voices playing right now
+
+        This does nothing if the file is not loaded.
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+
+        :param value: The volume, where 1 is full volume and 0 is mute
+        :type value:  ``float`` in 0..1
+        """
+        assert type(value) in [int, float] and value >= 0 and value <= 1, \
+            'value %s is not a valid volume' % repr(value)
+        with self._lock:
+            if source in self._entries:
+                self._entries[source][0] = value
+                for voice in self._entries[source][1]:
+                    voice.volume = value
+
+
+# #mark -
+class KivySink(object):
+    """
+    A class representing a sink that plays voices with Kivy.
+
+    Every voice is its own Kivy sound, as Kivy cannot play one sound more than once at
+    the same time.
+    """
+
+    def load(self,source):
+        """
+        Returns: A new voice for a sound file, or None if Kivy cannot load it
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+        """
+        from kivy.core.audio import SoundLoader
+        sound = SoundLoader.load(source)
+        if sound is None:
+            return None
+        sound.load()
+        return _KivyVoice(sound)
+
+
+class _KivyVoice(object):
+    """
+    A class representing a voice played by Kivy.
+    """
+
+    @property
+    def playing(self):
+        """
+        Whether or not this voice is playing.
+
+        **Invariant**: Value is a bool.
+        """
+        return self._sound.state == 'play'
+
+    @property
+    def volume(self):
+        """
+        The volume of this voice.
+
+        **Invariant**: Must be a float in 0..1.
+        """
+        return self._sound.volume
+
+    @volume.setter
+    def volume(self,value):
+        self._sound.volume = value
+
+    def __init__(self,sound):
+        """
+        Creates a voice for a loaded Kivy sound.
+
+        :param sound: The Kivy sound
+        :type sound:  a Kivy ``Sound``
+        """
+        self._sound = sound
+
+    def play(self,loop=False):
+        """
+        Plays this voice from the start.
+
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        """
+        self._sound.loop = loop
+        self._sound.play()
+
+    def stop(self):
+        """
+        Stops this voice.
+        """
+        self._sound.stop()
+
+
+# #mark -
+class NullSink(object):
+    """
+    A class representing a sink that plays nothing.
+
+    The voices of this sink only keep track of when they would be playing.  A voice
+    plays for the length of its WAV file (read from the header of the file), measured
+    with the clock of the sink.  A file that is not a WAV file has no length, so its
+    voices stop playing at once.  The sink also keeps a log of every sound played, as
+    pairs (source,time), for tests.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def log(self):
+        """
+        The list of the sounds played, as pairs (source,time), oldest first.
+
+        This attribute should never be changed, except to clear it.
+
+        **Invariant**: Value is a list of pairs.
+        """
+        return self._log
+
+    # BUILT-IN METHODS
+    def __init__(self,folder=None,clock=time.monotonic):
+        """
+        Creates a new null sink.
+
+        :param folder: The folder with the sound files (None to not read the files)
+        :type folder:  ``str`` or None
+
+        :param clock: The function that returns the current time in seconds
+        :type clock:  callable
+        """
+        self._folder = folder
+        self._clock = clock
+        self._log = []
+
+    # PUBLIC METHODS
+    def load(self,source):
+        """
+        Returns: A new voice for a sound file, or None if the file does not exist
+
+        :param source: The name of a sound file
+        :type source:  ``str``
+        """
+        length = 0.0
+        if not self._folder is None:
+            path = os.path.join(self._folder,source)
+            if not os.path.isfile(path):
+                return None
+            try:
+                with wave.open(path,'rb') as file:
+                    length = file.getnframes()/file.getframerate()
+            except (wave.Error,EOFError):
+                pass
+        return _NullVoice(self,source,length)
+
+
+class _NullVoice(object):
+    """
+    A class representing a voice of a :class:`NullSink`.
+    """
+
+    @property
+    def playing(self):
+        """
+        Whether or not this voice would be playing.
+
+        **Invariant**: Value is a bool.
+        """
+        if self._start is None:
+            return False
+        return self._loop or self._sink._clock()-self._start < self._length
+
+    def __init__(self,sink,source,length):
+        """
+        Creates a voice for a null sink.
+
+        :param sink: The sink of this voice
+        :type sink:  :class:`NullSink`
+
+        :param source: The name of the sound file
+        :type source:  ``str``
+
+        :param length: The length of the sound in seconds
+        :type length:  ``float`` >= 0
+        """
+        self._sink = sink
+        self._source = source
+        self._length = length
+        self._start = None
+        self._loop = False
+        self.volume = 1.0
+
+    def play(self,loop=False):
+        """
+        Plays this voice from the start.
+
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        """
+        self._start = self._sink._clock()
+        self._loop = loop
+        self._sink._log.append((self._source,self._start))
+
+    def stop(self):
+        """
+        Stops this voice.
+        """
+        self._start = None
+        self._loop = False
@@ -0,0 +1,45 @@
+"""
+The build mode for 2D game support.
+
+By default, every drawable checks each value given to its attributes, so that mistakes
+are caught right away with a useful message.  Those checks take time, and a finished
+game that sets hundreds of attributes a frame does not need them.  In release mode the
+checks are skipped, and the drawable classes use ``__slots__`` instead of a dictionary
+for their attributes, which makes them smaller and faster to access.  The classes and
+their attributes are the same in both modes.
+
+The mode is chosen when game2d is first imported.  It is release mode if Python runs
+with optimizations (``python -O``) or if the environment variable ``GAME2D_RELEASE`` is
+set to anything but ``0``.  Otherwise it is the checked mode for development.  The
+drawables make every check through :func:`check`, so this is the only place that
+decides whether they are made.
+
+Author: Nicholas J. Runje (njr85)
+Date:   October 18, 2026
+"""
+import os
+
+
+# Whether game2d is in release mode (no checks, slotted drawables)
+RELEASE = not __debug__ or os.environ.get('GAME2D_RELEASE','0') not in ('','0')
+
+
+def check(value,test,message):
+    """
+    Checks a value given to a drawable, unless game2d is in release mode
+
+    Every attribute setter (and every method that takes a point or an object) calls
+    this instead of asserting the test itself.  The test is only called in the checked
+    mode, so release mode pays for nothing but this call.
+
+    :param value: The value to check
+    :type value:  any
+
+    :param test: The test, which returns True if the value is valid
+    :type test:  a function of one argument
+
+    :param message: The error message, with ``%s`` where the value goes
+    :type message:  ``str``
+    """
+    if not RELEASE and not test(value):
+        raise AssertionError(message % repr(value))
@@ -11,6 +11,8 @@ Date:   November 1, 2020
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from introcs.geom import Point2, Matrix
+from .gmode import RELEASE, check
+import numpy
 
 
 def is_color(c):
@@ -38,6 +40,19 @@ def is_color(c):
     return type(c) == str and (introcs.is_tkcolor(c) or introcs.is_webcolor(c))
 
 
+def is_num(x):
+    """
+    Checks whether a value is a number.
+
+    :return: True if x is an ``int`` or ``float``
+    :rtype:  ``bool``
+
+    :param x: The value to test
+    :type x:  any
+    """
+    return type(x) in [int, float]
+
+
 def is_num_tuple(t,size):
     """
     Checks whether a value is a sequence of numbers.
@@ -77,6 +92,48 @@ def is_gobject_list(g):
         return False
 
 
+def affine_matrix(x,y,angle,sx,sy):
+    """
+    Returns: The 3x3 affine matrix that scales, rotates and then translates a point
+
+    This is the same transform as the Kivy instructions of a :class:`GObject`, as a
+    NumPy array.  A point (px,py) is transformed by multiplying the column (px,py,1).
+
+    :param x: The horizontal translation
+    :type x:  ``int`` or ``float``
+
+    :param y: The vertical translation
+    :type y:  ``int`` or ``float``
+
+    :param angle: The angle of rotation in degrees (counter-clockwise)
+    :type angle:  ``int`` or ``float``
+
+    :param sx: The horizontal scale
+    :type sx:  ``int`` or ``float``
+
+    :param sy: The vertical scale
+    :type sy:  ``int`` or ``float``
+    """
+    radians = numpy.radians(angle)
+    c = numpy.cos(radians)
+    s = numpy.sin(radians)
+    return numpy.array([[c*sx,-s*sy,x],[s*sx,c*sy,y],[0.0,0.0,1.0]])
+
+
+def affine_points(matrix,points):
+    """
+    Returns: The points transformed by a 3x3 affine matrix, as a new NumPy array
+
+    :param matrix: The affine matrix
+    :type matrix:  float array of shape (3,3)
+
+    :param points: The points to transform, one row (x,y) for each point
+    :type points:  float array of shape (n,2) or a sequence of pairs
+    """
+    points = numpy.asarray(points,dtype=float).reshape(-1,2)
+    return points @ matrix[:2,:2].T + matrix[:2,2]
+
+
 #mark -
 
 class GObject(object):
@@ -91,6 +148,13 @@ class GObject(object):
     :class:`GTriangle`, :class:`GPolygon`, or :class:`GPath`.
     """
 
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_trans','_rotate','_scale','_width','_height','_hitbox','_fillcolor',
+                     '_linecolor','_name','_cache','_matrix','_invrse','_affine','_affinv',
+                     '_wcorn','_wkey','_mtrue','_defined',
+                     '__weakref__')
+
     # MUTABLE PROPERTIES
     @property
     def x(self):
@@ -103,7 +167,7 @@ class GObject(object):
 
     @x.setter
     def x(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        check(value,is_num,'%s is not a number')
         self._trans.x = float(value)
         self._mtrue = False
 
@@ -118,7 +182,7 @@ class GObject(object):
 
     @y.setter
     def y(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        check(value,is_num,'%s is not a number')
         self._trans.y = float(value)
         self._mtrue = False
 
@@ -135,8 +199,8 @@ class GObject(object):
 
     @width.setter
     def width(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
-        assert value > 0, '%s is not positive' % repr(value)
+        check(value,is_num,'%s is not a number')
+        check(value,lambda value: value > 0,'%s is not positive')
         self._width = float(value)
         if self._defined:
             self._reset()
@@ -154,8 +218,8 @@ class GObject(object):
 
     @height.setter
     def height(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
-        assert value > 0, '%s is not positive' % repr(value)
+        check(value,is_num,'%s is not a number')
+        check(value,lambda value: value > 0,'%s is not positive')
         self._height = float(value)
         if self._defined:
             self._reset()
@@ -188,12 +252,7 @@ class GObject(object):
             self._hitbox = None
             return
         
-        try:
-            size = len(value)
-        except:
-            size = 0
-        assert size == 4, '%s is not a tuple or list of size 4' % repr(value)
-        assert all(map(lambda x : type(x) in [int,float], value)), '%s has non-numerical elements' % repr(value)
+        check(value,lambda value: is_num_tuple(value,4),'%s is not a tuple or list of 4 numbers')
         self._hitbox = tuple(value)
 
     @property
@@ -216,8 +275,7 @@ class GObject(object):
     @scale.setter
     def scale(self,value):
         # Do some checking here
-        assert type(value) in [int,float] or is_num_tuple(value,2), \
-                '%s is not a valid scaling factor' % repr(value)
+        check(value,lambda value: is_num(value) or is_num_tuple(value,2),'%s is not a valid scaling factor')
         if type(value) in [int,float]:
             self._scale.x = float(value)
             self._scale.y = float(value)
@@ -240,7 +298,7 @@ class GObject(object):
     @angle.setter
     def angle(self,value):
         import numpy as np
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        check(value,is_num,'%s is not a number')
         diff = np.allclose([self._rotate.angle],[value])
         self._rotate.angle = float(value)
         if not diff:
@@ -268,7 +326,7 @@ class GObject(object):
     @linecolor.setter
     def linecolor(self,value):
         import introcs
-        assert value is None or is_color(value), '%s is not a valid color' % repr(value)
+        check(value,lambda value: value is None or is_color(value),'%s is not a valid color')
         if type(value) in [tuple, list] and len(value) == 3:
             value = list(value)+[1.0]
         elif type(value) in [introcs.RGB, introcs.HSV]:
@@ -306,7 +364,7 @@ class GObject(object):
     @fillcolor.setter
     def fillcolor(self,value):
         import introcs
-        assert value is None or is_color(value), '%s is not a valid color' % repr(value)
+        check(value,lambda value: value is None or is_color(value),'%s is not a valid color')
         if type(value) in [tuple, list] and len(value) == 3:
             value = list(value)+[1.0]
         elif type(value) in [introcs.RGB, introcs.HSV]:
@@ -336,7 +394,7 @@ class GObject(object):
 
     @name.setter
     def name(self,value):
-        assert value is None or type(value) == str, '%s is not a valid name' % repr(value)
+        check(value,lambda value: value is None or type(value) == str,'%s is not a valid name')
         self._name = value
 
     # DERIVED PROPERTIES
@@ -365,15 +423,11 @@ class GObject(object):
         elif (self._rotate.angle % 360) == 270:
             return self.x-self.height/2.0+self._hitbox[1]
         
-        p0 = tuple(self.matrix._transform(-self.width/2.0+self._hitbox[0], -self.height/2.0+self._hitbox[3]))[0]
-        p1 = tuple(self.matrix._transform( self.width/2.0+self._hitbox[2], -self.height/2.0+self._hitbox[3]))[0]
-        p2 = tuple(self.matrix._transform( self.width/2.0+self._hitbox[2],  self.height/2.0+self._hitbox[1]))[0]
-        p3 = tuple(self.matrix._transform(-self.width/2.0+self._hitbox[0],  self.height/2.0+self._hitbox[1]))[0]
-        return min(p0,p1,p2,p3)
+        return self._bbox()[0]
 
     @left.setter
     def left(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        check(value,is_num,'%s is not a number')
         diff = value-self.left
         self.x += diff
 
@@ -402,15 +456,11 @@ class GObject(object):
         elif (self._rotate.angle % 360) == 270:
             return self.x+self.height/2.0-self._hitbox[3]
         
-        p0 = tuple(self.matrix._transform(-self.width/2.0+self._hitbox[0], -self.height/2.0+self._hitbox[3]))[0]
-        p1 = tuple(self.matrix._transform( self.width/2.0+self._hitbox[2], -self.height/2.0+self._hitbox[3]))[0]
-        p2 = tuple(self.matrix._transform( self.width/2.0+self._hitbox[2],  self.height/2.0+self._hitbox[1]))[0]
-        p3 = tuple(self.matrix._transform(-self.width/2.0+self._hitbox[0],  self.height/2.0+self._hitbox[1]))[0]
-        return max(p0,p1,p2,p3)
+        return self._bbox()[2]
 
     @right.setter
     def right(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        check(value,is_num,'%s is not a number')
         diff = value-self.right
         self.x += diff
 
@@ -439,15 +489,11 @@ class GObject(object):
         elif (self._rotate.angle % 360) == 270:
             return self.y+self.width/2.0-self._hitbox[2]
         
-        p0 = tuple(self.matrix._transform(-self.width/2.0+self._hitbox[0], -self.height/2.0+self._hitbox[3]))[1]
-        p1 = tuple(self.matrix._transform( self.width/2.0+self._hitbox[2], -self.height/2.0+self._hitbox[3]))[1]
-        p2 = tuple(self.matrix._transform( self.width/2.0+self._hitbox[2],  self.height/2.0+self._hitbox[1]))[1]
-        p3 = tuple(self.matrix._transform(-self.width/2.0+self._hitbox[0],  self.height/2.0+self._hitbox[1]))[1]
-        return max(p0,p1,p2,p3)
+        return self._bbox()[1]
 
     @top.setter
     def top(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        check(value,is_num,'%s is not a number')
         diff = value-self.top
         self.y += diff
 
@@ -476,16 +522,12 @@ class GObject(object):
         elif (self._rotate.angle % 360) == 270:
             return self.y-self.width/2.0+self._hitbox[0]
         
-        p0 = tuple(self.matrix._transform(-self.width/2.0+self._hitbox[0], -self.height/2.0+self._hitbox[3]))[1]
-        p1 = tuple(self.matrix._transform( self.width/2.0+self._hitbox[2], -self.height/2.0+self._hitbox[3]))[1]
-        p2 = tuple(self.matrix._transform( self.width/2.0+self._hitbox[2],  self.height/2.0+self._hitbox[1]))[1]
-        p3 = tuple(self.matrix._transform(-self.width/2.0+self._hitbox[0],  self.height/2.0+self._hitbox[1]))[1]
-        return min(p0,p1,p2,p3)
+        return self._bbox()[3]
 
 
     @bottom.setter
     def bottom(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        check(value,is_num,'%s is not a number')
         diff = value-self.bottom
         self.y += diff
 
@@ -497,12 +539,18 @@ class GObject(object):
         The transformation matrix for this object
 
         This value is constructed dynamically as needed.  It should only be used
-        internally in this package
+        internally in this package.  The methods of this package use :attr:`affine`
+        instead, which is faster.
 
         **invariant**: Either a :class:`Matrix` or ``None``
         """
-        if not self._mtrue or self._matrix is None:
+        if not self._mtrue:
             self._build_matrix()
+        if self._matrix is None:
+            self._matrix = Matrix()
+            self._matrix.scale(self._scale.x,self._scale.y)
+            self._matrix.rotate(self._rotate.angle)
+            self._matrix.translate(self._trans.x,self._trans.y)
         return self._matrix
 
     @property
@@ -511,14 +559,49 @@ class GObject(object):
         The inverse transformation matrix for this object
 
         This value is constructed dynamically as needed.  It should only be used
-        internally in this package
+        internally in this package.  The methods of this package use
+        :attr:`affine_inverse` instead, which is faster.
 
         **invariant**: Either a :class:`Matrix` or ``None``
         """
-        if not self._mtrue or self._matrix is None:
+        if not self._mtrue:
             self._build_matrix()
+        if self._invrse is None:
+            self._invrse = Matrix()
+            self._invrse.translate(-self._trans.x,-self._trans.y)
+            self._invrse.rotate(-self._rotate.angle)
+            self._invrse.scale(1.0/self._scale.x,1.0/self._scale.y)
         return self._invrse
 
+    @property
+    def affine(self):
+        """
+        The transformation matrix for this object, as a 3x3 NumPy array
+
+        It takes points in the local coordinate system of this object to the
+        coordinate system of its parent (see :func:`affine_matrix`).  The array is
+        cached, and it is only rebuilt after the position, angle or scale changes.
+        It should never be modified.
+
+        **invariant**: Value is a float array of shape (3,3)
+        """
+        if not self._mtrue:
+            self._build_matrix()
+        return self._affine
+
+    @property
+    def affine_inverse(self):
+        """
+        The inverse transformation matrix for this object, as a 3x3 NumPy array
+
+        The array is cached like :attr:`affine`.  It should never be modified.
+
+        **invariant**: Value is a float array of shape (3,3)
+        """
+        if not self._mtrue:
+            self._build_matrix()
+        return self._affinv
+
 
     # BUILT-IN METHODS
     def __init__(self,**keywords):
@@ -546,6 +629,10 @@ class GObject(object):
 
         # Create the Kivy transforms for position and size
         self._mtrue  = False
+        self._matrix = None
+        self._invrse = None
+        self._wcorn  = None
+        self._wkey   = None
         self._trans  = Translate(0,0,0)
         self._rotate = Rotate(angle=0,axis=(0,0,1))
         self._scale  = Scale(1,1,1)
@@ -611,7 +698,9 @@ class GObject(object):
         """
         Checks whether this object collides with another.
         
-        This collision method takes hitboxes into account
+        This collision method takes hitboxes into account.  If either object is not
+        turned a multiple of 90 degrees, it uses the separating axis test on the
+        corners of the hitboxes, which are cached until the objects change.
         
         :param obj: the object to check for collision
         :type obj: :class:`GObject`
@@ -619,12 +708,8 @@ class GObject(object):
         :return: True if the shape collides with object
         :rtype:  ``bool``
         """
-        assert isinstance(obj,GObject), '%s is not an instance of GObject' % repr(object)
+        check(obj,lambda obj: isinstance(obj,GObject),'%s is not an instance of GObject')
         
-        # Get the hitboxes
-        h1 = (0,0,0,0) if self._hitbox is None else self._hitbox
-        h2 = (0,0,0,0) if obj._hitbox is None else obj._hitbox
-
         # Optimize for 90 degree turns
         if (self.angle % 360) in [0,90,180,270] and (obj.angle % 360) in [0,90,180,270]:
             (l0,t0,r0,b0) = obj._bbox()
@@ -633,30 +718,13 @@ class GObject(object):
             isy = b1 <= b0 <= t1 or b0 <= b1 <= t0
             return isx and isy
         
-        comp = obj.matrix*self.matrix.inverse()
-        w = obj.width/2.0
-        h = obj.height/2.0
-        p0 = tuple(comp._transform(-w+h2[0], h-h2[1]))
-        p1 = tuple(comp._transform( w-h2[2], h-h2[1]))
-        p2 = tuple(comp._transform( w-h2[2],-h+h2[3]))
-        p3 = tuple(comp._transform(-w+h2[0],-h+h2[3]))
-        
-        sides = ((p0,p1),(p1,p2),(p2,p3),(p3,p0))
-        l1 = -self.width/2.0  + h1[0]
-        r1 =  self.width/2.0  - h1[2]
-        t1 =  self.height/2.0 - h1[1]
-        b1 = -self.height/2.0 + h1[3]
-        for s in sides:
-            l0 = min(s[0][0],s[1][0])
-            r0 = max(s[0][0],s[1][0])
-            b0 = min(s[0][1],s[1][1])
-            t0 = max(s[0][1],s[1][1])
-            isx = l1 <= l0 <= r1 or l0 <= l1 <= r0
-            isy = b1 <= b0 <= t1 or b0 <= b1 <= t0
-            if isx and isy:
-                return True
-    
-        return False
+        # Separating axes: the hitboxes are rectangles, so their sides are the axes
+        c0 = self._world_corners()
+        c1 = obj._world_corners()
+        axes = numpy.concatenate((c0[1:3]-c0[0:2],c1[1:3]-c1[0:2]))
+        p0 = c0 @ axes.T
+        p1 = c1 @ axes.T
+        return bool(numpy.all((p0.min(axis=0) <= p1.max(axis=0)) & (p1.min(axis=0) <= p0.max(axis=0))))
     
     def contains(self,point):
         """
@@ -674,7 +742,7 @@ class GObject(object):
         """
         if isinstance(point,Point2):
             point = (point.x,point.y)
-        assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
+        check(point,lambda point: is_num_tuple(point,2),"%s is not a valid point")
         
         # Optimize for 90 degree turns
         if (self._rotate.angle % 360) in [0,90,180,270]:
@@ -682,7 +750,7 @@ class GObject(object):
             return l <= point[0] <= r and b <= point[1] <= t
         
         # Transform this to the right space.
-        point = tuple(self.matrix.inverse()._transform(point[0],point[1]))
+        point = self.transform_points(point)[0]
         w = self.width/2.0 
         h = self.height/2.0
         isx = - w + self._hitbox[0] <= point[0] <= w - self._hitbox[2]
@@ -705,13 +773,27 @@ class GObject(object):
         :rtype:  :class:`Point2`
         """
         if isinstance(point,Point2):
-            return self.inverse.transform(point)
-        else:
-            assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
-            p = self.inverse._transform(point[0],point[2])
-            return Point2(p[0],p[1])
+            point = (point.x,point.y)
+        check(point,lambda point: is_num_tuple(point,2),"%s is not a valid point")
+        p = self.transform_points(point)[0]
+        return Point2(float(p[0]),float(p[1]))
+
+    def transform_points(self,points):
+        """
+        Transforms many points to the local coordinate system at once
+
+        This is the same as calling :meth:`transform` on each point, but the points
+        are all transformed with one NumPy operation, and the result is an array.
 
-    def draw(self, view):
+        :param points: the points to transform, one row (x,y) for each point
+        :type points: float array of shape (n,2) or a sequence of pairs
+
+        :return: The points transformed to local coordinate system
+        :rtype:  float array of shape (n,2)
+        """
+        return affine_points(self.affine_inverse,points)
+
+    def draw(self, view, layer=None):
         """
         Draws this shape in the provided view.
 
@@ -719,11 +801,15 @@ class GObject(object):
 
         :param view: view to draw to
         :type view:  :class:`GView`
+
+        :param layer: The name of the layer to draw to (None for the default layer)
+        :type layer:  ``str`` naming a layer of the view, or None
         """
         try:
-            view.draw(self._cache)
-        except:
+            cache = self._cache
+        except AttributeError:
             raise IOError('Cannot draw %s since it was not initialized properly' % repr(self))
+        view.draw(cache,layer)
 
     # HIDDEN METHODS
     def _reset(self):
@@ -739,17 +825,48 @@ class GObject(object):
     def _build_matrix(self):
         """
         Builds the transform matrices after a settings change.
+
+        Only the NumPy matrices are built here.  The introcs matrices are built the
+        first time they are needed after a change.
         """
-        self._matrix = Matrix()
-        self._matrix.scale(self._scale.x,self._scale.y)
-        self._matrix.rotate(self._rotate.angle)
-        self._matrix.translate(self._trans.x,self._trans.y)
-        self._invrse = Matrix()
-        self._invrse.translate(-self._trans.x,-self._trans.y)
-        self._invrse.rotate(-self._rotate.angle)
-        self._invrse.scale(1.0/self._scale.x,1.0/self._scale.y)
+        self._affine = affine_matrix(self._trans.x,self._trans.y,self._rotate.angle,
+                                     self._scale.x,self._scale.y)
+        self._affinv = numpy.linalg.inv(self._affine)
+        self._matrix = None
+        self._invrse = None
+        self._wcorn = None
         self._mtrue = True
 
+    def _corners(self):
+        """
+        Returns: The corners of the hitbox of this object, in local coordinates
+
+        The corners are in the order top left, top right, bottom right, bottom left.
+
+        :rtype:  float array of shape (4,2)
+        """
+        hit = (0,0,0,0) if self._hitbox is None else self._hitbox
+        w = self.width/2.0
+        h = self.height/2.0
+        return numpy.array([[-w+hit[0], h-hit[1]],[ w-hit[2], h-hit[1]],
+                            [ w-hit[2],-h+hit[3]],[-w+hit[0],-h+hit[3]]])
+
+    def _world_corners(self):
+        """
+        Returns: The corners of the hitbox of this object, in world coordinates
+
+        The corners are in the same order as :meth:`_corners`.  They are cached until
+        the transform, the size or the hitbox of this object changes.  The array
+        should never be modified.
+
+        :rtype:  float array of shape (4,2)
+        """
+        key = (self.width,self.height,self._hitbox)
+        if self._wcorn is None or not self._mtrue or key != self._wkey:
+            self._wcorn = affine_points(self.affine,self._corners())
+            self._wkey = key
+        return self._wcorn
+
     def _bbox(self):
         """
         Computes the bounding box of this rotated object
@@ -785,18 +902,9 @@ class GObject(object):
             r = self.x - hit[1] + h
             l = self.x + hit[3] - h
         else:
-            comp = self.matrix
-            w = self.width/2.0
-            h = self.height/2.0
-            p0 = tuple(comp._transform(-w+hit[0], h-hit[1]))
-            p1 = tuple(comp._transform( w-hit[2], h-hit[1]))
-            p2 = tuple(comp._transform( w-hit[2],-h+hit[3]))
-            p3 = tuple(comp._transform(-w+hit[0],-h+hit[3]))
-            
-            l = min(p0[0],p1[0],p2[0],p3[0])
-            r = max(p0[0],p1[0],p2[0],p3[0])
-            b = min(p0[1],p1[1],p2[1],p3[1])
-            t = max(p0[1],p1[1],p2[1],p3[1])
+            corners = self._world_corners()
+            (l, b) = corners.min(axis=0).tolist()
+            (r, t) = corners.max(axis=0).tolist()
         
         return (l,t,r,b)
 
@@ -820,6 +928,10 @@ class GScene(GObject):
     All objects stored in a ``GScene`` are drawn as if the point (x,y) is the origin.
     """
 
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_children',)
+
     # MUTABLE PROPERTIES
     @property
     def children(self):
@@ -835,7 +947,7 @@ class GScene(GObject):
 
     @children.setter
     def children(self,value):
-        assert is_gobject_list(value), '%s is not a list of valid objects' % repr(value)
+        check(value,is_gobject_list,'%s is not a list of valid objects')
         self._children = list(value)
         if self._defined:
             self._reset()
@@ -940,3 +1052,138 @@ class GScene(GObject):
         for x in self.children:
             self._cache.add(x._cache)
         self._cache.add(PopMatrix())
+
+
+#mark -
+
+class GBatch(object):
+    """
+    A class representing a group of objects that are moved all at once.
+
+    Setting the attributes `x` and `y` of an object checks the value, converts it to a
+    float and updates the Kivy translation, once for each coordinate and each object.
+    A batch moves all of its objects with one call instead.  The new positions are
+    given as NumPy arrays (or anything NumPy can turn into an array), converted once
+    for the whole batch, and each object gets both coordinates in a single update of
+    its translation.  The transformation matrices of the objects are only rebuilt if
+    something asks for them later, as with the attributes.
+
+    The batch does not draw the objects, and it does not own them.  They can still be
+    moved one at a time, but the batch keeps its own copy of the positions it set (so
+    that moving only one coordinate never reads the translations back).  Call
+    :meth:`sync` after moving any of the objects without the batch.
+    """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_objects','_trans','_xy')
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def objects(self):
+        """
+        The objects in this batch, in order.
+
+        **Invariant**: Value is a tuple of :class:`GObject`.
+        """
+        return self._objects
+
+    @property
+    def positions(self):
+        """
+        The positions of the objects in this batch, as a new NumPy array.
+
+        The array has one row (x,y) for each object, in order.  These are the positions
+        that the batch last set (see :meth:`sync`).
+
+        **Invariant**: Value is a float array of shape (n,2), where n is the size.
+        """
+        return self._xy.copy()
+
+
+    # BUILT-IN METHODS
+    def __init__(self,objects):
+        """
+        Creates a batch for a list of objects.
+
+        :param objects: The objects to move
+        :type objects:  iterable of :class:`GObject`
+        """
+        self._objects = tuple(objects)
+        for obj in self._objects:
+            check(obj,lambda obj: isinstance(obj,GObject),'%s is not a GObject')
+        self._trans = [obj._trans for obj in self._objects]
+        self.sync()
+
+    def __len__(self):
+        """
+        :return: The number of objects in this batch.
+        :rtype:  ``int`` >= 0
+        """
+        return len(self._objects)
+
+
+    # PUBLIC METHODS
+    def move_to(self,x=None,y=None):
+        """
+        Moves every object to a new position.
+
+        Each coordinate is an array with one value for each object, a single number for
+        all of them, or None to leave that coordinate alone.
+
+        :param x: The new horizontal coordinates
+        :type x:  array of ``float``, ``float`` or None
+
+        :param y: The new vertical coordinates
+        :type y:  array of ``float``, ``float`` or None
+        """
+        if x is None and y is None:
+            return
+        xy = self._xy.copy() if x is None or y is None else numpy.empty((len(self),2))
+        if not x is None:
+            xy[:,0] = x
+        if not y is None:
+            xy[:,1] = y
+        self._apply(xy)
+
+    def move_by(self,dx=0,dy=0):
+        """
+        Moves every object by an offset.
+
+        Each offset is an array with one value for each object, or a single number for
+        all of them.
+
+        :param dx: The horizontal offsets
+        :type dx:  array of ``float`` or ``float``
+
+        :param dy: The vertical offsets
+        :type dy:  array of ``float`` or ``float``
+        """
+        xy = self._xy.copy()
+        xy[:,0] += dx
+        xy[:,1] += dy
+        self._apply(xy)
+
+    def sync(self):
+        """
+        Reads the positions of the objects again.
+
+        The batch only knows the positions that it set itself.  This must be called
+        after moving any of the objects one at a time, before moving only one of
+        the coordinates (or moving by an offset) with the batch.
+        """
+        self._xy = numpy.array([trans.xy for trans in self._trans],dtype=float).reshape(-1,2)
+
+
+    # HIDDEN METHODS
+    def _apply(self,xy):
+        """
+        Sets the translations of the objects to the given positions.
+
+        :param xy: The positions, one row (x,y) for each object
+        :type xy:  float array of shape (n,2)
+        """
+        for (obj, trans, pos) in zip(self._objects,self._trans,xy.tolist()):
+            trans.xy = pos
+            obj._mtrue = False
+        self._xy = xy
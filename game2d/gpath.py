@@ -10,7 +10,8 @@ Date:   August 1, 2017 (Python 3 version)
 # Lower-level kivy modules to support animation
 from kivy.graphics import *
 from kivy.graphics.instructions import *
-from .gobject import GObject
+from .gobject import GObject, is_num
+from .gmode import RELEASE, check
 
 
 def same_side(p1, p2, a, b):
@@ -103,6 +104,10 @@ class GPath(GObject):
     are 0.  However, if they are nonzero, then Python will add them to all of the points
     in the path, shifting the path accordingly.
     """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_points','_linewidth')
     
     # MUTABLE PROPERTIES
     @property
@@ -117,7 +122,7 @@ class GPath(GObject):
     
     @points.setter
     def points(self,value):
-        assert is_point_tuple(value,2),'value %s is not a valid list of points' %  repr(value)
+        check(value,lambda value: is_point_tuple(value,2),'value %s is not a valid list of points')
         self._points = tuple(value)
         if self._defined:
             self._reset()
@@ -135,8 +140,8 @@ class GPath(GObject):
     
     @linewidth.setter
     def linewidth(self,value):
-        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
-        assert value >= 0, 'value %s is negative' % repr(value)
+        check(value,is_num,'value %s is not a number')
+        check(value,lambda value: value >= 0,'value %s is negative')
         self._linewidth = value
         if self._defined:
             self._reset()
@@ -228,7 +233,7 @@ class GPath(GObject):
         """
         if isinstance(point,Point2):
             point = (point.x,point.y)
-        assert is_point_tuple(point,1),'value %s is not a valid point' %  repr(point)
+        check(point,lambda point: is_point_tuple(point,1),'value %s is not a valid point')
         x = point[0]
         y = point[1]
         
@@ -280,6 +285,10 @@ class GTriangle(GPath):
     will add them to the triangle vertices.  Similarly, the attributes `width` and 
     `height` are immutable, and are computed directly from the points
     """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ()
     
     # MUTABLE PROPERTIES
     @property
@@ -294,8 +303,8 @@ class GTriangle(GPath):
     
     @points.setter
     def points(self,value):
-        assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
-        assert len(value) == 6, 'value %s does not have the right length'  %  repr(value)
+        check(value,lambda value: is_point_tuple(value,3),'value %s is not a valid list of points')
+        check(value,lambda value: len(value) == 6,'value %s does not have the right length')
         self._points = tuple(value)
         if self._defined:
             self._reset()
@@ -343,7 +352,7 @@ class GTriangle(GPath):
         """
         if isinstance(point,Point2):
             point = (point.x,point.y)
-        assert is_point_tuple(point,1), "%s is not a valid point" % repr(point)
+        check(point,lambda point: is_point_tuple(point,1),"%s is not a valid point")
         
         return in_triangle(points,self._points)
     
@@ -397,6 +406,10 @@ class GPolygon(GPath):
     As with :class:`GPath`, the attributes ``width`` and ``height`` are immutable, and 
     are computed directly from the points
     """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_verts','_mesh','_source','_source_width','_source_height')
     
     # MUTABLE PROPERTIES
     @property
@@ -411,7 +424,7 @@ class GPolygon(GPath):
     
     @points.setter
     def points(self,value):
-        assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
+        check(value,lambda value: is_point_tuple(value,3),'value %s is not a valid list of points')
         self._points = tuple(value)
         if self._defined:
             self._reset()
@@ -428,7 +441,7 @@ class GPolygon(GPath):
     @source.setter
     def source(self,value):
         from .app import GameApp
-        assert value is None or GameApp.is_image(value), 'value %s is not an image file' % repr(value)
+        check(value,lambda value: value is None or GameApp.is_image(value),'value %s is not an image file')
         self._source = value
         if self._defined:
             self._reset()
@@ -453,7 +466,7 @@ class GPolygon(GPath):
     
     @source_width.setter
     def source_width(self,value):
-        assert value is None or type(value) in [int,float], 'value %s is not a valid width' % repr(value)
+        check(value,lambda value: value is None or is_num(value),'value %s is not a valid width')
         self._source_width = None
         if self._defined:
             self._reset()
@@ -478,7 +491,7 @@ class GPolygon(GPath):
     
     @source_height.setter
     def source_height(self,value):
-        assert value is None or _is_num(value), 'value %s is not a valid width' % repr(value)
+        check(value,lambda value: value is None or is_num(value),'value %s is not a valid width')
         self._source_height = None
         if self._defined:
             self._reset()
@@ -529,7 +542,7 @@ class GPolygon(GPath):
         """
         if isinstance(point,Point2):
             point = (point.x,point.y)
-        assert is_point_tuple(point,1), "%s is not a valid point" % repr(point)
+        check(point,lambda point: is_point_tuple(point,1),"%s is not a valid point")
         
         found = False
         for i in xrange(4,len(self._points),2):
@@ -0,0 +1,391 @@
+"""
+A module to support loading assets in the background.
+
+Decoding an image or a sound takes long enough that doing it for every asset in the
+first frame of a level makes the game stutter.  A preloader decodes the assets in a
+pool of worker threads instead, while the game is doing something else (such as
+showing a title screen).  Kivy does not promise that its image and sound loaders are
+safe to use outside of the main thread, so the workers never touch Kivy.  They read
+the files and decode PNG images into plain RGBA bytes.  The main thread calls
+:meth:`GPreloader.step` once a frame, which turns a few of the decoded images into
+textures (and a few of the sound files into sounds) each time.
+
+Author: Nicholas J. Runje (njr85)
+Date:   October 18, 2026
+"""
+import concurrent.futures
+import io
+import os
+import struct
+import zlib
+import numpy
+from .app import GameApp
+
+
+# The number of worker threads that decode assets
+PRELOAD_WORKERS = 4
+# The number of assets finished in the main thread by each step
+PRELOAD_BATCH = 2
+
+
+class GPreloader(object):
+    """
+    A class that loads images, fonts and sounds in the background.
+
+    The assets start loading as soon as the preloader is made.  Call :meth:`step`
+    once every frame to finish the assets that have been decoded, and :meth:`finish`
+    when they are needed right away.  When every asset is finished, the images are in
+    the texture cache (or the atlas) of :class:`GameApp`, the fonts have been rendered
+    once, and the sounds are loaded in the mixer of :class:`GameApp`.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def done(self):
+        """
+        Whether every asset has been loaded.
+
+        **Invariant**: Value is a bool.
+        """
+        return self._pending == [] and self._built
+
+    @property
+    def progress(self):
+        """
+        The fraction of the assets that have been loaded.
+
+        **Invariant**: Value is a float in 0..1.
+        """
+        if self._total == 0:
+            return 1.0
+        return (self._total-len(self._pending))/self._total
+
+
+    # BUILT-IN METHODS
+    def __init__(self,images=(),fonts=(),sounds=(),workers=PRELOAD_WORKERS,
+                 batch=PRELOAD_BATCH):
+        """
+        Creates a new preloader and starts loading the assets.
+
+        The images must be in the **Images** folder, the fonts in the **Fonts** folder
+        and the sounds in the **Sounds** folder.  Files that are not there are skipped.
+        If an image is in the atlas of :class:`GameApp`, every image on the same atlas
+        page is loaded too, as the whole page is drawn at once.
+
+        :param images: The image files to load
+        :type images:  iterable of ``str``
+
+        :param fonts: The fonts to load, as pairs (file,size)
+        :type fonts:  iterable of (``str``, ``int``)
+
+        :param sounds: The sound files to load
+        :type sounds:  iterable of ``str``
+
+        :param workers: The number of worker threads
+        :type workers:  ``int`` > 0
+
+        :param batch: The number of assets to finish in each step
+        :type batch:  ``int`` > 0
+        """
+        assert type(batch) == int and batch > 0, 'batch %s is not a positive int' % repr(batch)
+        self._batch = batch
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._pending = []
+        self._built = True
+
+        atlas = GameApp.ATLAS
+        names = []
+        for name in images:
+            if not GameApp.is_image(name) or name in names:
+                continue
+            if not atlas is None and name in atlas:
+                self._built = False
+                page = atlas.manifest['images'][name][0]
+                for other in atlas.manifest['pages'][page]:
+                    if not other in names:
+                        names.append(other)
+            else:
+                names.append(name)
+
+        for name in names:
+            future = self._pool.submit(self._decodeImage,name)
+            self._pending.append((future,self._finishImage,name))
+        for (name,size) in fonts:
+            if GameApp.is_font(name):
+                future = self._pool.submit(self._readFile,os.path.join(GameApp.fonts,name))
+                self._pending.append((future,self._finishFont,(name,size)))
+        for name in sounds:
+            if GameApp.is_sound(name):
+                future = self._pool.submit(self._readFile,os.path.join(GameApp.sounds,name))
+                self._pending.append((future,self._finishSound,name))
+        self._total = len(self._pending)
+        self._pool.shutdown(wait=False)
+
+
+    # PUBLIC METHODS
+    def step(self):
+        """
+        Returns: True if every asset has been loaded
+
+        This finishes at most a batch of the assets that have been decoded.  Once every
+        asset in the atlas is finished, it draws the atlas pages (as a step of its own).
+        It must be called from the main thread.
+        """
+        count = 0
+        pos = 0
+        while pos < len(self._pending) and count < self._batch:
+            if self._pending[pos][0].done():
+                self._finish(self._pending.pop(pos))
+                count += 1
+            else:
+                pos += 1
+
+        if self._pending == [] and not self._built and count < self._batch:
+            GameApp.ATLAS.build()
+            self._built = True
+        return self.done
+
+    def finish(self):
+        """
+        Waits for every asset to be decoded, and then finishes all of them
+
+        It must be called from the main thread.
+        """
+        while self._pending != []:
+            self._finish(self._pending.pop(0))
+        if not self._built:
+            GameApp.ATLAS.build()
+            self._built = True
+
+
+    # HIDDEN METHODS
+    def _finish(self,item):
+        """
+        Finishes a single asset in the main thread
+
+        An asset that could not be decoded is skipped.  It is loaded the normal way
+        when it is first used.
+
+        :param item: The asset to finish
+        :type item:  triple (future,function or None,argument)
+        """
+        (future, function, argument) = item
+        try:
+            result = future.result()
+        except Exception:
+            return
+        if not function is None and not result is None:
+            function(argument,result)
+
+    def _decodeImage(self,name):
+        """
+        Returns: The decoded image for a file (in a worker thread)
+
+        The result is a triple (width,height,pixels) for a PNG file that
+        :func:`_decode_png` can read, with the pixels as RGBA bytes and the top row
+        first.  For any other file, the result is the contents of the file, which Kivy
+        decodes in the main thread.  This does not use Kivy at all.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        data = self._readFile(os.path.join(GameApp.images,name))
+        image = _decode_png(data)
+        return data if image is None else image
+
+    def _readFile(self,path):
+        """
+        Returns: The contents of a file (in a worker thread)
+
+        Reading a font ahead of time means the main thread finds it in the file cache
+        of the operating system.
+
+        :param path: The path to the file
+        :type path:  ``str``
+        """
+        with open(path,'rb') as file:
+            return file.read()
+
+    def _finishImage(self,name,image):
+        """
+        Makes the texture for a decoded image (in the main thread)
+
+        A texture for the atlas is given to the atlas.  Any other texture is put in the
+        texture cache.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param image: The decoded image
+        :type image:  triple (``int``, ``int``, ``bytes``) or the file contents
+        """
+        if type(image) == tuple:
+            from kivy.core.image import ImageData
+            from kivy.graphics.texture import Texture
+            (width, height, pixels) = image
+            texture = Texture.create_from_data(ImageData(width,height,'rgba',pixels))
+            texture.flip_vertical()     # The top row is first, as with Kivy images
+        else:
+            from kivy.core.image import Image
+            ext = os.path.splitext(name)[1][1:].lower()
+            texture = Image(io.BytesIO(image),ext=ext,nocache=True).texture
+        if not GameApp.ATLAS is None and name in GameApp.ATLAS:
+            GameApp.ATLAS.supply(name,texture)
+        else:
+            size = texture.width*texture.height*len(texture.colorfmt)
+            GameApp.TEXTURE_CACHE.insert(name,texture,size)
+
+    def _finishFont(self,font,data):
+        """
+        Renders a label once with a font (in the main thread)
+
+        This makes Kivy open the font at that size, so the first real label is fast.
+
+        :param font: The font file and size
+        :type font:  pair (``str``, ``int``)
+
+        :param data: The contents of the font file (unused)
+        :type data:  ``bytes``
+        """
+        from kivy.core.text import Label
+        label = Label(text='ABCDEFGHIJKLMNOPQRSTUVWXYZ',font_name=font[0],font_size=font[1])
+        label.refresh()
+
+    def _finishSound(self,name,data):
+        """
+        Loads the voices for a sound file in the mixer (in the main thread)
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param data: The contents of the sound file (unused)
+        :type data:  ``bytes``
+        """
+        from .sound import preload_sound
+        preload_sound(name)
+
+
+def _decode_png(data):
+    """
+    Returns: The pixels of a PNG file as a triple (width,height,pixels), or None
+
+    The pixels are RGBA bytes, with the top row first.  Only images with 8 bits per
+    channel and no interlacing can be read.  This returns None for any other file, so
+    that Kivy can decode it instead.
+
+    The filters None, Sub and Up are undone a row at a time with NumPy.  The filters
+    Average and Paeth depend on the byte to the left after it is unfiltered, so they
+    are undone one byte at a time.
+
+    :param data: The contents of the file
+    :type data:  ``bytes``
+    """
+    if data[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+
+    chunks = {}
+    compressed = []
+    pos = 8
+    while pos+8 <= len(data):
+        length = int.from_bytes(data[pos:pos+4],'big')
+        kind = data[pos+4:pos+8]
+        if kind == b'IDAT':
+            compressed.append(data[pos+8:pos+8+length])
+        elif not kind in chunks:
+            chunks[kind] = data[pos+8:pos+8+length]
+        pos += 12+length
+
+    header = chunks.get(b'IHDR',b'')
+    if len(header) < 13:
+        return None
+    (width,height,depth,color,compression,filtering,interlace) = \
+        struct.unpack('>IIBBBBB',header[:13])
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}.get(color)
+    if depth != 8 or interlace != 0 or channels is None or width == 0 or height == 0:
+        return None
+    if color == 3 and not b'PLTE' in chunks:
+        return None
+
+    try:
+        raw = zlib.decompress(b''.join(compressed))
+    except zlib.error:
+        return None
+    stride = width*channels+1
+    if len(raw) < stride*height:
+        return None
+    rows = numpy.frombuffer(raw,dtype=numpy.uint8,count=stride*height).reshape(height,stride)
+
+    pixels = numpy.empty((height,width*channels),dtype=numpy.uint8)
+    above = numpy.zeros(width*channels,dtype=numpy.int64)
+    for row in range(height):
+        line = rows[row,1:].astype(numpy.int64)
+        kind = rows[row,0]
+        if kind == 0:
+            current = line
+        elif kind == 1:
+            current = numpy.cumsum(line.reshape(width,channels),axis=0).reshape(-1) & 255
+        elif kind == 2:
+            current = (line+above) & 255
+        elif kind in (3,4):
+            current = numpy.array(_unfilter_row(line.tolist(),above.tolist(),kind,channels),
+                                  dtype=numpy.int64)
+        else:
+            return None
+        pixels[row] = current
+        above = current
+
+    pixels = pixels.reshape(height,width,channels)
+    if color == 6:
+        rgba = pixels
+    else:
+        rgba = numpy.full((height,width,4),255,dtype=numpy.uint8)
+        if color == 2:
+            rgba[:,:,:3] = pixels
+        elif color == 0 or color == 4:
+            rgba[:,:,:3] = pixels[:,:,:1]
+            if color == 4:
+                rgba[:,:,3] = pixels[:,:,1]
+        else:
+            table = numpy.full((256,4),255,dtype=numpy.uint8)
+            palette = numpy.frombuffer(chunks[b'PLTE'],dtype=numpy.uint8)
+            palette = palette[:len(palette)//3*3].reshape(-1,3)[:256]
+            table[:len(palette),:3] = palette
+            trns = numpy.frombuffer(chunks.get(b'tRNS',b''),dtype=numpy.uint8)[:256]
+            table[:len(trns),3] = trns
+            rgba = table[pixels[:,:,0]]
+    return (width,height,rgba.tobytes())
+
+
+def _unfilter_row(line,above,kind,channels):
+    """
+    Returns a PNG row after undoing the filter Average or Paeth
+
+    :param line: The filtered bytes of the row
+    :type line:  ``list`` of ``int`` in 0..255
+
+    :param above: The unfiltered bytes of the row above
+    :type above:  ``list`` of ``int`` in 0..255, the same length as line
+
+    :param kind: The filter type
+    :type kind:  3 (Average) or 4 (Paeth)
+
+    :param channels: The number of bytes in a pixel
+    :type channels:  ``int`` > 0
+    """
+    result = []
+    for (pos,(value,up)) in enumerate(zip(line,above)):
+        left = result[pos-channels] if pos >= channels else 0
+        corner = above[pos-channels] if pos >= channels else 0
+        if kind == 3:
+            guess = (left+up)//2
+        else:
+            base = left+up-corner
+            (da, db, dc) = (abs(base-left), abs(base-up), abs(base-corner))
+            if da <= db and da <= dc:
+                guess = left
+            elif db <= dc:
+                guess = up
+            else:
+                guess = corner
+        result.append((value+guess) & 255)
+    return result
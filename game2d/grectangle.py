@@ -12,7 +12,9 @@ from kivy.graphics import *
 from kivy.graphics.instructions import *
 from kivy.uix.label import Label
 from kivy.uix.image import Image
-from .gobject import GObject
+from introcs.geom import Point2
+from .gobject import GObject, is_num, is_num_tuple, affine_points
+from .gmode import RELEASE, check
 from .app import GameApp
 
 class GRectangle(GObject):
@@ -28,6 +30,10 @@ class GRectangle(GObject):
     The only new property for this class is ``linewidth``, which controls the width of
     the border around the rectangle.  For all other properties, see the documentation
     for :class:`GObject`."""
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_linewidth',)
     
     # MUTABLE PROPERTIES 
     @property
@@ -43,8 +49,8 @@ class GRectangle(GObject):
     
     @linewidth.setter
     def linewidth(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
-        assert value >= 0, '%s is negative' % repr(value)
+        check(value,is_num,'%s is not a number')
+        check(value,lambda value: value >= 0,'%s is negative')
         self._linewidth = value
         if self._defined:
             self._reset()
@@ -111,6 +117,10 @@ class GEllipse(GRectangle):
     This class has exactly the same properties as :class:`GRectangle`.  See the 
     documentation of that class and :class:`GObject` for a complete list of attributes.
     """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ()
     
     # BUILT-IN METHODS
     def __init__(self,**keywords):
@@ -142,11 +152,11 @@ class GEllipse(GRectangle):
         **Warning**: Using this method on a rotated object may slow down your framerate.
         
         :param point: the point to check
-        :type point: :class:`GPoint`` or a pair of numbers
+        :type point: :class:`Point2` or a pair of numbers
         """
-        if isinstance(point,GPoint):
+        if isinstance(point,Point2):
             point = (point.x,point.y)
-        assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
+        check(point,lambda point: is_num_tuple(point,2),"%s is not a valid point")
         
         rx = self.width/2.0
         ry = self.height/2.0
@@ -154,7 +164,7 @@ class GEllipse(GRectangle):
             dx = (point[0]-self.x)*(point[0]-self.x)/(rx*rx)
             dy = (point[1]-self.y)*(point[1]-self.y)/(ry*ry)
         else:
-            p = self.matrix.inverse()._transform(point[0],point[1])
+            p = self.transform_points(point)[0]
             dx = p[0]*p[0]/(rx*rx)
             dy = p[1]*p[1]/(ry*ry)
         
@@ -204,6 +214,10 @@ class GImage(GRectangle):
     If the image supports transparency, then this object can be used to represent irregular 
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_source','_texture')
     
     # MUTABLE PROPERTIES
     @property
@@ -217,7 +231,7 @@ class GImage(GRectangle):
 
     @source.setter
     def source(self,value):
-        assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        check(value,lambda value: value is None or GameApp.is_image(value),'%s is not an image file')
         self._source = value
         if self._defined:
             self._reset()
@@ -255,7 +269,7 @@ class GImage(GRectangle):
         """
         GObject._reset(self)
         
-        self._texture = GameApp.load_texture(self.source)
+        self._texture = GameApp.hold_texture(self,self.source)
         if not self._texture is None and (self.width == 0 or self.height == 0):
                 self.width  = self._texture.width
                 self.height = self._texture.height
@@ -301,6 +315,10 @@ class GLabel(GRectangle):
     default Kivy font.  The `bold` attribute only works for the default Kivy font; for 
     other fonts you will need the .ttf file for the bold version of that font.  See the
     provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_label','_fsize','_halign','_valign','_hanchor','_vanchor','_ha','_hv')
     
     # MUTABLE PROPERTIES
     @property
@@ -313,7 +331,7 @@ class GLabel(GRectangle):
     
     @font_size.setter
     def font_size(self,value):
-        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        check(value,is_num,'value %s is not a number')
         self._fsize = value
         self._label.font_size = value
         self._label.texture_update()
@@ -329,7 +347,7 @@ class GLabel(GRectangle):
     @font_name.setter
     def font_name(self,value):
         from .app import GameApp
-        assert GameApp.is_font(value), 'value %s is not a font name' % repr(value)
+        check(value,GameApp.is_font,'value %s is not a font name')
         self._label.font_name = value
         self._label.texture_update()
     
@@ -347,7 +365,7 @@ class GLabel(GRectangle):
 
     @bold.setter
     def bold(self,value):
-        assert type(value) == bool, repr(value)+' is not a bool'
+        check(value,lambda value: type(value) == bool,'%s is not a bool')
         self._label.bold = value
         self._label.texture_update()
 
@@ -365,7 +383,7 @@ class GLabel(GRectangle):
     
     @text.setter
     def text(self,value):
-        assert type(value) == str, 'value %s is not a string' % repr(value)
+        check(value,lambda value: type(value) == str,'value %s is not a string')
         self._label.text = value
         self._label.texture_update()
     
@@ -387,7 +405,7 @@ class GLabel(GRectangle):
     
     @halign.setter
     def halign(self,value):
-        assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
+        check(value,lambda value: value in ('left','right','center'),'value %s is not a valid horizontal alignment')
         self._halign = value
         self._label.halign = value
         if self._defined:
@@ -411,7 +429,7 @@ class GLabel(GRectangle):
     
     @valign.setter
     def valign(self,value):
-        assert value in ('top','middle','bottom'), 'value %s is not a valid vertical alignment' % repr(value)
+        check(value,lambda value: value in ('top','middle','bottom'),'value %s is not a valid vertical alignment')
         self._valign = value
         self._label.valign = value
         if self._defined:
@@ -429,7 +447,7 @@ class GLabel(GRectangle):
     
     @x.setter
     def x(self,value):
-        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        check(value,is_num,'value %s is not a number')
         self._trans.x = float(value)
         self._mtrue = False
         self._hanchor = 'center'
@@ -445,7 +463,7 @@ class GLabel(GRectangle):
     
     @y.setter
     def y(self,value):
-        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        check(value,is_num,'value %s is not a number')
         self._trans.y = float(value)
         self._mtrue = False
         self._vanchor = 'center'
@@ -469,15 +487,11 @@ class GLabel(GRectangle):
         if self._rotate.angle == 0.0:
             return self.x-self.width/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return float(self._edges()[:,0].min())
     
     @left.setter
     def left(self,value):
-        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        check(value,is_num,'value %s is not a number')
         diff = value-self.left
         self.x += diff
         self._hanchor = 'left'
@@ -501,15 +515,11 @@ class GLabel(GRectangle):
         if self._rotate.angle == 0.0:
             return self.x+self.width/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return float(self._edges()[:,0].max())
     
     @right.setter
     def right(self,value):
-        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        check(value,is_num,'value %s is not a number')
         diff = value-self.right
         self.x += diff
         self._hanchor = 'right'
@@ -533,15 +543,11 @@ class GLabel(GRectangle):
         if self._rotate.angle == 0.0:
             return self.y+self.height/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return float(self._edges()[:,1].max())
     
     @top.setter
     def top(self,value):
-        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        check(value,is_num,'value %s is not a number')
         diff = value-self.top
         self.y += diff
         self._vanchor = 'top'
@@ -564,16 +570,12 @@ class GLabel(GRectangle):
         if self._rotate.angle == 0.0:
             return self.y-self.height/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return float(self._edges()[:,1].min())
     
     
     @bottom.setter
     def bottom(self,value):
-        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        check(value,is_num,'value %s is not a number')
         diff = value-self.bottom
         self.y += diff
         self._vanchor = 'bottom'
@@ -637,7 +639,17 @@ class GLabel(GRectangle):
         """
         if self._defined:
             self._reset()
-    
+
+    def _edges(self):
+        """
+        Returns: The corners of this (rotated) label, as a NumPy array of shape (4,2)
+
+        Unlike :meth:`_corners`, this ignores the hitbox, as the label edges always do.
+        """
+        w = self.width/2.0
+        h = self.height/2.0
+        return affine_points(self.affine,((-w,-h),(w,-h),(w,h),(-w,h)))
+
     def _reset(self):
         """
         Resets the drawing cache.
@@ -12,6 +12,8 @@ Date:   November 1, 2020
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from .grectangle import GRectangle, GObject
+from .gobject import is_num_tuple
+from .gmode import RELEASE, check
 from .app import GameApp
 
 # #mark -
@@ -34,6 +36,10 @@ class GSprite(GRectangle):
     If the image supports transparency, then this object can be used to represent irregular 
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_source','_texture','_format','_frame','_images','_hitboxes','_bounds')
     
     # IMMUTABLE PROPERTIES
     @property
@@ -57,7 +63,7 @@ class GSprite(GRectangle):
 
     @source.setter
     def source(self,value):
-        assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        check(value,lambda value: value is None or GameApp.is_image(value),'%s is not an image file')
         self._source = value
         if self._defined:
             self._reset()
@@ -77,9 +83,9 @@ class GSprite(GRectangle):
     
     @format.setter
     def format(self,value):
-        assert type(value) in [tuple,list] and len(value) == 2, '%s does is not a tuple pair' % repr(value)
-        assert type(value[0]) == int and type(value[1]) == int, '%s does not have int values' % repr(value)
-        assert value[0] > 0 and value[1] > 0, '%s does not have valid values' % repr(value)
+        check(value,lambda value: type(value) in [tuple,list] and len(value) == 2,'%s does is not a tuple pair')
+        check(value,lambda value: type(value[0]) == int and type(value[1]) == int,'%s does not have int values')
+        check(value,lambda value: value[0] > 0 and value[1] > 0,'%s does not have valid values')
         self._format = tuple(value)
         count = value[0]*value[1]
         
@@ -101,8 +107,8 @@ class GSprite(GRectangle):
     
     @frame.setter
     def frame(self,value):
-        assert type(value) == int, '%s is not an int' % repr(value)
-        assert value >= 0 and value < self.count, '%s is out of range' % repr(value)
+        check(value,lambda value: type(value) == int,'%s is not an int')
+        check(value,lambda value: value >= 0 and value < self.count,'%s is out of range')
         self._frame = value
         if not self.hitboxes is None:
             self.hitbox = self.hitboxes[value]
@@ -133,13 +139,9 @@ class GSprite(GRectangle):
             self._hitbox   = None
             return
         
-        try:
-            size = len(value)
-        except:
-            size = 0
-        assert size == self.count, '%s is not a tuple or list of size %s' % (repr(value),repr(self.count))
-        assert all(map(lambda x : type(x) in [tuple,list] and len(x) == 4, value)), '%s contains an invalid hitbox' % repr(value)
-        assert all(map(lambda x : all(map(lambda y: type(y) in [int,float], x)),value)),  '%s contains an invalid hitbox' % repr(value)
+        check(value,lambda value: type(value) in [tuple,list] and len(value) == self.count,
+              '%s does not have a hitbox for each frame')
+        check(value,lambda value: all(map(lambda x: is_num_tuple(x,4),value)),'%s contains an invalid hitbox')
         self._hitboxes = tuple(map(tuple,value))
         self.hitbox = self._hitboxes[self.frame]
     
@@ -182,7 +184,7 @@ class GSprite(GRectangle):
         """
         GObject._reset(self)
         
-        texture = GameApp.load_texture(self.source)
+        texture = GameApp.hold_texture(self,self.source)
         if texture:
             width  = texture.width/self._format[1]
             height = texture.height/self._format[0]
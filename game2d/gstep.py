@@ -0,0 +1,41 @@
+"""
+A module to support fixed-step game loops.
+
+A game that updates once per animation frame plays faster or slower with the frame
+rate.  A fixed-step loop adds the time of each frame to an accumulator instead, and
+runs as many updates of exactly one step as fit in it.  The time that is left over
+is the interpolation for drawing.  This module has the arithmetic of that loop, so
+that it does not need Kivy (:class:`GameApp` runs the updates themselves).
+
+Author: Nicholas J. Runje (njr85)
+Date:   October 18, 2026
+"""
+
+
+def fixed_steps(accumulator,timestep,maxsteps):
+    """
+    Returns: The triple (steps,accumulator,alpha) for one animation frame
+
+    The value steps is the number of updates to run in this frame.  It is the number
+    of whole time steps in the accumulator, but never more than maxsteps.  If the
+    frame is so long that there are more, the extra time is dropped instead of being
+    made up in later frames (so a slow machine plays slower instead of freezing).  The
+    new accumulator is the time left over, which is always less than one step.  The
+    value alpha is that time as a fraction of a step, in the range [0,1).
+
+    :param accumulator: The time left over from the last frame plus this frame
+    :type accumulator:  ``int`` or ``float`` >= 0
+
+    :param timestep: The time of one update in seconds
+    :type timestep:  ``int`` or ``float`` > 0
+
+    :param maxsteps: The most updates to run in one frame
+    :type maxsteps:  ``int`` > 0
+    """
+    steps = 0
+    while accumulator >= timestep and steps < maxsteps:
+        accumulator -= timestep
+        steps += 1
+    if accumulator >= timestep:
+        accumulator %= timestep
+    return (steps,accumulator,accumulator/timestep)
@@ -0,0 +1,280 @@
+"""
+A module to support texture memory management.
+
+Textures use memory both on the graphics card and in Python, so a game should not keep
+every texture it has ever loaded.  The texture cache in this module counts how many
+live drawables use each texture.  Textures that nothing uses stay in the cache, in case
+they are needed again, until the cache goes over its memory budget.  Then the least
+recently used of them are dropped first.
+
+This module does not need Kivy.  The cache is given a function that loads a texture,
+and it only needs the size of each texture to know how much memory it uses.  Every
+method holds a lock, so a cache may be used from more than one thread.
+
+Author: Nicholas J. Runje (njr85)
+Date:   October 18, 2026
+"""
+from collections import OrderedDict
+import threading
+import weakref
+
+
+# The default memory budget of a texture cache in bytes
+TEXTURE_BUDGET = 64*1024*1024
+
+
+class GTextureCache(object):
+    """
+    A class representing a memory-budgeted cache of textures.
+
+    Textures are loaded the first time they are asked for.  The method :meth:`hold`
+    also records that a drawable uses the texture, until the drawable uses another
+    texture or is garbage collected.  A texture that some drawable uses is never
+    dropped.  Whenever the memory of the textures in the cache goes over the budget,
+    unused textures are dropped, least recently used first.
+
+    The cache keeps statistics on the number of hits (textures that were already in
+    the cache), misses (textures that had to be loaded) and evictions (textures that
+    were dropped to stay within the budget).
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def budget(self):
+        """
+        The memory budget of this cache in bytes.
+
+        The cache may go over the budget if the textures in use need more memory than
+        that.  Setting the budget drops unused textures until the cache is within it.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._budget
+
+    @budget.setter
+    def budget(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value >= 0, 'value %s is negative' % repr(value)
+        with self._lock:
+            self._budget = value
+            self._evict()
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def resident(self):
+        """
+        The number of bytes used by the textures in this cache.
+
+        **Invariant**: Value is an int >= 0.
+        """
+        return self._resident
+
+    @property
+    def stats(self):
+        """
+        The statistics for this cache, as a new dictionary.
+
+        The keys are 'hits', 'misses', 'evictions', 'textures' (the number of textures
+        in the cache), 'held' (how many of those are in use) and 'bytes' (the memory
+        used, the same as :attr:`resident`).
+
+        **Invariant**: Value is a dictionary from strings to ints.
+        """
+        with self._lock:
+            held = len([name for name in self._entries if self._entries[name][2] > 0])
+            return {'hits': self._hits, 'misses': self._misses,
+                    'evictions': self._evictions, 'textures': len(self._entries),
+                    'held': held, 'bytes': self._resident}
+
+
+    # BUILT-IN METHODS
+    def __init__(self,loader,budget=TEXTURE_BUDGET):
+        """
+        Creates a new, empty texture cache.
+
+        The loader is a function that takes a file name and returns a pair (texture,
+        bytes), where bytes is the memory used by the texture.  It returns None if the
+        texture cannot be loaded.
+
+        :param loader: The function that loads a texture
+        :type loader:  callable
+
+        :param budget: The memory budget in bytes
+        :type budget:  ``int`` >= 0
+        """
+        self._loader = loader
+        self._lock = threading.RLock()
+        # Every entry is a list [texture,bytes,holds], in order of use (oldest first)
+        self._entries = OrderedDict()
+        self._owners = {}
+        self._resident = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.budget = budget
+
+    def __contains__(self,name):
+        """
+        Returns: True if the texture for name is in this cache
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        return name in self._entries
+
+
+    # PUBLIC METHODS
+    def get(self,name):
+        """
+        Returns: The texture for a file name, or None if it cannot be loaded
+
+        The texture is loaded if it is not in the cache already.  This does not record
+        that anything uses the texture, so it may be dropped later.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        with self._lock:
+            entry = self._load(name)
+            self._evict()
+            return None if entry is None else entry[0]
+
+    def insert(self,name,texture,size):
+        """
+        Adds a texture that was loaded somewhere else to this cache
+
+        This does nothing if the cache already has a texture for name.  The texture
+        counts as the most recently used one, but it is not held by anything.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param texture: The texture for the file
+        :type texture:  a texture
+
+        :param size: The memory used by the texture in bytes
+        :type size:  ``int`` >= 0
+        """
+        with self._lock:
+            if not name in self._entries:
+                self._entries[name] = [texture,size,0]
+                self._resident += size
+                self._evict()
+
+    def hold(self,owner,name):
+        """
+        Returns: The texture for a file name, recording that owner uses it
+
+        Any texture that owner held before is released.  The texture is released when
+        owner is garbage collected, or when owner holds another texture.
+
+        :param owner: The drawable that uses the texture
+        :type owner:  any object that supports weak references
+
+        :param name: The file name
+        :type name:  ``str`` or None
+        """
+        with self._lock:
+            key = id(owner)
+            if not key in self._owners:
+                self._owners[key] = None
+                weakref.finalize(owner,self._drop,key)
+
+            old = self._owners[key]
+            entry = None if name is None else self._load(name)
+            if not entry is None:
+                entry[2] += 1
+            self._owners[key] = None if entry is None else name
+            if not old is None:
+                self.release(old)
+            self._evict()
+            return None if entry is None else entry[0]
+
+    def release(self,name):
+        """
+        Records that one drawable no longer uses the texture for name
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        with self._lock:
+            if name in self._entries and self._entries[name][2] > 0:
+                self._entries[name][2] -= 1
+                self._evict()
+
+    def remove(self,name):
+        """
+        Returns: The texture for name after removing it, or None if it is not cached
+
+        The texture is removed even if drawables still use it.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        with self._lock:
+            if not name in self._entries:
+                return None
+            entry = self._entries.pop(name)
+            self._resident -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        """
+        Removes every texture that no drawable uses from this cache
+        """
+        with self._lock:
+            for name in list(self._entries):
+                if self._entries[name][2] == 0:
+                    self.remove(name)
+
+
+    # HIDDEN METHODS
+    def _load(self,name):
+        """
+        Returns: The cache entry for name, or None if the texture cannot be loaded
+
+        This counts a hit or a miss, and makes the entry the most recently used.  The
+        lock must be held when this is called.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        if name in self._entries:
+            self._hits += 1
+            self._entries.move_to_end(name)
+            return self._entries[name]
+
+        self._misses += 1
+        result = self._loader(name)
+        if result is None:
+            return None
+        self._entries[name] = [result[0],result[1],0]
+        self._resident += result[1]
+        return self._entries[name]
+
+    def _evict(self):
+        """
+        Drops unused textures, least recently used first, until within the budget
+
+        The lock must be held when this is called.
+        """
+        if self._resident <= self._budget:
+            return
+        for name in list(self._entries):
+            if self._resident <= self._budget:
+                return
+            if self._entries[name][2] == 0:
+                self.remove(name)
+                self._evictions += 1
+
+    def _drop(self,key):
+        """
+        Releases the texture held by a drawable that was garbage collected
+
+        :param key: The id of the drawable
+        :type key:  ``int``
+        """
+        with self._lock:
+            name = self._owners.pop(key,None)
+            if not name is None:
+                self.release(name)
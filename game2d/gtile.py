@@ -10,8 +10,87 @@ Date:   November 1, 2020
 """
 from kivy.graphics import *
 from kivy.graphics.instructions import *
-from .grectangle import GRectangle, GObject
+from .gobject import GObject
+from .gmode import RELEASE, check
 from .app import GameApp
+import numpy
+
+
+# The most quads in a single mesh (Kivy mesh indices are 16 bit)
+MESH_QUADS = 16383
+
+
+def _tile_quads(x,y,width,height,texture):
+    """
+    Returns the vertices of the quads that tile a rectangle with a texture
+
+    The result is a NumPy array with one row of 16 numbers for every copy of the
+    texture, giving the four corners (x,y,u,v) counter-clockwise from the bottom left.
+    The copies in the last column and row are cut short to fit the rectangle.  The
+    texture may be a region of an atlas.
+
+    :param x: The left edge of the rectangle
+    :type x:  ``int`` or ``float``
+
+    :param y: The bottom edge of the rectangle
+    :type y:  ``int`` or ``float``
+
+    :param width: The width of the rectangle
+    :type width:  ``int`` or ``float`` >= 0
+
+    :param height: The height of the rectangle
+    :type height:  ``int`` or ``float`` >= 0
+
+    :param texture: The texture to repeat
+    :type texture:  a Kivy texture
+    """
+    grid_x = texture.width
+    grid_y = texture.height
+    size_x = int(width//grid_x)
+    size_y = int(height//grid_y)
+    rng_x = size_x+1 if width-grid_x*size_x > 0 else size_x
+    rng_y = size_y+1 if height-grid_y*size_y > 0 else size_y
+
+    # The texture may be a region of an atlas, so map the tile into its coordinates
+    coords = texture.tex_coords
+    (u0, v0) = coords[0:2]
+    (du, dv) = (coords[2]-u0, coords[7]-v0)
+
+    shape  = (rng_x,rng_y)
+    left   = numpy.broadcast_to(x+numpy.arange(rng_x)[:,None]*float(grid_x),shape)
+    bottom = numpy.broadcast_to(y+numpy.arange(rng_y)[None,:]*float(grid_y),shape)
+    right  = numpy.minimum(left+grid_x,x+width)
+    top    = numpy.minimum(bottom+grid_y,y+height)
+    u1 = u0+(right-left)/grid_x*du
+    v1 = v0+(top-bottom)/grid_y*dv
+    u0 = numpy.full(shape,u0)
+    v0 = numpy.full(shape,v0)
+
+    quads = numpy.stack([left,bottom,u0,v0, right,bottom,u1,v0,
+                         right,top,u1,v1,   left,top,u0,v1],axis=-1)
+    return quads.reshape(-1,16)
+
+
+def _quad_meshes(quads,texture):
+    """
+    Returns the list of meshes that draw the given quads with a texture
+
+    The quads are split over several meshes if there are more than MESH_QUADS.
+
+    :param quads: The quads, as returned by :func:`_tile_quads`
+    :type quads:  NumPy array with 16 columns
+
+    :param texture: The texture of the quads
+    :type texture:  a Kivy texture
+    """
+    meshes = []
+    corners = numpy.array([0,1,2,2,3,0])
+    for start in range(0,len(quads),MESH_QUADS):
+        chunk = quads[start:start+MESH_QUADS]
+        indx = (numpy.arange(len(chunk))[:,None]*4+corners).reshape(-1)
+        meshes.append(Mesh(vertices=chunk.reshape(-1).tolist(),indices=indx.tolist(),
+                           mode='triangles',texture=texture))
+    return meshes
 
 
 class GTile(GObject):
@@ -24,6 +103,10 @@ class GTile(GObject):
     to fill in all of the remaining space.  This is ideal for terrain and other
     background features
     """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_source','_texture')
     
     # MUTABLE PROPERTIES
     @property
@@ -37,7 +120,7 @@ class GTile(GObject):
     
     @source.setter
     def source(self,value):
-        assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        check(value,lambda value: value is None or GameApp.is_image(value),'%s is not an image file')
         self._source = value
         if self._defined:
             self._reset()
@@ -90,7 +173,9 @@ class GTile(GObject):
         if not 'height' in keywords:
             raise ValueError("The 'height' argument must be specified.")
         self._texture = None
-        GRectangle.__init__(self,**keywords)
+        # Always delay the call to parent class, to avoid reset
+        GObject.__init__(self,**keywords)
+        self._reset()
         self._defined = True
     
     # HIDDEN METHODS
@@ -102,41 +187,140 @@ class GTile(GObject):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        self._texture = GameApp.load_texture(self.source)
+        self._texture = GameApp.hold_texture(self,self.source)
         if not self._texture is None and self.width == 0:
             self.width  = self._texture.width
         if not self._texture is None and self.height == 0:
             self.height = self._texture.height
         
-        grid_x = self._texture.width
-        grid_y = self._texture.height
-        size_x = int(self.width//grid_x)
-        size_y = int(self.height//grid_y)
-        rem_x = self.width-grid_x*size_x
-        rem_y = self.height-grid_y*size_y
-        
-        rng_x = size_x+1 if rem_x > 0 else size_x
-        rng_y = size_y+1 if rem_y > 0 else size_y
-        
-        vert = []
-        indx = []
-        pos = 0
-        for ii in range(rng_x):
-            for jj in range(rng_y):
-                ni = 1 if ii < size_x else rem_x/grid_x
-                nj = 1 if jj < size_y else rem_y/grid_y
-                vert.extend([x+ii*grid_x,      y+jj*grid_y,         0, 1])
-                vert.extend([x+(ii+ni)*grid_x, y+jj*grid_y,        ni, 1])
-                vert.extend([x+(ii+ni)*grid_x, y+(jj+nj)*grid_y,   ni, 1-nj])
-                vert.extend([x+ii*grid_x,      y+(jj+nj)*grid_y,    0, 1-nj])
-                indx.extend([pos,pos+1,pos+2,pos+2,pos+3,pos])
-                pos += 4
-        
-        mesh = Mesh(vertices=vert, indices=indx,mode='triangles',texture=self._texture)
+        quads = _tile_quads(x,y,self.width,self.height,self._texture)
         if not self._fillcolor is None:
             self._cache.add(self._fillcolor)
         else:
             self._cache.add(Color(1,1,1))
-        self._cache.add(mesh)
+        for mesh in _quad_meshes(quads,self._texture):
+            self._cache.add(mesh)
         
-        self._cache.add(PopMatrix())
\ No newline at end of file
+        self._cache.add(PopMatrix())
+
+# #mark -
+class GTileMap(GObject):
+    """
+    A class representing several tiles baked into a single drawing.
+
+    Drawing many :class:`GTile` objects costs one draw for every tile.  A tile map
+    copies the quads of all of its tiles into one mesh instead, when it is made, so the
+    whole map is drawn at once.  Tiles from the same atlas page share a texture, so
+    they all go in the same mesh.  Tiles with different textures (or fill colors) get
+    a mesh for each, which is still one draw per texture however many tiles there are.
+
+    The map is a snapshot.  It is positioned to cover all of its tiles, and it does not
+    change if the tiles move later on.  The tiles must not be rotated or scaled.
+    """
+
+    # The attributes in release mode (see gmode.py)
+    if RELEASE:
+        __slots__ = ('_tiles','_meshes')
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def tiles(self):
+        """
+        The tiles baked into this map.
+
+        This attribute should never be changed.  Changing the tiles does not change the
+        map.
+
+        **Invariant**: Value is a tuple of :class:`GTile` objects.
+        """
+        return self._tiles
+
+    @property
+    def meshes(self):
+        """
+        The number of meshes that draw this map.
+
+        **Invariant**: Value is an int >= 0.
+        """
+        return self._meshes
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new map from a list of tiles.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes.  The keyword ``tiles`` is
+        **required**, and it gives the tiles to bake::
+
+            GTileMap(tiles=[grass,road,water])
+
+        The position and size of the map come from the tiles, so the keywords for them
+        are ignored.  This class supports the other keywords of :class:`GObject`.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names, including 'tiles'
+        """
+        if not 'tiles' in keywords:
+            raise ValueError("The 'tiles' argument must be specified.")
+        self._tiles = tuple(keywords['tiles'])
+        for tile in self._tiles:
+            check(tile,lambda tile: isinstance(tile,GTile),'%s is not a GTile')
+
+        bounds = (0,0,0,0)
+        if self._tiles != ():
+            edges = [self._edges(tile) for tile in self._tiles]
+            bounds = (min(edge[0] for edge in edges),min(edge[1] for edge in edges),
+                      max(edge[2] for edge in edges),max(edge[3] for edge in edges))
+        for key in ('x','y','left','right','top','bottom','width','height'):
+            keywords.pop(key,None)
+        keywords['width']  = bounds[2]-bounds[0]
+        keywords['height'] = bounds[3]-bounds[1]
+        keywords['x'] = (bounds[0]+bounds[2])/2.0
+        keywords['y'] = (bounds[1]+bounds[3])/2.0
+        self._meshes = 0
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+    # HIDDEN METHODS
+    def _edges(self,tile):
+        """
+        Returns the edges (left,bottom,right,top) of a tile, ignoring its hitbox
+
+        :param tile: The tile
+        :type tile:  :class:`GTile`
+        """
+        return (tile.x-tile.width/2.0,tile.y-tile.height/2.0,
+                tile.x+tile.width/2.0,tile.y+tile.height/2.0)
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+
+        The tiles are grouped by texture and fill color, and each group becomes one
+        mesh (or a few, if it is very large).
+        """
+        GObject._reset(self)
+        groups = {}
+        for tile in self._tiles:
+            texture = tile._texture
+            if texture is None:
+                continue
+            color = None if tile._fillcolor is None else tuple(tile._fillcolor.rgba)
+            key = (texture.id,color)
+            if not key in groups:
+                groups[key] = (texture,[])
+            (left, bottom) = self._edges(tile)[0:2]
+            groups[key][1].append(_tile_quads(left-self.x,bottom-self.y,
+                                              tile.width,tile.height,texture))
+
+        self._meshes = 0
+        for ((texid, color), (texture, quads)) in groups.items():
+            self._cache.add(Color(1,1,1) if color is None else Color(*color))
+            for mesh in _quad_meshes(numpy.concatenate(quads),texture):
+                self._cache.add(mesh)
+                self._meshes += 1
+
+        self._cache.add(PopMatrix())
@@ -12,6 +12,8 @@ Date:   August 1, 2017 (Python 3 version)
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from kivy.uix.floatlayout import FloatLayout
+from kivy.graphics.opengl import glBlendFunc, glBlendFuncSeparate, GL_ONE, \
+    GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA
 from kivy.metrics import dp
 
 from introcs.geom import Point2
@@ -124,6 +126,46 @@ class GInput(object):
         """
         return tuple(k for (k,v) in self._keystate.items() if v)
 
+    @property
+    def recording(self):
+        """
+        Whether the key presses are currently being recorded.
+
+        See the method :meth:`record` for more information.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a bool
+        """
+        return not self._record is None
+
+    @property
+    def replaying(self):
+        """
+        Whether the key presses are currently coming from a recording.
+
+        See the method :meth:`replay` for more information.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a bool
+        """
+        return not self._replay is None
+
+    @property
+    def info(self):
+        """
+        The details saved with the current recording, or the one being replayed.
+
+        This is the dictionary given to :meth:`record`.  Games can use it to store
+        anything needed to play a recording back, such as the level file.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a dict (possibly empty)
+        """
+        return self._info
+
 
     # BUILT-IN METHODS
     def __init__(self):
@@ -146,6 +188,13 @@ class GInput(object):
         self._keystate = {}
         self._keycount = 0
 
+        self._info = {}
+        self._record = None
+        self._recordfile = None
+        self._changes = []
+        self._replay = None
+        self._replaypos = 0
+
 
     # PUBLIC METHODS
     def refresh(self):
@@ -265,6 +314,71 @@ class GInput(object):
         return key in self._keystate and not self._keystate[key] and (key in self._prvstate and self._prvstate[key])
 
 
+    def record(self,filename,info=None):
+        """
+        Starts recording the key presses to the given file.
+
+        Every time the game is updated, the recording stores the value ``dt`` and the
+        keys pressed or released since the last update.  Nothing is written until
+        :meth:`save` is called, which :class:`GameApp` does when the game stops.
+
+        As the same keys and ``dt`` values are given back to ``update`` by
+        :meth:`replay`, a game with no randomness plays out the same way again.
+
+        :param filename: the file to save the recording to
+        :type filename:  ``str``
+
+        :param info: details to save with the recording
+        :type info:  ``dict`` or None
+        """
+        assert type(filename) == str, 'filename %s is not a string' % repr(filename)
+        assert info is None or type(info) == dict, 'info %s is not a dict' % repr(info)
+        self._info = {} if info is None else dict(info)
+        self._record = []
+        self._recordfile = filename
+        self._changes = ['+'+k for k in self.keys]
+
+    def save(self):
+        """
+        Saves the current recording to its file.
+
+        The recording is a JSON file.  Each entry of ``steps`` is the ``dt`` of one
+        update.  If keys were pressed or released before that update, the entry is a
+        list instead, with the ``dt`` first and then a string for each key change: the
+        key name after a '+' for a press or a '-' for a release.
+
+        This method does nothing if the key presses are not being recorded.
+        """
+        if self._record is None:
+            return
+        import json
+        data = {'version': 1, 'info': self._info, 'steps': self._record}
+        with open(self._recordfile,'w') as file:
+            json.dump(data,file,separators=(',',':'))
+
+    def replay(self,filename):
+        """
+        Plays back the key presses from a recording saved by :meth:`save`.
+
+        While the recording plays, the keyboard is ignored and each update gets the
+        recorded ``dt`` instead of the real time since the last frame.  When the
+        recording runs out, the keyboard works again.  The details saved with the
+        recording are in the attribute ``info``.
+
+        :param filename: the recording to play back
+        :type filename:  ``str``
+        """
+        assert type(filename) == str, 'filename %s is not a string' % repr(filename)
+        import json
+        with open(filename) as file:
+            data = json.load(file)
+        self._info = data.get('info',{})
+        self._replay = data['steps']
+        self._replaypos = 0
+        self._record = None
+        self._keystate = {}
+        self._keycount = 0
+
     def is_touch_down(self):
         """
         Checks wether the mouse is currently held down.
@@ -279,6 +393,42 @@ class GInput(object):
 
 
     # HIDDEN METHODS
+    def _step(self,dt):
+        """
+        Returns the value ``dt`` to use for the next update.
+
+        This method is called by :class:`GameApp` right before every update.  When
+        recording, it stores ``dt`` with the key changes since the last update.  When
+        replaying, it applies the next recorded key changes and returns the recorded
+        ``dt``.  Otherwise it just returns ``dt``.
+
+        :param dt: time in seconds since last update
+        :type dt:  ``int`` or ``float``
+        """
+        if not self._replay is None:
+            if self._replaypos == len(self._replay):
+                self._replay = None
+                self._keystate = {}
+                self._keycount = 0
+                return dt
+            step = self._replay[self._replaypos]
+            self._replaypos += 1
+            if type(step) != list:
+                return step
+            for change in step[1:]:
+                down = change[0] == '+'
+                if down != self.is_key_down(change[1:]):
+                    self._keycount += 1 if down else -1
+                self._keystate[change[1:]] = down
+            return step[0]
+        elif not self._record is None:
+            if self._changes:
+                self._record.append([dt]+self._changes)
+                self._changes = []
+            else:
+                self._record.append(dt)
+        return dt
+
     def _register(self,view):
         """
         Registers the view with this input handler; activating it.
@@ -355,10 +505,14 @@ class GInput(object):
         :param modifiers: the modifiers associated with the press
         :type modifiers:  list of key codes
         """
+        if not self._replay is None:
+            return True
         k = keycode[1]
         # Need to handle the case where a release was dropped
         if not k in self._keystate or not self._keystate[k]:
             self._keycount += 1
+            if not self._record is None:
+                self._changes.append('+'+k)
         self._keystate[k] = True
         return True
 
@@ -372,8 +526,12 @@ class GInput(object):
         :param keycode: the key released as a pair of int (keycode) and a name
         :type keycode:  (``int``, ``str``)
         """
+        if not self._replay is None:
+            return True
         self._keystate[keycode[1]] = False
         self._keycount -= 1
+        if not self._record is None:
+            self._changes.append('-'+keycode[1])
         return True
 
     def _capture_touch(self,view,touch):
@@ -403,6 +561,10 @@ class GInput(object):
 
 
 # #mark -
+# The layer that commands are drawn to when no layer is given
+DEFAULT_LAYER = 'default'
+
+
 class GView(FloatLayout):
     """
     A class representing a drawing window for a :class:`GameApp` application.
@@ -411,12 +573,50 @@ class GView(FloatLayout):
     :class:`GObject` instances to the :meth:`draw` method.  You must do this every
     animation frame, as the game is constantly clearing the window.
 
+    The view is retained, however.  Clearing the window does not remove anything from
+    the canvas.  Instead, the view remembers what was drawn in each frame, and at the
+    end of the frame it only adds the objects that are new and removes the ones that
+    were not drawn again.  So a frame that draws the same objects as the last one does
+    not change the canvas at all.
+
+    The view is split into named layers, drawn bottom to top.  There is always one
+    layer, named ``'default'``, and :meth:`add_layer` adds more on top of it.  A
+    layer may be static, which means that it is drawn to an off-screen frame buffer,
+    and that buffer is copied to the window in every frame.  The buffer is only drawn
+    again when something in the layer changes (or after :meth:`invalidate`).  Static
+    layers are meant for things that rarely change, like backgrounds and scores.
+
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
     See the documentation of that class for more information.
     """
 
+    # IMMUTABLE PROPERTIES
+    @property
+    def stats(self):
+        """
+        The statistics for the canvas changes, as a new dictionary.
+
+        The keys are 'frames' (the frames committed), 'unchanged' (the frames that did
+        not change the canvas), 'added' and 'removed' (the commands added to and removed
+        from the canvas) and 'rebuilt' (the times that a layer drew the same commands in
+        a new order, so the layer had to be rebuilt).
+
+        **Invariant**: Value is a dictionary from strings to ints.
+        """
+        return dict(self._stats)
+
+    @property
+    def layers(self):
+        """
+        The names of the layers of this view, bottom to top.
+
+        **Invariant**: Value is a tuple of strings.
+        """
+        return tuple(layer.name for layer in self._layers)
+
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -429,38 +629,103 @@ class GView(FloatLayout):
         """
         FloatLayout.__init__(self)
         self._frame = InstructionGroup()
+        self._layers = []
+        self._named = {}
+        self._stats = {'frames': 0, 'unchanged': 0, 'added': 0, 'removed': 0, 'rebuilt': 0}
+        self.add_layer(DEFAULT_LAYER)
         self.bind(pos=self._reset)
         self.bind(size=self._reset)
         self._reset()
-        self._contents = set()
 
 
     # PUBLIC METHODS
-    def draw(self,cmd):
+    def add_layer(self,name,static=False):
+        """
+        Adds a new layer on top of the others.
+
+        :param name: The name of the layer
+        :type name:  ``str`` that is not the name of a layer already
+
+        :param static: Whether the layer is drawn to an off-screen frame buffer
+        :type static:  ``bool``
+        """
+        assert type(name) == str, '%s is not a string' % repr(name)
+        assert not name in self._named, 'there is already a layer %s' % repr(name)
+        layer = _GLayer(name,static,self.size)
+        self._layers.append(layer)
+        self._named[name] = layer
+        self._frame.add(layer.group)
+
+    def is_static(self,name):
+        """
+        Returns: True if the named layer is static
+
+        :param name: The name of the layer
+        :type name:  ``str`` naming a layer
+        """
+        return self._named[name].static
+
+    def invalidate(self,name):
+        """
+        Draws a static layer again at the end of this frame.
+
+        A static layer is drawn again whenever something in it changes, so this is only
+        needed if the layer draws something that changes on its own.  It does nothing
+        for a layer that is not static.
+
+        :param name: The name of the layer
+        :type name:  ``str`` naming a layer
+        """
+        self._named[name].invalidate()
+
+    def draw(self,cmd,layer=None):
         """
         Draws the given Kivy graphics command to this view.
 
         You should never call this method, since you do not understand raw Kivy graphics
         commands.  Instead, you should use the `draw` method in :class:`GObject` instead.
 
+        The command is not put on the canvas until the end of the frame.
+
         :param cmd: the command to draw
         :type cmd:  A Kivy graphics command
+
+        :param layer: The name of the layer to draw to (None for the default layer)
+        :type layer:  ``str`` naming a layer, or None
         """
-        if not cmd in self._contents:
-            self._frame.add(cmd)
-            self._contents.add(cmd)
+        try:
+            target = self._named[DEFAULT_LAYER if layer is None else layer]
+        except (KeyError,TypeError):
+            raise ValueError('%s is not a layer of this view' % repr(layer))
+        target.draw(cmd)
 
     def clear(self):
         """
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  It does
+        not change the canvas, which keeps showing the last frame until the end of
+        this one.
         """
-        self._frame.clear()
-        self._contents.clear()
+        for layer in self._layers:
+            layer.clear()
 
     # HIDDEN METHODS
+    def _commit(self):
+        """
+        Makes the canvas show the commands drawn in this frame.
+
+        This method is called for you at the end of the animation frame.  Every layer
+        applies its own changes (see :class:`_GLayer`).
+        """
+        self._stats['frames'] += 1
+        changed = False
+        for layer in self._layers:
+            changed = layer.commit(self._stats) or changed
+        if not changed:
+            self._stats['unchanged'] += 1
+
     def _reset(self,obj=None,value=None):
         """
         Resets the view canvas in response to a resizing event
@@ -471,3 +736,190 @@ class GView(FloatLayout):
         # Work-around for Retina Macs
         self.canvas.add(Scale(dp(1),dp(1),dp(1)))
         self.canvas.add(self._frame)
+        for layer in self._layers:
+            layer.resize(self.size)
+
+
+def _blend_normal(instr):
+    """
+    Sets the normal Kivy blending, where colors are not premultiplied.
+
+    :param instr: The callback instruction
+    :type instr:  ``Callback``
+    """
+    glBlendFunc(GL_SRC_ALPHA,GL_ONE_MINUS_SRC_ALPHA)
+
+
+def _blend_premultiply(instr):
+    """
+    Sets the blending that draws normal colors into a premultiplied frame buffer.
+
+    :param instr: The callback instruction
+    :type instr:  ``Callback``
+    """
+    glBlendFuncSeparate(GL_SRC_ALPHA,GL_ONE_MINUS_SRC_ALPHA,GL_ONE,GL_ONE_MINUS_SRC_ALPHA)
+
+
+def _blend_premultiplied(instr):
+    """
+    Sets the blending that draws a premultiplied frame buffer to the window.
+
+    :param instr: The callback instruction
+    :type instr:  ``Callback``
+    """
+    glBlendFunc(GL_ONE,GL_ONE_MINUS_SRC_ALPHA)
+
+
+class _GLayer(object):
+    """
+    A class representing a single layer of a :class:`GView`.
+
+    A layer keeps the commands that are on the canvas in the order they were drawn.
+    At the end of every frame, if the commands kept from the last frame are in the
+    same order, only the commands that changed are added or removed.  Otherwise the
+    layer is rebuilt.
+
+    A static layer puts its commands in a frame buffer instead of on the canvas.
+    Kivy only draws a frame buffer again when one of the commands in it changes.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def name(self):
+        """
+        The name of this layer.
+
+        **Invariant**: Value is a string.
+        """
+        return self._name
+
+    @property
+    def static(self):
+        """
+        Whether this layer is drawn to an off-screen frame buffer.
+
+        **Invariant**: Value is a bool.
+        """
+        return not self._fbo is None
+
+    @property
+    def group(self):
+        """
+        The instructions that put this layer on the canvas.
+
+        **Invariant**: Value is an InstructionGroup.
+        """
+        return self._group
+
+    # BUILT-IN METHODS
+    def __init__(self,name,static,size):
+        """
+        Creates a new, empty layer.
+
+        :param name: The name of the layer
+        :type name:  ``str``
+
+        :param static: Whether the layer is drawn to an off-screen frame buffer
+        :type static:  ``bool``
+
+        :param size: The size of the view in pixels
+        :type size:  pair of numbers
+        """
+        self._name = name
+        # The commands on the canvas, and the commands drawn in this frame (in order)
+        self._attached = []
+        self._drawn = []
+        self._contents = set()
+        self._commands = InstructionGroup()
+        self._group = InstructionGroup()
+        self._fbo = None
+        self._blit = None
+
+        if static:
+            # The buffer holds premultiplied colors, so soft edges blend correctly
+            self._fbo = Fbo(size=size)
+            with self._fbo:
+                ClearColor(0,0,0,0)
+                ClearBuffers()
+                Callback(_blend_premultiply)
+                Scale(dp(1),dp(1),dp(1))
+            self._fbo.add(self._commands)
+            self._fbo.add(Callback(_blend_normal))
+            self._blit = Rectangle(size=(size[0]/dp(1),size[1]/dp(1)),texture=self._fbo.texture)
+            self._group.add(self._fbo)
+            self._group.add(Callback(_blend_premultiplied))
+            self._group.add(Color(1,1,1))
+            self._group.add(self._blit)
+            self._group.add(Callback(_blend_normal))
+        else:
+            self._group.add(self._commands)
+
+    # METHODS
+    def draw(self,cmd):
+        """
+        Draws the given command to this layer.
+
+        :param cmd: the command to draw
+        :type cmd:  A Kivy graphics command
+        """
+        if not cmd in self._contents:
+            self._drawn.append(cmd)
+            self._contents.add(cmd)
+
+    def clear(self):
+        """
+        Starts a new frame, with nothing drawn to this layer.
+        """
+        self._drawn = []
+        self._contents.clear()
+
+    def invalidate(self):
+        """
+        Draws this layer to its frame buffer again, if it is static.
+        """
+        if not self._fbo is None:
+            self._fbo.ask_update()
+
+    def resize(self,size):
+        """
+        Resizes the frame buffer of this layer, if it is static.
+
+        :param size: The size of the view in pixels
+        :type size:  pair of numbers
+        """
+        if not self._fbo is None and tuple(self._fbo.size) != tuple(size):
+            self._fbo.size = size
+            self._blit.size = (size[0]/dp(1),size[1]/dp(1))
+            self._blit.texture = self._fbo.texture
+
+    def commit(self,stats):
+        """
+        Returns: True if this layer changed the canvas at the end of a frame.
+
+        :param stats: The statistics to update (see :attr:`GView.stats`)
+        :type stats:  ``dict``
+        """
+        old = self._attached
+        new = self._drawn
+        if len(old) == len(new) and all(a is b for (a,b) in zip(old,new)):
+            return False
+
+        oldset = set(old)
+        kept = [cmd for cmd in old if cmd in self._contents]
+        order = [cmd for cmd in new if cmd in oldset]
+        if not all(a is b for (a,b) in zip(kept,order)):
+            self._commands.clear()
+            for cmd in new:
+                self._commands.add(cmd)
+            stats['rebuilt'] += 1
+        else:
+            for cmd in old:
+                if not cmd in self._contents:
+                    self._commands.remove(cmd)
+                    stats['removed'] += 1
+            for (pos,cmd) in enumerate(new):
+                if not cmd in oldset:
+                    self._commands.insert(pos,cmd)
+                    stats['added'] += 1
+        self._attached = list(new)
+        return True
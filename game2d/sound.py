@@ -6,10 +6,24 @@ This classes wrap the Kivy audio interface, making it simpler for students to us
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.core.audio import SoundLoader
 from .app import GameApp
 
 
+def preload_sound(source):
+    """
+    Loads a sound file ahead of time, so that it is ready the first time it is played
+
+    This must be called from the main thread, as Kivy may not load sounds anywhere
+    else.  It loads the voices for the file in the mixer
+    of :class:`GameApp` (see :class:`GMixer`), and it does nothing if they are loaded
+    already.
+
+    :param source: The string providing the name of a sound file
+    :type source:  ``str``
+    """
+    GameApp.MIXER.load(source)
+
+
 class Sound(object):
     """
     A class representing a sound object that can be played.
@@ -19,9 +33,11 @@ class Sound(object):
     platforms. In order for Kivy to find a WAV or MP3 file, you should put it in the
     **Sounds** directory.  Sounds in that folder can be referenced directly by name.
     
-    When a sound is played, it cannot be played again until it finishes, or is stopped.  
-    This means that if you want multiple, simultaneous sound effects from the same WAV 
-    file.you will need to create multiple Sound objects.
+    A sound may be played again before it finishes.  The sound is played by the mixer
+    of :class:`GameApp`, which has a few voices for every file, so the plays overlap.
+    If every voice is busy, the oldest one is cut off.  All of the Sound objects for
+    the same file share these voices (and their volume), so the file is only loaded
+    once.
     """
     # This class is a simply replacement for the built-in Kivy Sound class.  It is a
     # little better with error handling, since GStreamer appears to be quite unreliable.
@@ -32,17 +48,18 @@ class Sound(object):
         """
         The current sound volume.
         
-        1 means full volume, 0 means mute.  The default value is 1.
+        1 means full volume, 0 means mute.  The default value is 1.  This is the
+        volume of every Sound object for the same file.
         
         **Invariant**: Must float in the range 0..1.
         """
-        return self._sound.volume
+        return GameApp.MIXER.get_volume(self._source)
     
     @volume.setter
     def volume(self,value):
         assert type(value) in [int, float] and value >= 0 and value <= 1, \
             'value %s is not a valid volume' % repr(value)
-        self._sound.volume = value
+        GameApp.MIXER.set_volume(self._source,value)
     
     # IMMUTABLE PROPERTIES
     @property
@@ -66,42 +83,42 @@ class Sound(object):
         
         **Invariant**: Must be a boolean.
         """ 
-        return self._sound.state == 'play'
+        return GameApp.MIXER.is_playing(self._source)
     
     def __init__(self,source):
         """
         Creates a new sound from a file.
         
+        The file is only loaded if no other Sound object has loaded it already.
+        
         :param source: The string providing the name of a sound file
         :type source:  ``str``
         """
-        from .app import GameApp
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
         self._source = source
-        self._sound  = SoundLoader.load(source)
-        self._sound.load()
-        if self._sound is None:
+        if not GameApp.MIXER.load(source):
             raise IOError('Module game2d cannot read the file %s' % repr(source))
     
     def play(self,loop=False):
         """
         Plays this sound.
         
-        The sound will play until completion, or interrupted by the user.
+        The sound will play until completion, or interrupted by the user.  If this
+        sound is already playing, it plays again on top of itself.
         
         :param loop: Whether or not to loop the sound
         :type loop:  ``bool``
         """
-        self._sound.loop = loop
-        self._sound.play()
+        GameApp.MIXER.play(self._source,loop)
 
     def stop(self):
         """
         Stops this sound.
         
-        This will stop the sound immediately, even if it is looping.
+        This will stop the sound immediately, even if it is looping.  Every play of
+        the sound that overlaps is stopped.
         """
-        self._sound.stop()
+        GameApp.MIXER.stop(self._source)
 
 
 # #mark -
@@ -19,6 +19,7 @@ from game2d import *
 from consts import *
 from lanes  import *
 from models import *
+from simulation import Simulation
 
 # PRIMARY RULE: Level can only access attributes in models.py or lanes.py using getters
 # and setters. Level is NOT allowed to access anything in app.py (Subcontrollers are not
@@ -34,6 +35,10 @@ class Level(object):
     cars, logs, or other items in each lane). That information is stored inside of the
     individual lane objects.
 
+    The rules of the game are not in this class either.  They are in the Simulation
+    from simulation.py, which runs without Kivy.  This class (like the lanes) is a
+    view that copies positions out of the simulation when it draws.
+
     If you want to pause the game, tell this controller to draw, but do not update.  See
     subcontrollers.py from Lesson 27 for an example.  This class will be similar to that
     one in many ways.
@@ -51,47 +56,21 @@ class Level(object):
     to suppose the number of lives meter.
     """
     # LIST ALL HIDDEN ATTRIBUTES HERE
-    # Attribute _startingfrogx: The x-coordinate starting position for
-    #                           self._frog
-    # Invariant: _startingfrogx is a float
+    # Attribute _sim: The headless simulation of this level
+    # Invariant: _sim is a Simulation from simulation.py
     #
-    # Attribute _startingfrogy: The y-coordinate starting position for
-    #                           self._frog
-    # Invariant: _startingfrogy is a float
-
-    # Attribute _cooldownperiod: Indicates time left before Frog can move again
-    # Invariant: _cooldownperiod is a float
-
-    # Attribute _iscollidingwithexit: Indicates if Frog collides with lilipad
-    # Invariant: _iscollidingwithexit is a boolean
-
-    # Attribute _iscollidingwithhedgelane: If Frog collides Hedge lane
-    # Invariant: _iscollidingwithhedgelane is a boolean
-
-    # Attribute _justaddedFROGSAFEobject: Whether safe Frog just added
-    # Invariant: _justaddedFROGSAFEobject is a boolean
-
-    # Attribute _wongame: Indicates whether game is won
-    # Invariant: _wongame is a boolean
-
-    # Attribute _iscollidingwithwaterlane: If Frog collides Water lane
-    # Invariant: _iscollidingwithwaterlane is a boolean
-
-    # Attribute _iscollidingwithlog: If Frog collides with log obstacle
-    # Invariant: _iscollidingwithlog is a boolean
-
     # Attribute _frog: Frog object to draw
     # Invariant: _frog is a valid Frog class object containing GImage
 
     # Attribute _lanes: Contains list of different types of lane classes
-    # Invariant: _lanes is a list or None
+    # Invariant: _lanes is a list of Lane objects, one for each lane in _sim
+
+    # Attribute _background: The tiles of all of the lanes, baked into one drawing
+    # Invariant: _background is a GTileMap of the tile of every lane in _lanes
 
     # Attribute _livescounter: Contains list of GImage lives objects
     # Invariant: _livescounter is a list
 
-    # Attribute _livesleft: Indicates how many lives left for player
-    # Invariant: _livesleft is an integer
-
     # Attribute _livestext: Contains title indicating lives
     # Invariant: _livestext is a valid GLabel object
 
@@ -106,30 +85,28 @@ class Level(object):
         """
         Returns whether or not the frog is visible
         """
-        return self._frog.visible
+        return self._sim.getFrogVisible()
 
     def setFrogVisible(self,value):
         """
-        Sets whether the frog is visible through the self._frog.visible attribute
+        Sets whether the frog is visible
 
         Parameter value: Sets whether frog is visible
         Precondition: value an boolean
         """
-        self._frog.visible = value
+        self._sim.setFrogVisible(value)
 
     def setFrogOriginalLocation(self):
         """
         Sets the frog to the original location described in JSON file
         """
-        self._frog.x = self._startingfrogx
-        self._frog.y = self._startingfrogy
-        # print('Setting original location')
+        self._sim.setFrogOriginalLocation()
 
     def getFrogLives(self):
         """
         Returns how many frog lives left
         """
-        return self._livesleft
+        return self._sim.getFrogLives()
 
     def setFrogLives(self,value):
         """
@@ -138,59 +115,114 @@ class Level(object):
         Parameter value: Sets how many lives left in game
         Precondition: value an integer
         """
-        self._livesleft = value
+        self._sim.setFrogLives(value)
 
     def setFrogIscollidingWithExit(self,value):
         """
-        Sets the self._iscollidingwithexit attribute
+        Sets whether the frog is colliding with an exit
 
         Parameter value: Sets whether frog is collding with an exit
         Precondition: value an boolean
         """
-        self._iscollidingwithexit = value
+        self._sim.setFrogIscollidingWithExit(value)
 
     def getFrogIsCollidingWithExit(self):
         """
         Returns whether frog is colliding with exit
         """
-        return self._iscollidingwithexit
+        return self._sim.getFrogIsCollidingWithExit()
 
     def getWonGame(self):
         """
         Returns whether the user won the game
         """
-        return self._wongame
+        return self._sim.getWonGame()
+
+    def getTime(self):
+        """
+        Returns the time in seconds that the obstacles have been moving
+        """
+        return self._sim.getTime()
+
+    def setTime(self,value):
+        """
+        Jumps every obstacle to where it is at the given time
+
+        The obstacles move in a loop at a constant speed, so their positions at any
+        time are computed directly.  No frames are simulated in between.  The frog,
+        the lives and the exits are not changed.
+
+        Parameter value: The time in seconds since the level started
+        Precondition: value is a number (int or float) >= 0
+        """
+        self._sim.seek(value)
+
+    def getObstaclePositions(self,time):
+        """
+        Returns the obstacle x positions at the given time, without moving anything
+
+        The result is a list with one array of positions for each lane, bottom to top.
+
+        Parameter time: The time in seconds since the level started
+        Precondition: time is a number (int or float) >= 0
+        """
+        return self._sim.positionsAt(time)
+
+    def isDeadly(self,column,row,time):
+        """
+        Returns True if a frog in the given grid square would die at the given time
+
+        Parameter column: The grid column of the square
+        Precondition: column is an int in 0..(level width in grid squares)-1
+
+        Parameter row: The grid row of the square
+        Precondition: row is an int in 0..(number of lanes)-1
+
+        Parameter time: The time in seconds since the level started
+        Precondition: time is a number (int or float) >= 0
+        """
+        return self._sim.isDeadly(column,row,time)
+
+    def getSimulation(self):
+        """
+        Returns the headless simulation for this level
+        """
+        return self._sim
 
     # INITIALIZER (standard form) TO CREATE THE FROG AND LANES
 
-    def __init__(self,json_dict,level_width,level_height):
+    def __init__(self,level,level_width,level_height,sim=None):
         """
         Initializes the lane position, background, and objects
 
-        Parameter json_dict: Contains JSON file for level
-        Preconditon: json_dict is a valid JSON file
+        If sim is given, this level draws that simulation instead of making a new one
+        from level.
+
+        Parameter level: The level, compiled or as read from the JSON file
+        Preconditon: level is a LevelData or a valid JSON level
 
         Parameter level_width: Indicates width of level
         Precondition: level_width is an integer
 
         Parameter level_height: Indicates height of the level
         Precondition: level_height is an integer
+
+        Parameter sim: The simulation to draw
+        Precondition: sim is a Simulation for level, or None
         """
-        # CREATE THE FROG
-        x_pos = (json_dict['start'][0]) * GRID_SIZE + (GRID_SIZE)/2
-        y_pos = (json_dict['start'][1]) * GRID_SIZE + (GRID_SIZE)/2
-        self._startingfrogx = x_pos
-        self._startingfrogy = y_pos
+        self._sim = Simulation(level) if sim is None else sim
 
-        self._frog = Frog(x_pos,y_pos)
+        # CREATE THE FROG
+        frog = self._sim.getFrog()
+        self._frog = Frog(frog.x,frog.y)
         self._frog.visible = True
 
         # CREATE THE LANES
         self._lanes = []
-        self._classifylanes(json_dict)
+        self._classifylanes(level_width)
+        self._background = GTileMap(tiles=[lane.getTile() for lane in self._lanes])
 
         self._livescounter = self._livesCounterList(level_width,level_height)
-        self._livesleft = 3
         self._livestext = GLabel(text="LIVES:",font_name=ALLOY_FONT,\
         linecolor='#349441',font_size=ALLOY_SMALL)
         self._livestext.x = self._livescounter[0].x - 120
@@ -199,231 +231,71 @@ class Level(object):
         self._height = level_height
         self._width = level_width
 
-        self._cooldownperiod = FROG_SPEED
-        self._iscollidingwithexit = False
-        self._iscollidingwithhedgelane = False
-        self._justaddedFROGSAFEobject = False
-        self._wongame = False
-        self._iscollidingwithwaterlane = False
-        self._iscollidingwithlog = False
     # UPDATE METHOD TO MOVE THE FROG AND UPDATE ALL OF THE LANES
     def update(self,dt,input):
         """
         Updates the frog movement and lanes
 
+        All of the work is done by the simulation.  The views are brought up to date
+        the next time the level is drawn.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
 
         Attribute input: The user input, used to control the frog and change state
         Invariant: input is an instance of GInput and is inherited from GameApp
         """
-        self._methodBeginningReset()
-
-        self._cooldownperiod = self._cooldownperiod - dt
-
-        currentX = self._frog.x
-        currentY = self._frog.y
-
-        # print((currentX,currentY))
-
-        ############### Handles lane changes ###################
-        for lane in self._lanes:
-            # Update the obstacles
-            obstacles_list = lane.getObjs()
-            buffer_size = lane.getBuffer()
-            try:
-                speed = lane.getSpeed()
-                lane.update(dt,obstacles_list,speed,self._width,buffer_size,\
-                self._frog)
-            except:
-                pass
-
-            # Check for cars
-            self._methodCheckForCars(lane)
-
-            # Check for Hedge exits
-            self._methodCheckForHedge(lane,currentX,currentY)
-
-            # Check for Water lane
-            self._methodCheckWaterLane(lane,currentX,currentY,dt)
-        ########################################################
-
-        # Moves the Frog
-        self._methodMoveFrogAndReset(currentX,currentY,input)
+        self._sim.update(dt,input)
 
     # DRAW METHOD TO DRAW THE FROG AND THE INDIVIDUAL LANES
-    def draw(self,view):
+    def draw(self,view,alpha=1.0):
         """
         Draws the lanes.
 
+        In fixed-step mode, alpha is the fraction of the last update to draw, so that
+        motion stays smooth between steps.  Otherwise it should be 1.
+
+        Everything is drawn to the layers in consts.py, which the view must have.
+
         Paramter view: Indicates which window to draw
         Precondition: view is a valid view object
+
+        Parameter alpha: The fraction of the last update to draw
+        Precondition: alpha is a float in 0..1
         """
+        time = None
+        if alpha < 1:
+            time = self._sim.getRenderTime(alpha)
+
         # Needs to draw the lanes when called in Froggit class
+        self._background.draw(view,LAYER_BACKGROUND)
         for lane in self._lanes:
-            lane.draw(view)
+            lane.draw(view,time)
+        self._frog.syncState(self._sim.getFrog(),alpha)
         if self._frog.visible == True:
-             self._frog.draw(view)
-        for num in range(self.getFrogLives()):
-            for life in self._livescounter[:num+1]:
-                life.draw(view)
-        self._livestext.draw(view)
+             self._frog.draw(view,LAYER_FROG)
+        for life in self._livescounter[:max(0,self.getFrogLives())]:
+            life.draw(view,LAYER_HUD)
+        self._livestext.draw(view,LAYER_HUD)
 
 
     # ANY NECESSARY HELPERS (SHOULD BE HIDDEN)
-    def _methodMoveFrogAndReset(self,currentX,currentY,input):
-        """
-        Updates position of Frog and checks if colliding with Hedge
-
-        Parameter currentX: Indicates current x-position of Frog
-        Precondition: currentX is a float
-
-        Parameter currentY: Indicates current y-position of Frog
-        Precondition: currentY is a float
-
-        Parameter input: Allows the Frog to move
-        Precondition: input is valid instance of input from GameApp
-        """
-        if (self._cooldownperiod <= 0) and (self._iscollidingwithexit == False):
-            self._moveFrogWASD(input,currentX,currentY)
-            self._moveFrogArrowKeys(input,currentX,currentY)
-            self._cooldownperiod = FROG_SPEED
-
-        if (self._iscollidingwithhedgelane == True) and \
-        (self._iscollidingwithexit == False):
-            self._frog.y = currentY - GRID_SIZE
-            self._iscollidingwithhedgelane = False
-
-        if (self._iscollidingwithwaterlane == True) and \
-        (self._iscollidingwithlog == False):
-            self.setFrogVisible(False)
-            self.setFrogLives(self.getFrogLives() - 1)
-
-    def _methodBeginningReset(self):
-        """
-        Resets the collision properties from previous frames
-        """
-        self._iscollidingwithlog = False
-        self._iscollidingwithwaterlane = False
-        if (self._justaddedFROGSAFEobject == True):
-            self._methodFROGSAFEreset()
-
-    def _methodCheckWaterLane(self,lane,currentX,currentY,dt):
-        """
-        Checks for properties of the Water class
-
-        Parameter lane: Indicates which lane
-        Precondition: lane is a valid type of lane object from lanes.py
-
-        Parameter currentX: Indicates current x-position of Frog
-        Precondition: currentX is a float
-
-        Parameter currentY: Indicates current y-position of Frog
-        Precondition: currentY is a float
+    def _classifylanes(self,level_width):
         """
-        if isinstance(lane,Water):
-            if self._frog.collides(lane.getTile()):
-                self._iscollidingwithwaterlane = True
-                for log in lane.getListofLogs():
-                    if log.contains((currentX,currentY)):
-                        self._iscollidingwithlog = True
-                        if self._iscollidingwithlog == True:
-                            log_speed = lane.getSpeed()
-                            log_movement = log_speed * dt
+        Creates a lane view for each lane in the simulation
 
-                            if (log_movement > 0):
-                                self._frog.x += log_movement
-                            if (log_movement < 0):
-                                self._frog.x += log_movement
-
-    def _classifylanes(self,json_dict):
-        """
-        Loops through dictionary to return lanes
-
-        Parameter json_dict: the dictionary to loop through
-        Precondition: json_dict is a valid JSON file
-        """
-        bottom_num = 0
-
-        for num_lane in range(len(json_dict['lanes'])):
-            if json_dict['lanes'][num_lane]['type'] == 'grass':
-                lane_object = Grass(json_dict,num_lane,bottom_num)
-                self._lanes.append(lane_object)
-            elif json_dict['lanes'][num_lane]['type'] == 'road':
-                lane_object = Road(json_dict,num_lane,bottom_num)
-                self._lanes.append(lane_object)
-            elif json_dict['lanes'][num_lane]['type'] == 'water':
-                lane_object = Water(json_dict,num_lane,bottom_num)
-                self._lanes.append(lane_object)
-            elif json_dict['lanes'][num_lane]['type'] == 'hedge':
-                lane_object = Hedge(json_dict,num_lane,bottom_num)
-                self._lanes.append(lane_object)
-            bottom_num += 64
-
-    def _methodCheckForHedge(self,lane,currentX,currentY):
-        """
-        Checks for collision with Hedge lane
-
-        Parameter lane: Indicates which lane
-        Precondition: lane is a valid type of lane object from lanes.py
-
-        Parameter currentX: Indicates current x-position of Frog
-        Precondition: currentX is a float
-
-        Parameter currentY: Indicates current y-position of Frog
-        Precondition: currentY is a float
-        """
-        if isinstance(lane,Hedge):
-            if lane.getTile().collides(self._frog):
-                self._iscollidingwithhedgelane = True
-
-            for hedge_instance in lane.getObjs():
-                if (hedge_instance.contains((currentX,currentY))):
-                    if hedge_instance.source == 'exit.png':
-                        lane.addtolistofFROGSafe((currentX,currentY))
-                        self._iscollidingwithexit = True
-                        self._justaddedFROGSAFEobject = True
-                        self.setFrogVisible(False)
-
-                if hedge_instance.source == 'open.png':
-                    if (hedge_instance.contains((currentX,currentY))):
-                        self._iscollidingwithexit = False
-                        self._iscollidingwithhedgelane = False
-
-                if (lane.getLengthofFROGSAFEobjects() \
-                == lane.getLengthofLilipads()):
-                    self._wongame = True
-
-            for frogsafe_instance in lane.getListofFROGSAFEobjects():
-                if frogsafe_instance.collides(self._frog):
-                    self._iscollidingwithhedgelane = True
-                    self._iscollidingwithexit = False
-
-    def _methodCheckForCars(self,lane):
-        """
-        Checks for collision with frog and cars
-
-        Parameter lane: Indicates which lane
-        Precondition: lane is a valid type of lane object from lanes.py
+        Parameter level_width: Indicates width of level
+        Precondition: level_width is an integer
         """
-        if isinstance(lane,Road):
-            cars_list = lane.getObjs()
-            for car in cars_list:
-                if self._frog.collides(car):
-                    self.setFrogVisible(False)
-                    self.setFrogLives(self.getFrogLives() - 1)
-                    # print('Withdrawing one')
-                    # print(car)
-
-    def _methodFROGSAFEreset(self):
-        """
-        Resets attributes to original values after Frog reaches safety
-        """
-        self._justaddedFROGSAFEobject = False
-        self._iscollidingwithhedgelane = False
-        self._iscollidingwithexit = False
-        self._cooldownperiod = FROG_SPEED
-        self._iscollidingwithwaterlanebutnotlog = False
+        for state in self._sim.getLanes():
+            if state.getType() == 'grass':
+                self._lanes.append(Grass(state,level_width))
+            elif state.getType() == 'road':
+                self._lanes.append(Road(state,level_width))
+            elif state.getType() == 'water':
+                self._lanes.append(Water(state,level_width))
+            elif state.getType() == 'hedge':
+                self._lanes.append(Hedge(state,level_width))
 
     def _livesCounterList(self,level_width,level_height):
         """
@@ -442,84 +314,3 @@ class Level(object):
         source='froghead.png'),GImage(x=level_width-(GRID_SIZE/2),\
         y=level_height-(GRID_SIZE/2), width = GRID_SIZE, height = GRID_SIZE, \
         source='froghead.png')]
-
-    def _moveFrogWASD(self,input,currentX,currentY):
-        """
-        Moves the frog with the WASD keys
-
-        Parameter input: Allows the Frog to move
-        Precondition: input is valid instance of input from GameApp
-
-        Parameter currentX: Indicates current x-position of Frog
-        Precondition: currentX is a float
-
-        Parameter currentY: Indicates current y-position of Frog
-        Precondition: currentY is a float
-        """
-        if input.is_key_down('w') and input.is_key_down('s'):
-            pass
-        elif input.is_key_down('a') and input.is_key_down('d'):
-            pass
-        elif input.is_key_down('w') and input.is_key_down('a'):
-            pass
-        elif input.is_key_down('w') and input.is_key_down('d'):
-            pass
-        elif input.is_key_down('a') and input.is_key_down('s'):
-            pass
-        elif input.is_key_down('s') and input.is_key_down('d'):
-            pass
-        else:
-            if input.is_key_down('w') and (currentY + GRID_SIZE <= \
-            self._height-GRID_SIZE):
-                self._frog.y = currentY + GRID_SIZE
-                self._frog.angle = FROG_NORTH
-            if input.is_key_down('s') and (currentY - GRID_SIZE >= 0):
-                self._frog.y = currentY - GRID_SIZE
-                self._frog.angle = FROG_SOUTH
-            if input.is_key_down('a') and (currentX - GRID_SIZE >= 0):
-                self._frog.x = currentX - GRID_SIZE
-                self._frog.angle = FROG_WEST
-            if input.is_key_down('d') and (currentX + GRID_SIZE <= self._width):
-                self._frog.x = currentX + GRID_SIZE
-                self._frog.angle = FROG_EAST
-
-    def _moveFrogArrowKeys(self,input,currentX,currentY):
-        """
-        Moves the frog with the WASD keys
-
-        Parameter input: Allows the Frog to move
-        Precondition: input is valid instance of input from GameApp
-
-        Parameter currentX: Indicates current x-position of Frog
-        Precondition: currentX is a float
-
-        Parameter currentY: Indicates current y-position of Frog
-        Precondition: currentY is a float
-        """
-        if input.is_key_down('up') and input.is_key_down('down'):
-            pass
-        elif input.is_key_down('left') and input.is_key_down('right'):
-            pass
-        elif input.is_key_down('up') and input.is_key_down('left'):
-            pass
-        elif input.is_key_down('up') and input.is_key_down('right'):
-            pass
-        elif input.is_key_down('left') and input.is_key_down('down'):
-            pass
-        elif input.is_key_down('down') and input.is_key_down('right'):
-            pass
-        else:
-            if input.is_key_down('up') and (currentY + GRID_SIZE <= \
-            self._height-GRID_SIZE):
-                self._frog.y = currentY + GRID_SIZE
-                self._frog.angle = FROG_NORTH
-            if input.is_key_down('down') and (currentY - GRID_SIZE >= 0):
-                self._frog.y = currentY - GRID_SIZE
-                self._frog.angle = FROG_SOUTH
-            if input.is_key_down('left') and (currentX - GRID_SIZE >= 0):
-                self._frog.x = currentX - GRID_SIZE
-                self._frog.angle = FROG_WEST
-            if input.is_key_down('right') and (currentX + GRID_SIZE \
-            <= self._width):
-                self._frog.x = currentX + GRID_SIZE
-                self._frog.angle = FROG_EAST
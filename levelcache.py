@@ -0,0 +1,1024 @@
+"""
+Level loading module for Froggit
+
+This module reads the level files in the JSON folder.  Parsing JSON text (and then
+looking things up in nested dictionaries) is slow, so every level is compiled once
+into a small binary file of NumPy arrays, which is checked for errors as it is made.
+The compiled files are kept in the Cache folder, next to the JSON folder.  They are
+remade whenever the level file changes.  A compiled level is memory-mapped when it is
+loaded, so loading a level that has not changed does no parsing at all.
+
+Like the simulation, this module never touches Kivy.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+from consts import *
+import numpy as np
+import hashlib
+import struct
+import mmap
+import json
+import zlib
+import os
+
+# PRIMARY RULE: This module is not allowed to access anything in any module other
+# than consts.py.  It is the lowest layer of the simulation, and it must never import
+# game2d (or anything that would pull in Kivy).
+
+# The folder containing the level and object files
+JSON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)),'JSON')
+# The folder containing the compiled levels
+CACHE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)),'Cache')
+# The folder containing the images (only read for collision masks)
+IMAGE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)),'Images')
+
+# The first bytes of every compiled level file (the last byte is the version)
+CACHE_MAGIC = b'FROGLVL\x02'
+# The version of the rules in check_level.  Add one whenever check_level (or the way
+# the catalog of object types is read) changes, so that levels are checked again.
+LEVEL_RULES = 3
+# The lane types allowed in a level file
+LANE_TYPES = ('grass','road','water','hedge')
+
+# The object data, loaded once on first use
+_OBJECT_DATA = None
+# The object types in the object data, by name (see object_type)
+_CATALOG = None
+# The collision masks made so far, by image file (see object_mask)
+_MASKS = {}
+# The SHA-1 hash of OBJECT_DATA, computed once on first use (see _objectsHash)
+_OBJECTS_HASH = None
+
+
+def load_json(name):
+    """
+    Returns the JSON for the given file name, or None if it cannot be loaded
+
+    This is the headless version of GameApp.load_json.  The name must refer to a
+    file in the JSON folder.
+
+    Parameter name: The file name
+    Precondition: name is a string
+    """
+    path = os.path.join(JSON_FOLDER,name)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+
+def object_data():
+    """
+    Returns the object data (sizes and hitboxes) from OBJECT_DATA
+
+    The file is only read the first time this function is called.
+    """
+    global _OBJECT_DATA
+    if _OBJECT_DATA is None:
+        _OBJECT_DATA = load_json(OBJECT_DATA)
+    return _OBJECT_DATA
+
+
+def object_type(name):
+    """
+    Returns the ObjectType with the given name, or None if there is no such type
+
+    The catalog of object types is made from the images in OBJECT_DATA the first
+    time this function is called.  There is only ever one ObjectType for each name,
+    so every obstacle of the same type shares it.
+
+    Parameter name: The object type (e.g. 'car1' or 'log3')
+    Precondition: name is a string
+    """
+    global _CATALOG
+    if _CATALOG is None:
+        images = object_data()['images']
+        _CATALOG = {}
+        for key in images:
+            _CATALOG[key] = ObjectType(key,images[key])
+    return _CATALOG.get(name)
+
+
+def object_size(name):
+    """
+    Returns the (width,height) in pixels of the given object type
+
+    Parameter name: The object type (e.g. 'car1' or 'log3')
+    Precondition: name is a key of the images in OBJECT_DATA
+    """
+    return object_type(name).getSize()
+
+
+def object_mask(name):
+    """
+    Returns the collision mask of the given object type, or None if it has none
+
+    The mask is made from the alpha channel of the image file the first time it is
+    needed, and then shared by every type with the same file.  A type has no mask if
+    its image cannot be read (see the function _readAlpha).
+
+    Parameter name: The object type (e.g. 'car1' or 'frog')
+    Precondition: name is a key of the images in OBJECT_DATA
+    """
+    file = object_type(name).getFile()
+    if not file in _MASKS:
+        alpha = _readAlpha(os.path.join(IMAGE_FOLDER,file))
+        _MASKS[file] = None if alpha is None else ObjectMask(alpha)
+    return _MASKS[file]
+
+
+def level_images(level):
+    """
+    Returns the list of image files that drawing a level may use
+
+    These are the backgrounds of the lanes in the level, and every file in
+    OBJECT_DATA (the obstacles, the frog and the sprites).
+
+    Parameter level: The compiled level
+    Precondition: level is a LevelData
+    """
+    images = []
+    for lane in range(level.getLaneCount()):
+        name = level.getLaneType(lane)+'.png'
+        if not name in images:
+            images.append(name)
+    data = object_data()
+    for group in ('images','sprites'):
+        for key in data.get(group,{}):
+            if not data[group][key]['file'] in images:
+                images.append(data[group][key]['file'])
+    return images
+
+
+class ObjectType(object):
+    """
+    A class representing one type of object in OBJECT_DATA.
+
+    An object type is shared by every obstacle of that type (it is a flyweight), so
+    the obstacles themselves only need a position.  It has the image file, the size
+    and the hitbox of the type, and the type of lane that it belongs in.  Use the
+    function object_type to get one, instead of the initializer.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute _name: The name of the type (e.g. 'car1')
+    # Invariant: _name is a string
+    #
+    # Attribute _file: The image file of the type
+    # Invariant: _file is a string naming a file in the Images folder
+    #
+    # Attribute _size: The size of the image in pixels, as (width,height)
+    # Invariant: _size is a pair of numbers > 0
+    #
+    # Attribute _hitbox: The (left,top,right,bottom) offsets of the hitbox
+    # Invariant: _hitbox is a 4-element tuple of numbers >= 0
+    #
+    # Attribute _lane: The type of lane that objects of this type belong in
+    # Invariant: _lane is a string from LANE_TYPES, or None if it is not an obstacle
+    #
+    # Attribute _goal: Whether a frog that reaches this object is safe
+    # Invariant: _goal is a bool (only True for exits)
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getName(self):
+        """
+        Returns the name of the type
+        """
+        return self._name
+
+    def getFile(self):
+        """
+        Returns the image file of the type
+        """
+        return self._file
+
+    def getSize(self):
+        """
+        Returns the size of the image in pixels, as (width,height)
+        """
+        return self._size
+
+    def getHitbox(self):
+        """
+        Returns the (left,top,right,bottom) offsets of the hitbox
+        """
+        return self._hitbox
+
+    def getLane(self):
+        """
+        Returns the type of lane that objects of this type belong in (or None)
+        """
+        return self._lane
+
+    def isGoal(self):
+        """
+        Returns True if a frog that reaches an object of this type is safe
+        """
+        return self._goal
+
+    # INITIALIZER
+    def __init__(self,name,image):
+        """
+        Initializes an object type from its entry in OBJECT_DATA
+
+        Parameter name: The name of the type
+        Precondition: name is a string
+
+        Parameter image: The entry for the type in the images of OBJECT_DATA
+        Precondition: image is a dictionary with a 'file' and a 'size', and maybe
+        a 'hitbox', a 'lane' and a 'goal'
+        """
+        self._name = name
+        self._file = image['file']
+        self._size = (image['size'][0],image['size'][1])
+        self._hitbox = tuple(image.get('hitbox',(0,0,0,0)))
+        self._lane = image.get('lane')
+        self._goal = bool(image.get('goal',False))
+
+
+class ObjectMask(object):
+    """
+    A class representing the solid pixels of an image, for pixel collisions.
+
+    A pixel is solid if its alpha value is at least MASK_ALPHA.  The mask packs the
+    pixels eight to a byte, so even the biggest images only take a few kilobytes.
+    Row 0 is the top of the image, as in the file.  Use the function object_mask to
+    get one, instead of the initializer.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute _width: The width of the image in pixels
+    # Invariant: _width is an int > 0
+    #
+    # Attribute _height: The height of the image in pixels
+    # Invariant: _height is an int > 0
+    #
+    # Attribute _bits: The packed rows of the mask, one bit per pixel
+    # Invariant: _bits is a read-only uint8 array of shape (_height,(_width+7)//8)
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getWidth(self):
+        """
+        Returns the width of the image in pixels
+        """
+        return self._width
+
+    def getHeight(self):
+        """
+        Returns the height of the image in pixels
+        """
+        return self._height
+
+    def getBits(self):
+        """
+        Returns the packed rows of the mask (read-only)
+        """
+        return self._bits
+
+    # INITIALIZER
+    def __init__(self,alpha):
+        """
+        Initializes a mask from the alpha channel of an image
+
+        Parameter alpha: The alpha channel, top row first
+        Precondition: alpha is a 2-d uint8 array with at least one pixel
+        """
+        (self._height,self._width) = alpha.shape
+        self._bits = np.packbits(alpha >= MASK_ALPHA,axis=1)
+        self._bits.flags.writeable = False
+
+    # ADDITIONAL METHODS
+    def covers(self,xs,ys,width,height):
+        """
+        Returns a bool array saying which of the points are on solid pixels
+
+        The points are relative to the center of an object drawn with this image, at
+        the given size and with no rotation (so y goes up).  Points outside of the
+        image are not solid.
+
+        Parameter xs: The horizontal coordinates of the points
+        Precondition: xs is a 1-d float array
+
+        Parameter ys: The vertical coordinates of the points
+        Precondition: ys is a 1-d float array the same size as xs
+
+        Parameter width: The width the image is drawn at
+        Precondition: width is a number > 0
+
+        Parameter height: The height the image is drawn at
+        Precondition: height is a number > 0
+        """
+        cols = np.floor((xs/width+0.5)*self._width).astype(np.int64)
+        rows = np.floor((0.5-ys/height)*self._height).astype(np.int64)
+        inside = (cols >= 0) & (cols < self._width) & (rows >= 0) & (rows < self._height)
+        cols = np.where(inside,cols,0)
+        rows = np.where(inside,rows,0)
+        bits = (self._bits[rows,cols >> 3] >> (7-(cols & 7))) & 1
+        return inside & (bits == 1)
+
+
+class LevelData(object):
+    """
+    A class representing a compiled level.
+
+    This holds everything in a level file, but as arrays instead of nested
+    dictionaries.  The lanes are numbered bottom to top.  The obstacles of every lane
+    are stored together, in lane order, so the obstacles of a lane are one slice of
+    the obstacle arrays.  Object types are stored as indices into a list of names.
+
+    The arrays may be read-only views of a memory-mapped file, so they should never
+    be changed.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute _size: The size of the level in grid squares, as (columns,rows)
+    # Invariant: _size is a pair of ints > 0
+    #
+    # Attribute _start: The starting grid square of the frog, as (column,row)
+    # Invariant: _start is a pair of ints inside the level
+    #
+    # Attribute _offscreen: The offscreen buffer (in grid squares) before wrapping
+    # Invariant: _offscreen is a number >= 0
+    #
+    # Attribute _lanetypes: The type of each lane
+    # Invariant: _lanetypes is a list of strings from LANE_TYPES, one per row
+    #
+    # Attribute _names: The object type names used in this level
+    # Invariant: _names is a list of strings
+    #
+    # Attribute _speeds: The speed of each lane (0 if it does not move)
+    # Invariant: _speeds is a 1-d float64 array with one entry per lane
+    #
+    # Attribute _firsts: Where the obstacles of each lane start in _types
+    # Invariant: _firsts is a 1-d int32 array with one more entry than _speeds; the
+    #            obstacles of lane n are at firsts[n] up to (not including) firsts[n+1]
+    #
+    # Attribute _types: The type of every obstacle, as an index into _names
+    # Invariant: _types is a 1-d uint16 array
+    #
+    # Attribute _positions: The starting position of every obstacle, in grid squares
+    # Invariant: _positions is a 1-d float64 array the same size as _types
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getSize(self):
+        """
+        Returns the size of the level in grid squares, as (columns,rows)
+        """
+        return self._size
+
+    def getStart(self):
+        """
+        Returns the starting grid square of the frog, as (column,row)
+        """
+        return self._start
+
+    def getOffscreen(self):
+        """
+        Returns the offscreen buffer (in grid squares) before obstacles wrap
+        """
+        return self._offscreen
+
+    def getLaneCount(self):
+        """
+        Returns the number of lanes in the level
+        """
+        return len(self._lanetypes)
+
+    def getLaneType(self,lane):
+        """
+        Returns the type of the given lane
+
+        Parameter lane: The lane number (0 is the bottom)
+        Precondition: lane is an int in 0..getLaneCount()-1
+        """
+        return self._lanetypes[lane]
+
+    def getLaneSpeed(self,lane):
+        """
+        Returns the speed of the given lane in pixels per second
+
+        Parameter lane: The lane number (0 is the bottom)
+        Precondition: lane is an int in 0..getLaneCount()-1
+        """
+        return float(self._speeds[lane])
+
+    def getObjectTypes(self,lane):
+        """
+        Returns the list of object types of the obstacles in the given lane
+
+        Parameter lane: The lane number (0 is the bottom)
+        Precondition: lane is an int in 0..getLaneCount()-1
+        """
+        types = self._types[self._firsts[lane]:self._firsts[lane+1]]
+        return [self._names[type] for type in types.tolist()]
+
+    def getObjectPositions(self,lane):
+        """
+        Returns the array of starting positions (in grid squares) in the given lane
+
+        The array is read-only.
+
+        Parameter lane: The lane number (0 is the bottom)
+        Precondition: lane is an int in 0..getLaneCount()-1
+        """
+        return self._positions[self._firsts[lane]:self._firsts[lane+1]]
+
+    # INITIALIZER
+    def __init__(self,header,speeds,firsts,types,positions):
+        """
+        Initializes a compiled level from its header and arrays
+
+        Use the functions compile_level and load_level instead of this initializer.
+
+        Parameter header: The level attributes that are not arrays
+        Precondition: header is a dictionary with the keys 'size', 'start',
+        'offscreen', 'lanes' (the lane types) and 'names' (the object types)
+
+        Parameter speeds: The speed of each lane
+        Precondition: speeds is a 1-d float64 array
+
+        Parameter firsts: Where the obstacles of each lane start
+        Precondition: firsts is a 1-d int32 array with len(speeds)+1 entries
+
+        Parameter types: The type of every obstacle, as an index into the names
+        Precondition: types is a 1-d uint16 array
+
+        Parameter positions: The starting position of every obstacle
+        Precondition: positions is a 1-d float64 array the same size as types
+        """
+        self._size = tuple(header['size'])
+        self._start = tuple(header['start'])
+        self._offscreen = header['offscreen']
+        self._lanetypes = list(header['lanes'])
+        self._names = list(header['names'])
+        self._speeds = speeds
+        self._firsts = firsts
+        self._types = types
+        self._positions = positions
+
+
+def check_level(json_dict):
+    """
+    Returns the list of problems with a level file that has been read as JSON
+
+    Each problem is a pair (path,message).  The path is a tuple of the keys and list
+    indices that lead to the part of the file with the problem, such as ('lanes',3,
+    'objects',0,'type').  The empty tuple is the whole file.  The list is empty if
+    the level is valid.
+
+    Besides the types of every value, this checks that every object type is in
+    OBJECT_DATA and belongs in the lane it is in, that the start is on a grass lane
+    inside the level, that the objects in hedges are inside the level and that
+    there is at least one exit, and that no two obstacles in a lane overlap.
+
+    Parameter json_dict: The level, as read from the JSON file
+    Precondition: json_dict is any value returned by json.load
+    """
+    if type(json_dict) != dict:
+        return [((),'the level is not a JSON object')]
+    problems = []
+    for key in ('size','start','offscreen','lanes'):
+        if not key in json_dict:
+            problems.append(((),'the level has no %s' % repr(key)))
+    if problems != []:
+        return problems
+
+    size = json_dict['size']
+    if type(size) != list or len(size) != 2 or \
+    not all(type(value) == int and value > 0 for value in size):
+        problems.append((('size',),'the size %s is not two positive ints' % repr(size)))
+        size = None
+    start = json_dict['start']
+    if type(start) != list or len(start) != 2 or \
+    not all(type(value) == int for value in start):
+        problems.append((('start',),'the start %s is not two ints' % repr(start)))
+        start = None
+    elif not size is None and not (0 <= start[0] < size[0] and 0 <= start[1] < size[1]):
+        problems.append((('start',),'the start %s is outside of the level' % repr(start)))
+        start = None
+    offscreen = json_dict['offscreen']
+    if not type(offscreen) in (int,float) or offscreen < 0:
+        problems.append((('offscreen',),
+                         'the offscreen %s is not a number >= 0' % repr(offscreen)))
+        offscreen = None
+    lanes = json_dict['lanes']
+    if type(lanes) != list:
+        problems.append((('lanes',),'the lanes are not a list'))
+        return problems
+    if not size is None and len(lanes) != size[1]:
+        problems.append((('lanes',),'the level has %d lanes, but a height of %d' %
+                         (len(lanes),size[1])))
+
+    exits = 0
+    for num in range(len(lanes)):
+        lane = lanes[num]
+        if type(lane) != dict or not lane.get('type') in LANE_TYPES:
+            problems.append((('lanes',num),'lane %d does not have a valid type' % num))
+            continue
+        if not type(lane.get('speed',0)) in (int,float):
+            problems.append((('lanes',num,'speed'),'lane %d has a speed %s that is '
+                             'not a number' % (num,repr(lane['speed']))))
+        objects = lane.get('objects',[])
+        if type(objects) != list:
+            problems.append((('lanes',num,'objects'),
+                             'lane %d has objects that are not a list' % num))
+            continue
+        found = _checkObjects(lane,num,None if size is None else size[0])
+        if found == [] and not size is None and not offscreen is None:
+            found = _checkOverlaps(lane,num,size[0],offscreen)
+        problems.extend(found)
+        for obj in objects:
+            if type(obj) == dict and type(obj.get('type')) == str and \
+            not object_type(obj['type']) is None and object_type(obj['type']).isGoal():
+                exits += 1
+
+    if exits == 0:
+        problems.append((('lanes',),'the level has no exits'))
+    if not start is None and start[1] < len(lanes) and type(lanes[start[1]]) == dict \
+    and lanes[start[1]].get('type') in LANE_TYPES and lanes[start[1]]['type'] != 'grass':
+        problems.append((('start',),'the start %s is on a %s lane, not grass' %
+                         (repr(start),lanes[start[1]]['type'])))
+    return problems
+
+
+def compile_level(json_dict):
+    """
+    Returns the LevelData for a level file that has been read as JSON
+
+    This checks the level first, and raises a ValueError that describes the first
+    problem found by check_level.
+
+    Parameter json_dict: The level, as read from the JSON file
+    Precondition: json_dict is any value returned by json.load
+    """
+    problems = check_level(json_dict)
+    if problems != []:
+        raise ValueError(problems[0][1])
+
+    lanes = json_dict['lanes']
+    names = []
+    speeds = []
+    firsts = [0]
+    types = []
+    positions = []
+    for lane in lanes:
+        speeds.append(lane.get('speed',0))
+        for obj in lane.get('objects',[]):
+            if not obj['type'] in names:
+                names.append(obj['type'])
+            types.append(names.index(obj['type']))
+            positions.append(obj['position'])
+        firsts.append(len(types))
+
+    header = {'size': json_dict['size'], 'start': json_dict['start'],
+              'offscreen': json_dict['offscreen'],
+              'lanes': [lane['type'] for lane in lanes], 'names': names}
+    return LevelData(header,np.array(speeds,dtype=np.float64),
+                     np.array(firsts,dtype=np.int32),np.array(types,dtype=np.uint16),
+                     np.array(positions,dtype=np.float64))
+
+
+def cache_path(source):
+    """
+    Returns the path of the compiled copy of a level file
+
+    The compiled copy is in a Cache folder next to the folder of the level file, so
+    the levels in JSON_FOLDER are compiled to CACHE_FOLDER.
+
+    Parameter source: The path to the level file
+    Precondition: source is a string
+    """
+    folder = os.path.dirname(os.path.dirname(os.path.abspath(source)))
+    name = os.path.splitext(os.path.basename(source))[0]+'.lvl'
+    return os.path.join(folder,'Cache',name)
+
+
+def save_level(source,level):
+    """
+    Saves the compiled copy of a level file, returning False if it cannot be saved
+
+    Parameter source: The path to the level file
+    Precondition: source is a string naming a file
+
+    Parameter level: The level compiled from that file
+    Precondition: level is a LevelData
+    """
+    stat = os.stat(source)
+    key = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': _hashFile(source),
+           'objects': _objectsHash(), 'rules': LEVEL_RULES}
+    try:
+        _writeCache(cache_path(source),level,key)
+    except OSError:
+        return False    # The folder is read-only, so just skip the cache
+    return True
+
+
+def load_level(name):
+    """
+    Returns the LevelData for the given level file, or None if it cannot be loaded
+
+    The name must refer to a file in the JSON folder.  If the Cache folder has a
+    compiled copy of that file that is up to date, it is memory-mapped.  Otherwise
+    the file is parsed and compiled, and the compiled copy is saved for next time.
+    A compiled copy is up to date if it was made with the same version of the rules
+    (LEVEL_RULES) and the same OBJECT_DATA (SHA-1 hash), from a file with the same
+    time stamp and size, or failing that, with the same contents.
+
+    This returns None if the file is missing, is not valid JSON, or is not a valid
+    level.  Use the function check_level (or the validate.py script) to find out
+    what is wrong with it.
+
+    Parameter name: The file name
+    Precondition: name is a string
+    """
+    source = os.path.join(JSON_FOLDER,name)
+    if not os.path.exists(source):
+        return None
+    stat = os.stat(source)
+    cache = cache_path(source)
+
+    data = _readCache(cache)
+    if not data is None:
+        (header,level) = data
+        key = header['source']
+        if key.get('rules') == LEVEL_RULES and key.get('objects') == _objectsHash():
+            if key['mtime'] == stat.st_mtime_ns and key['size'] == stat.st_size:
+                return level
+            if key['sha1'] == _hashFile(source):
+                return level
+
+    try:
+        level = compile_level(load_json(name))
+    except ValueError:
+        return None
+
+    if not save_level(source,level):
+        return level
+    data = _readCache(cache)
+    return level if data is None else data[1]
+
+
+def level_file(arg):
+    """
+    Returns the level file named by a command line argument, or None
+
+    The argument may be the name of a file in the JSON folder (like 'easy1.json'),
+    or a path to a file in that folder (like 'JSON/easy1.json').  The result is the
+    name of the file, which is what load_level takes.  Any other argument gives None,
+    as load_level only reads levels from the JSON folder.
+
+    Parameter arg: The command line argument
+    Precondition: arg is a string
+    """
+    if not arg.lower().endswith('.json'):
+        return None
+    folder = os.path.dirname(arg)
+    if folder != '' and os.path.realpath(folder) != os.path.realpath(JSON_FOLDER):
+        return None
+    return os.path.basename(arg)
+
+
+def _checkObjects(lane,num,width):
+    """
+    Returns the list of problems with the objects in a lane (see check_level)
+
+    Parameter lane: The lane, as read from the JSON file
+    Precondition: lane is a dictionary with a valid type
+
+    Parameter num: The lane number
+    Precondition: num is an int >= 0
+
+    Parameter width: The width of the level in grid squares, or None if unknown
+    Precondition: width is an int > 0 or None
+    """
+    problems = []
+    objects = lane.get('objects',[])
+    for pos in range(len(objects)):
+        obj = objects[pos]
+        path = ('lanes',num,'objects',pos)
+        if type(obj) != dict:
+            problems.append((path,'lane %d has an object that is not a JSON object' % num))
+            continue
+        name = obj.get('type')
+        kind = object_type(name) if type(name) == str else None
+        if kind is None:
+            problems.append((path+('type',) if 'type' in obj else path,
+                             'lane %d has an unknown object type %s' % (num,repr(name))))
+        elif kind.getLane() != lane['type']:
+            problems.append((path+('type',),'lane %d is %s, so it cannot have an '
+                             'object of type %s' % (num,lane['type'],repr(name))))
+        if not 'position' in obj:
+            problems.append((path,'lane %d has an object with no position' % num))
+        elif not type(obj['position']) in (int,float):
+            problems.append((path+('position',),'lane %d has an object with a '
+                             'position that is not a number' % num))
+        elif lane['type'] == 'hedge' and not width is None and \
+        not 0 <= obj['position'] <= width-1:
+            problems.append((path+('position',),'lane %d has an object at %s, '
+                             'outside of the level' % (num,repr(obj['position']))))
+    return problems
+
+
+def _checkOverlaps(lane,num,width,offscreen):
+    """
+    Returns the list of problems with obstacles in a lane that overlap
+
+    Two obstacles overlap if their hitboxes overlap at the start.  Since every
+    obstacle in a lane moves at the same speed and wraps around at the same place,
+    obstacles that do not overlap at the start never will, as long as the first one
+    is also checked against the last one wrapped around.  Touching is allowed.
+
+    Parameter lane: The lane, as read from the JSON file
+    Precondition: lane is a dictionary with no problems found by _checkObjects
+
+    Parameter num: The lane number
+    Precondition: num is an int >= 0
+
+    Parameter width: The width of the level in grid squares
+    Precondition: width is an int > 0
+
+    Parameter offscreen: The offscreen buffer in grid squares
+    Precondition: offscreen is a number >= 0
+    """
+    speed = lane.get('speed',0)
+    objects = lane.get('objects',[])
+    limit = offscreen*GRID_SIZE
+    loop = width*GRID_SIZE+2*limit
+    spans = []
+    for pos in range(len(objects)):
+        kind = object_type(objects[pos]['type'])
+        hitbox = kind.getHitbox()
+        if speed < 0:
+            hitbox = (hitbox[2],hitbox[1],hitbox[0],hitbox[3])
+        x = objects[pos]['position']*GRID_SIZE+GRID_SIZE/2
+        if speed != 0:
+            x = (x+limit) % loop - limit    # Where it is after wrapping once
+        half = kind.getSize()[0]/2
+        spans.append((x-half+hitbox[0],x+half-hitbox[2],pos))
+
+    spans.sort()
+    pairs = list(zip(spans,spans[1:]))
+    if len(spans) > 1 and speed != 0:
+        last = spans[-1]
+        pairs.append(((last[0]-loop,last[1]-loop,last[2]),spans[0]))
+
+    problems = []
+    for (first,second) in pairs:
+        if first[1] > second[0]:
+            problems.append((('lanes',num,'objects',second[2]),
+                             'lane %d has objects %d and %d that overlap' %
+                             (num,min(first[2],second[2]),max(first[2],second[2]))))
+    return problems
+
+
+def _readAlpha(path):
+    """
+    Returns the alpha channel of a PNG file as a 2-d uint8 array, or None
+
+    Row 0 of the array is the top row of the image.  An image with no alpha channel
+    (and no transparent palette colors) is opaque.  Only images with 8 bits per
+    channel and no interlacing can be read, which is every image in IMAGE_FOLDER.
+    This returns None for any other file.
+
+    The PNG filters work on each channel by itself, so only the alpha bytes are
+    unfiltered.  The filters None, Sub and Up are done a row at a time with NumPy.
+
+    Parameter path: The path to the file
+    Precondition: path is a string
+    """
+    try:
+        with open(path,'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    if data[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+
+    chunks = {}
+    compressed = []
+    pos = 8
+    while pos+8 <= len(data):
+        length = int.from_bytes(data[pos:pos+4],'big')
+        kind = data[pos+4:pos+8]
+        if kind == b'IDAT':
+            compressed.append(data[pos+8:pos+8+length])
+        elif not kind in chunks:
+            chunks[kind] = data[pos+8:pos+8+length]
+        pos += 12+length
+
+    header = chunks.get(b'IHDR',b'')
+    if len(header) < 13:
+        return None
+    (width,height,depth,color,compression,filtering,interlace) = \
+        struct.unpack('>IIBBBBB',header[:13])
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}.get(color)
+    if depth != 8 or interlace != 0 or channels is None or width == 0 or height == 0:
+        return None
+    if color in (0,2):
+        return np.full((height,width),255,dtype=np.uint8)
+
+    try:
+        raw = zlib.decompress(b''.join(compressed))
+    except zlib.error:
+        return None
+    stride = width*channels+1
+    if len(raw) < stride*height:
+        return None
+    rows = np.frombuffer(raw,dtype=np.uint8,count=stride*height).reshape(height,stride)
+
+    # The last byte of every pixel is the alpha (or the palette index)
+    alpha = np.empty((height,width),dtype=np.uint8)
+    above = np.zeros(width,dtype=np.int64)
+    for row in range(height):
+        line = rows[row,channels::channels].astype(np.int64)
+        kind = rows[row,0]
+        if kind == 0:
+            current = line
+        elif kind == 1:
+            current = np.cumsum(line) & 255
+        elif kind == 2:
+            current = (line+above) & 255
+        elif kind in (3,4):
+            current = np.array(_unfilterRow(line.tolist(),above.tolist(),kind),dtype=np.int64)
+        else:
+            return None
+        alpha[row] = current
+        above = current
+
+    if color == 3:
+        table = np.full(256,255,dtype=np.uint8)
+        trns = np.frombuffer(chunks.get(b'tRNS',b''),dtype=np.uint8)[:256]
+        table[:len(trns)] = trns
+        alpha = table[alpha]
+    return alpha
+
+
+def _unfilterRow(line,above,kind):
+    """
+    Returns one channel of a PNG row after undoing the filter Average or Paeth
+
+    These filters depend on the pixel to the left after it is unfiltered, so they
+    are done one pixel at a time.
+
+    Parameter line: The filtered bytes of the channel
+    Precondition: line is a list of ints in 0..255
+
+    Parameter above: The unfiltered bytes of the channel in the row above
+    Precondition: above is a list of ints in 0..255, the same length as line
+
+    Parameter kind: The filter type
+    Precondition: kind is 3 (Average) or 4 (Paeth)
+    """
+    result = []
+    left = 0
+    corner = 0
+    for (value,up) in zip(line,above):
+        if kind == 3:
+            guess = (left+up)//2
+        else:
+            base = left+up-corner
+            (da, db, dc) = (abs(base-left), abs(base-up), abs(base-corner))
+            if da <= db and da <= dc:
+                guess = left
+            elif db <= dc:
+                guess = up
+            else:
+                guess = corner
+        left = (value+guess) & 255
+        corner = up
+        result.append(left)
+    return result
+
+
+def _hashFile(path):
+    """
+    Returns the SHA-1 hash of the contents of a file, as a hex string
+
+    Parameter path: The path to the file
+    Precondition: path is a string naming a file
+    """
+    with open(path,'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def _objectsHash():
+    """
+    Returns the SHA-1 hash of OBJECT_DATA, as a hex string (or None if it is missing)
+
+    The object types decide whether a level is valid, so a compiled level is only up
+    to date if it was checked against the same file.  The hash is only computed the
+    first time this function is called, like the object data itself.
+    """
+    global _OBJECTS_HASH
+    if _OBJECTS_HASH is None:
+        path = os.path.join(JSON_FOLDER,OBJECT_DATA)
+        _OBJECTS_HASH = _hashFile(path) if os.path.exists(path) else ''
+    return _OBJECTS_HASH or None
+
+
+def _pad(size):
+    """
+    Returns size rounded up to a multiple of 8
+
+    Parameter size: The size in bytes
+    Precondition: size is an int >= 0
+    """
+    return (size+7)//8*8
+
+
+def _writeCache(path,level,key):
+    """
+    Writes a compiled level to a cache file
+
+    The file starts with CACHE_MAGIC, then the length of the header (4 bytes, little
+    endian) and 4 bytes of padding.  The header is JSON text.  It has the attributes
+    of the level that are not arrays, the key of the source file, and the number of
+    lanes and obstacles.  After it come the arrays of speeds, firsts, types and
+    positions, in little-endian order.  The header and each array are padded to a
+    multiple of 8 bytes, so that every array is aligned in memory.
+
+    The file is written under another name first, and then renamed, so that a game
+    that is loading the level at the same time never sees half of a file.
+
+    Parameter path: The path of the cache file
+    Precondition: path is a string
+
+    Parameter level: The compiled level
+    Precondition: level is a LevelData
+
+    Parameter key: The mtime, size and sha1 of the source file, and the objects
+    hash and rules version it was checked with
+    Precondition: key is a dictionary
+    """
+    count = level.getLaneCount()
+    names = []
+    types = []
+    positions = []
+    for lane in range(count):
+        for name in level.getObjectTypes(lane):
+            if not name in names:
+                names.append(name)
+            types.append(names.index(name))
+        positions.extend(level.getObjectPositions(lane).tolist())
+
+    header = {'size': list(level.getSize()), 'start': list(level.getStart()),
+              'offscreen': level.getOffscreen(),
+              'lanes': [level.getLaneType(lane) for lane in range(count)],
+              'names': names, 'source': key, 'count': len(types)}
+    text = json.dumps(header).encode('utf-8')
+    text += b' '*(_pad(len(text))-len(text))
+
+    firsts = [0]
+    for lane in range(count):
+        firsts.append(firsts[-1]+len(level.getObjectTypes(lane)))
+    arrays = [np.array([level.getLaneSpeed(lane) for lane in range(count)],dtype='<f8'),
+              np.array(firsts,dtype='<i4'),np.array(types,dtype='<u2'),
+              np.array(positions,dtype='<f8')]
+
+    os.makedirs(os.path.dirname(path),exist_ok=True)
+    temp = path+'.%d.tmp' % os.getpid()
+    with open(temp,'wb') as file:
+        file.write(CACHE_MAGIC)
+        file.write(len(text).to_bytes(4,'little')+bytes(4))
+        file.write(text)
+        for array in arrays:
+            data = array.tobytes()
+            file.write(data+bytes(_pad(len(data))-len(data)))
+    os.replace(temp,path)
+
+
+def _readCache(path):
+    """
+    Returns the pair (header,level) for a cache file, or None if it cannot be read
+
+    The arrays of the level are read-only views of the memory-mapped file.
+
+    Parameter path: The path of the cache file
+    Precondition: path is a string
+    """
+    try:
+        with open(path,'rb') as file:
+            buffer = mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ)
+    except (OSError,ValueError):
+        return None
+
+    try:
+        if buffer[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+            return None
+        offset = len(CACHE_MAGIC)
+        length = int.from_bytes(buffer[offset:offset+4],'little')
+        offset += 8
+        header = json.loads(buffer[offset:offset+length].decode('utf-8'))
+        offset += length
+
+        lanes = len(header['lanes'])
+        arrays = []
+        for (dtype,count) in (('<f8',lanes),('<i4',lanes+1),('<u2',header['count']),
+                              ('<f8',header['count'])):
+            arrays.append(np.frombuffer(buffer,dtype=dtype,count=count,offset=offset))
+            offset += _pad(arrays[-1].nbytes)
+        return (header,LevelData(header,*arrays))
+    except (ValueError,KeyError,TypeError):
+        return None
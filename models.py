@@ -65,5 +65,23 @@ class Frog(GImage):         # You will need to change this by Task 3
         super().__init__(x=x_pos,y=y_pos,source='frog1.png',angle=FROG_NORTH)
 
     # ADDITIONAL METHODS (DRAWING, COLLISIONS, MOVEMENT, ETC)
+    def syncState(self,state,alpha=1.0):
+        """
+        Copies the position, heading and visibility of the frog from the simulation
+
+        If alpha is less than 1, the frog is drawn that fraction of the way through
+        the last update (for smooth motion in fixed-step mode).
+
+        Parameter state: The simulation state for the frog
+        Precondition: state is a FrogState from simulation.py
+
+        Parameter alpha: The fraction of the last update to draw
+        Precondition: alpha is a float in 0..1
+        """
+        (x,y) = state.lerp(alpha)
+        self.x = float(x)
+        self.y = float(y)
+        self.angle = state.angle
+        self.visible = state.visible
 
 # IF YOU NEED ADDITIONAL LANE CLASSES, THEY GO HERE
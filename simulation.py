@@ -0,0 +1,1500 @@
+"""
+Simulation module for Froggit
+
+This module contains the headless simulation core for the Froggit game.  Everything
+that happens during a level (the frog, the lanes, the cars, logs and exits) is tracked
+here as plain Python values and NumPy arrays.  Nothing in this module touches Kivy, so
+a level can be stepped without a window, textures or canvas instructions.  That lets
+us run levels by the thousands in batch jobs and on machines without a display server.
+
+The classes in level.py and lanes.py are thin views on top of this module.  They own
+the GImage and GTile objects, and they copy positions out of the simulation when they
+are drawn.  All of the game rules live here.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+from consts import *
+from levelcache import *
+import numpy as np
+import math
+import json
+
+# PRIMARY RULE: The simulation is not allowed to access anything in any module other
+# than consts.py and levelcache.py.  In particular it must never import game2d (or
+# anything that would pull in Kivy).  If it needs information from a view, that should
+# be a parameter.
+
+
+def bbox(x,y,width,height,angle,hitbox=(0,0,0,0)):
+    """
+    Returns the bounding box (l,t,r,b) of a box rotated by a multiple of 90 degrees
+
+    This follows the same hitbox convention as GObject._bbox, so a box computed here
+    agrees with the one that the view would compute for the same image.
+
+    Parameter x: The horizontal coordinate of the box center
+    Precondition: x is a number
+
+    Parameter y: The vertical coordinate of the box center
+    Precondition: y is a number
+
+    Parameter width: The unrotated width of the box
+    Precondition: width is a number > 0
+
+    Parameter height: The unrotated height of the box
+    Precondition: height is a number > 0
+
+    Parameter angle: The rotation of the box in degrees
+    Precondition: angle is a multiple of 90
+
+    Parameter hitbox: The (left,top,right,bottom) offsets of the hitbox
+    Precondition: hitbox is a 4-element tuple of numbers
+    """
+    oangle = angle % 360
+    w = width/2
+    h = height/2
+    if oangle == 0:
+        return (x-w+hitbox[0],y+h-hitbox[1],x+w-hitbox[2],y-h+hitbox[3])
+    elif oangle == 90:
+        return (x-h+hitbox[1],y+w-hitbox[2],x+h-hitbox[3],y-w+hitbox[0])
+    elif oangle == 180:
+        return (x-w+hitbox[2],y+h-hitbox[3],x+w-hitbox[0],y-h+hitbox[1])
+    return (x-h+hitbox[3],y+w-hitbox[0],x+h-hitbox[1],y-w+hitbox[2])
+
+
+def overlaps(box0,box1):
+    """
+    Returns True if the two bounding boxes overlap (touching edges count)
+
+    Parameter box0: The first box as (l,t,r,b)
+    Precondition: box0 is a 4-element tuple of numbers
+
+    Parameter box1: The second box as (l,t,r,b)
+    Precondition: box1 is a 4-element tuple of numbers
+    """
+    return (box0[0] <= box1[2] and box1[0] <= box0[2] and
+            box0[3] <= box1[1] and box1[3] <= box0[1])
+
+
+def contains(box,point):
+    """
+    Returns True if the bounding box contains the point (edges included)
+
+    Parameter box: The box as (l,t,r,b)
+    Precondition: box is a 4-element tuple of numbers
+
+    Parameter point: The point to test
+    Precondition: point is a pair of numbers
+    """
+    return box[0] <= point[0] <= box[2] and box[3] <= point[1] <= box[1]
+
+
+def solid_points(shape,xs,ys):
+    """
+    Returns a bool array saying which of the points are on solid pixels of an object
+
+    The shape of an object is a tuple (mask,x,y,width,height,angle), where mask is
+    the ObjectMask of its image, (x,y) is its center, (width,height) is the size it
+    is drawn at and angle is its rotation in degrees.
+
+    Parameter shape: The shape of the object
+    Precondition: shape is a shape tuple as described above
+
+    Parameter xs: The horizontal coordinates of the points
+    Precondition: xs is a 1-d float array
+
+    Parameter ys: The vertical coordinates of the points
+    Precondition: ys is a 1-d float array the same size as xs
+    """
+    (mask,x,y,width,height,angle) = shape
+    # Rounding keeps the right angles exact, so points do not slip into the next pixel
+    cos = round(math.cos(math.radians(angle)),12)
+    sin = round(math.sin(math.radians(angle)),12)
+    dx = xs-x
+    dy = ys-y
+    return mask.covers(dx*cos+dy*sin,dy*cos-dx*sin,width,height)
+
+
+def solid_overlap(box,first,second):
+    """
+    Returns True if two objects have a solid pixel in common inside the box
+
+    This is the fine test of a pixel collision, made after the hitboxes overlap.  The
+    box should be where they overlap.  Every pixel in the box is looked up in both
+    masks at once, and the results are ANDed together.
+
+    Parameter box: The box to test as (l,t,r,b)
+    Precondition: box is a 4-element tuple of numbers
+
+    Parameter first: The shape of the first object (see solid_points)
+    Precondition: first is a shape tuple
+
+    Parameter second: The shape of the second object (see solid_points)
+    Precondition: second is a shape tuple
+    """
+    xs = np.arange(math.floor(box[0]),math.ceil(box[2]))+0.5
+    ys = np.arange(math.floor(box[3]),math.ceil(box[1]))+0.5
+    if len(xs) == 0 or len(ys) == 0:
+        return False
+    (xs,ys) = np.meshgrid(xs,ys)
+    (xs,ys) = (xs.ravel(),ys.ravel())
+    return bool((solid_points(first,xs,ys) & solid_points(second,xs,ys)).any())
+
+
+def rows_touching(bottom,top):
+    """
+    Returns the (lowest,highest) grid rows touched by a vertical span
+
+    Row r covers the pixels from r*GRID_SIZE to (r+1)*GRID_SIZE.  A span that ends
+    exactly on a row boundary touches the rows on both sides of it, to match the
+    function overlaps.  The rows are not clipped to the level.
+
+    Parameter bottom: The bottom of the span
+    Precondition: bottom is a number
+
+    Parameter top: The top of the span
+    Precondition: top is a number >= bottom
+    """
+    return (int(math.ceil(bottom/GRID_SIZE))-1,int(top//GRID_SIZE))
+
+
+class LaneState(object):
+    """
+    A class representing the state of a single lane.
+
+    There is only one lane class in the simulation.  The lane type ('grass', 'road',
+    'water' or 'hedge') is an attribute, and the simulation uses it to decide which
+    rules apply.  Hedges also keep track of which exits have been taken.
+
+    The obstacles (cars, logs or exits) are stored as a structure of arrays.  Every
+    obstacle in a lane has the same y position and the same angle (180 degrees if the
+    lane moves to the left, 0 otherwise), so only the x positions change.  The extents
+    of each obstacle's hitbox relative to its center are computed once, with the
+    rotation already applied.  That way a whole lane moves and wraps with a single
+    vectorized operation.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute _type: The lane type from the level file
+    # Invariant: _type is one of 'grass', 'road', 'water' or 'hedge'
+    #
+    # Attribute _row: The grid row of this lane (0 is the bottom)
+    # Invariant: _row is an int >= 0
+    #
+    # Attribute _speed: The speed of the obstacles in pixels per second
+    # Invariant: _speed is a number (0 for lanes that do not move)
+    #
+    # Attribute _width: The pixel width of the level
+    # Invariant: _width is a number > 0
+    #
+    # Attribute _buffer: The offscreen buffer (in grid squares) before wrapping
+    # Invariant: _buffer is a number >= 0
+    #
+    # Attribute _angle: The rotation of every obstacle in this lane
+    # Invariant: _angle is 0 or 180
+    #
+    # Attribute _types: The object type of each obstacle (e.g. 'car1')
+    # Invariant: _types is a (possibly empty) list of strings
+    #
+    # Attribute _kinds: The shared ObjectType of each obstacle (see levelcache.py)
+    # Invariant: _kinds is a list of ObjectType, one for each element of _types
+    #
+    # Attribute _goals: Whether each obstacle is an exit that makes the frog safe
+    # Invariant: _goals is a 1-d bool array the same size as _startxs
+    #
+    # Attribute _startxs: The horizontal coordinate of each obstacle at time 0
+    # Invariant: _startxs is a 1-d float64 array with one entry per element of _types
+    #
+    # Attribute _xs: The horizontal coordinate of each obstacle center
+    # Invariant: _xs is a 1-d float64 array the same size as _startxs
+    #
+    # Attribute _time: The time in seconds that this lane has been running
+    # Invariant: _time is a float >= 0
+    #
+    # Attribute _widths: The (unrotated) image width of each obstacle
+    # Invariant: _widths is a 1-d float64 array the same size as _xs
+    #
+    # Attribute _hitboxes: The hitbox offsets (left,top,right,bottom) of each obstacle
+    # Invariant: _hitboxes is a float64 array of shape (len(_xs),4)
+    #
+    # Attribute _lefts: The distance from each center to the left of its hitbox
+    # Invariant: _lefts is a 1-d float64 array the same size as _xs
+    #
+    # Attribute _rights: The distance from each center to the right of its hitbox
+    # Invariant: _rights is a 1-d float64 array the same size as _xs
+    #
+    # Attribute _tops: The top of each hitbox
+    # Invariant: _tops is a 1-d float64 array the same size as _xs
+    #
+    # Attribute _bottoms: The bottom of each hitbox
+    # Invariant: _bottoms is a 1-d float64 array the same size as _xs
+    #
+    # Attribute _safe: The positions of the frogs that reached an exit (hedge only)
+    # Invariant: _safe is a list of (x,y) tuples
+    #
+    # Attribute _lilipads: The number of exits in this lane (hedge only)
+    # Invariant: _lilipads is an int >= 0
+    #
+    # Attribute _occupancy: The occupancy tables built so far, by grid row
+    # Invariant: _occupancy is a dictionary from ints to 2-d uint8 arrays
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getType(self):
+        """
+        Returns the lane type
+        """
+        return self._type
+
+    def getRow(self):
+        """
+        Returns the grid row of this lane
+        """
+        return self._row
+
+    def getBottom(self):
+        """
+        Returns the pixel coordinate of the bottom of this lane
+        """
+        return self._row*GRID_SIZE
+
+    def getCenter(self):
+        """
+        Returns the vertical coordinate of the obstacle centers in this lane
+        """
+        return self._row*GRID_SIZE + GRID_SIZE/2
+
+    def getSpeed(self):
+        """
+        Returns the speed of the obstacles
+        """
+        return self._speed
+
+    def getBuffer(self):
+        """
+        Returns the size of the offscreen buffer
+        """
+        return self._buffer
+
+    def getAngle(self):
+        """
+        Returns the rotation of the obstacles in this lane
+        """
+        return self._angle
+
+    def getTypes(self):
+        """
+        Returns the list of obstacle types
+        """
+        return self._types
+
+    def getKinds(self):
+        """
+        Returns the list of shared ObjectTypes of the obstacles
+        """
+        return self._kinds
+
+    def getGoals(self):
+        """
+        Returns the array saying whether each obstacle is an exit (read-only)
+        """
+        return self._goals
+
+    def getTime(self):
+        """
+        Returns the time in seconds that this lane has been running
+        """
+        return self._time
+
+    def getXs(self):
+        """
+        Returns the array of obstacle x positions
+
+        The array is live.  It changes as the lane updates.
+        """
+        return self._xs
+
+    def getListofSafe(self):
+        """
+        Returns the list of positions of frogs that reached safety
+        """
+        return self._safe
+
+    def getLengthofLilipads(self):
+        """
+        Returns the number of exits in this lane
+        """
+        return self._lilipads
+
+    # INITIALIZER
+    def __init__(self,level,num_lane):
+        """
+        Initializes the lane state from the level
+
+        Parameter level: The compiled level
+        Preconditon: level is a LevelData
+
+        Parameter num_lane: Indicates which lane is being targeted
+        Precondition: num_lane is an integer
+        """
+        self._type = level.getLaneType(num_lane)
+        self._row = num_lane
+        self._speed = level.getLaneSpeed(num_lane)
+        self._width = level.getSize()[0]*GRID_SIZE
+        self._buffer = level.getOffscreen()
+
+        self._angle = 0
+        if self._type in ['road','water'] and self._speed < 0:
+            self._angle = 180
+
+        self._types = level.getObjectTypes(num_lane)
+        self._startxs = level.getObjectPositions(num_lane)*GRID_SIZE + GRID_SIZE/2
+        self._xs = self._startxs.copy()
+        self._time = 0.0
+
+        self._kinds = [object_type(type) for type in self._types]
+        sizes = np.array([kind.getSize() for kind in self._kinds],
+                         dtype=np.float64).reshape(-1,2)
+        self._widths = sizes[:,0].copy()
+        self._hitboxes = np.array([kind.getHitbox() for kind in self._kinds],
+                                  dtype=np.float64).reshape(-1,4)
+        self._computeExtents(sizes[:,1])
+        self._goals = np.array([kind.isGoal() for kind in self._kinds],dtype=bool)
+        self._goals.flags.writeable = False
+
+        self._safe = []
+        self._lilipads = int(self._goals.sum())
+        self._occupancy = {}
+
+    # ADDITIONAL METHODS
+    def getBox(self):
+        """
+        Returns the bounding box (l,t,r,b) of the lane background
+        """
+        bottom = self.getBottom()
+        return (0,bottom+GRID_SIZE,self._width,bottom)
+
+    def getReach(self):
+        """
+        Returns the (lowest,highest) grid rows touched by this lane
+
+        This includes the lane background as well as any obstacles that stick out of
+        the lane.  Touching an edge counts, just like in the function overlaps.
+        """
+        bottom = self.getBottom()
+        top = bottom+GRID_SIZE
+        if len(self._xs) > 0:
+            bottom = min(bottom,float(self._bottoms.min()))
+            top = max(top,float(self._tops.max()))
+        return rows_touching(bottom,top)
+
+    def getObjBoxes(self):
+        """
+        Returns the bounding boxes of every obstacle as a tuple (l,t,r,b) of arrays
+
+        Each element of the tuple is a 1-d array with one entry per obstacle.  The
+        rotation of the lane is already taken into account.
+        """
+        return (self._xs-self._lefts,self._tops,self._xs+self._rights,self._bottoms)
+
+    def getExtents(self):
+        """
+        Returns the hitbox of every obstacle relative to its x position
+
+        The result is a tuple (left,top,right,bottom) of arrays.  The left and right
+        are distances from the center, while the top and bottom are the pixel
+        coordinates of the hitbox (they do not change as the obstacles move).  So
+        obstacle i at position x covers x-left[i] to x+right[i].
+        """
+        return (self._lefts,self._tops,self._rights,self._bottoms)
+
+    def getShape(self,num):
+        """
+        Returns the shape of an obstacle for pixel collisions (see solid_points)
+
+        The mask is None if the image of the obstacle has no mask.
+
+        Parameter num: The index of the obstacle
+        Precondition: num is an int in 0..len(getTypes())-1
+        """
+        (width,height) = self._kinds[num].getSize()
+        return (object_mask(self._types[num]),float(self._xs[num]),self.getCenter(),
+                width,height,self._angle)
+
+    def collisions(self,box,shape=None):
+        """
+        Returns the indices of the obstacles whose bounding box overlaps the given box
+
+        This is one batched version of the function overlaps, so touching edges count
+        as a collision.  The result is an int array in increasing order.
+
+        If a shape is given, an obstacle must also have a solid pixel in common with
+        it (see the function solid_overlap).  That test is only made for obstacles
+        that overlap the box, and only for those that have a mask.
+
+        Parameter box: The box to test as (l,t,r,b)
+        Precondition: box is a 4-element tuple of numbers
+
+        Parameter shape: The shape of the object in the box, or None
+        Precondition: shape is a shape tuple (see solid_points) or None
+        """
+        x0 = self._xs-self._lefts
+        x1 = self._xs+self._rights
+        hits = (x0 <= box[2]) & (box[0] <= x1) & (self._bottoms <= box[1]) & \
+               (box[3] <= self._tops)
+        hits = hits.nonzero()[0]
+        if shape is None or shape[0] is None or len(hits) == 0:
+            return hits
+
+        keep = []
+        for num in hits.tolist():
+            other = self.getShape(num)
+            common = (max(box[0],x0[num]),min(box[1],self._tops[num]),
+                      min(box[2],x1[num]),max(box[3],self._bottoms[num]))
+            if other[0] is None or solid_overlap(common,shape,other):
+                keep.append(num)
+        return np.array(keep,dtype=hits.dtype)
+
+    def containing(self,point,solid=False):
+        """
+        Returns the indices of the obstacles whose bounding box contains the point
+
+        This is one batched version of the function contains, so points on the edge
+        are inside.  The result is an int array in increasing order.
+
+        If solid is True, the point must also be on a solid pixel of an obstacle that
+        has a mask.
+
+        Parameter point: The point to test
+        Precondition: point is a pair of numbers
+
+        Parameter solid: Whether the point must be on a solid pixel
+        Precondition: solid is a bool
+        """
+        x0 = self._xs-self._lefts
+        x1 = self._xs+self._rights
+        hits = (x0 <= point[0]) & (point[0] <= x1) & (self._bottoms <= point[1]) & \
+               (point[1] <= self._tops)
+        hits = hits.nonzero()[0]
+        if not solid or len(hits) == 0:
+            return hits
+
+        (xs,ys) = (np.array([float(point[0])]),np.array([float(point[1])]))
+        keep = []
+        for num in hits.tolist():
+            shape = self.getShape(num)
+            if shape[0] is None or solid_points(shape,xs,ys)[0]:
+                keep.append(num)
+        return np.array(keep,dtype=hits.dtype)
+
+    def update(self,dt):
+        """
+        Moves the obstacles, wrapping them once they are offscreen
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        self.seek(self._time+dt)
+
+    def seek(self,time):
+        """
+        Moves the obstacles to where they are at the given lane time
+
+        Parameter time: The time in seconds since the level started
+        Precondition: time is a number (int or float)
+        """
+        self._time = time
+        if self._speed != 0 and len(self._xs) > 0:
+            self._xs[:] = self.positionsAt(time)
+
+    def getPeriod(self):
+        """
+        Returns the time in seconds for the obstacles to make one complete loop
+
+        Returns None if the lane does not move.
+        """
+        if self._speed == 0:
+            return None
+        return (self._width + 2*self._buffer*GRID_SIZE)/abs(self._speed)
+
+    def positionsAt(self,time):
+        """
+        Returns a new array with the obstacle x positions at the given lane time
+
+        Obstacles move at a constant speed and wrap around once they are the offscreen
+        buffer past either edge.  So each position is the starting position plus the
+        distance travelled, taken modulo the width of one loop.  This takes the same
+        time no matter how large the time is.
+
+        Parameter time: The time in seconds since the level started
+        Precondition: time is a number (int or float)
+        """
+        if self._speed == 0:
+            return self._startxs.copy()
+
+        limit = self._buffer*GRID_SIZE
+        span = self._width + 2*limit
+        return np.mod(self._startxs + (limit + self._speed*time),span) - limit
+
+    def addSafe(self,point):
+        """
+        Records that a frog reached the exit at the given point
+
+        Parameter point: The position of the frog
+        Precondition: point is a pair of numbers
+        """
+        self._safe.append((point[0],point[1]))
+
+    def isFull(self):
+        """
+        Returns True if every exit in this hedge has a frog in it
+        """
+        return len(self._safe) == self._lilipads
+
+    def getOccupancy(self,row):
+        """
+        Returns the occupancy table of this lane for a frog in the given grid row
+
+        The table covers one loop of the lane, in time slices of OCCUPANCY_STEP
+        seconds (a lane that does not move has a single slice).  Each row of the
+        table is a bitset with one bit per grid column, packed into bytes with
+        column 0 in the lowest bit of the first byte.
+
+        For a road, a bit is set if a car hits a frog facing north in the middle of
+        that grid square.  For water, a bit is set if a log holds up a frog in the
+        middle of that grid square (this is only ever true in the row of the lane).
+        For grass and hedges, no bit is set.
+
+        The table is built the first time it is needed for a row.
+
+        Parameter row: The grid row of the frog
+        Precondition: row is an int >= 0
+        """
+        if row in self._occupancy:
+            return self._occupancy[row]
+
+        columns = int(self._width//GRID_SIZE)
+        period = self.getPeriod()
+        slices = 1 if period is None else int(math.ceil(period/OCCUPANCY_STEP))
+        times = np.arange(slices)*OCCUPANCY_STEP
+        xs = np.broadcast_to(self.positionsAt(times[:,np.newaxis]),
+                             (slices,len(self._types)))[:,:,np.newaxis]
+        x = np.arange(columns)*GRID_SIZE + GRID_SIZE/2
+        y = row*GRID_SIZE + GRID_SIZE/2
+        left = xs-self._lefts[:,np.newaxis]
+        right = xs+self._rights[:,np.newaxis]
+        if self._type == 'road':
+            frog = object_type('frog')
+            (width,height) = frog.getSize()
+            (l,t,r,b) = bbox(0,y,width,height,FROG_NORTH,frog.getHitbox())
+            rows = ((self._bottoms <= t) & (b <= self._tops))[:,np.newaxis]
+            bits = ((left <= x+r) & (x+l <= right) & rows).any(axis=1)
+        elif self._type == 'water':
+            rows = ((self._bottoms <= y) & (y <= self._tops))[:,np.newaxis]
+            bits = ((left <= x) & (x <= right) & rows).any(axis=1)
+        else:
+            bits = np.zeros((slices,columns),dtype=bool)
+
+        self._occupancy[row] = np.packbits(bits,axis=1,bitorder='little')
+        return self._occupancy[row]
+
+    def isOccupied(self,column,row,time):
+        """
+        Returns True if the bit for a grid square is set in the occupancy table
+
+        For a road this means a car is there, and for water it means a log is there
+        (see getOccupancy).  The answer comes from a single table lookup in the
+        time slice closest to the given time, so it is only as exact as the slices.
+
+        Parameter column: The grid column of the square
+        Precondition: column is an int in 0..(level width in grid squares)-1
+
+        Parameter row: The grid row of the square
+        Precondition: row is an int >= 0
+
+        Parameter time: The time in seconds since the level started
+        Precondition: time is a number (int or float) >= 0
+        """
+        table = self.getOccupancy(row)
+        period = self.getPeriod()
+        slice = 0
+        if not period is None:
+            # The loop need not be a whole number of slices, so the last slice can be
+            # further away than the first slice of the next loop
+            phase = time % period
+            slice = int(round(phase/OCCUPANCY_STEP))
+            if slice >= len(table) or period-phase < abs(phase-slice*OCCUPANCY_STEP):
+                slice = 0
+        return bool((table[slice,column >> 3] >> (column & 7)) & 1)
+
+    def _computeExtents(self,heights):
+        """
+        Computes the hitbox extents of every obstacle from the widths and hitboxes
+
+        This applies the same rotation rules as the function bbox, so that the
+        extents agree with the box of an individual obstacle.
+
+        Parameter heights: The (unrotated) image height of each obstacle
+        Precondition: heights is a 1-d float64 array the same size as _xs
+        """
+        half_w = self._widths/2
+        half_h = heights/2
+        hit = self._hitboxes
+        center = self.getCenter()
+        if self._angle == 180:
+            self._lefts = half_w - hit[:,2]
+            self._rights = half_w - hit[:,0]
+            self._tops = center + half_h - hit[:,3]
+            self._bottoms = center - half_h + hit[:,1]
+        else:
+            self._lefts = half_w - hit[:,0]
+            self._rights = half_w - hit[:,2]
+            self._tops = center + half_h - hit[:,1]
+            self._bottoms = center - half_h + hit[:,3]
+
+
+class FrogState(object):
+    """
+    A class representing the state of the frog.
+
+    This is the frog without any of the drawing.  The view in models.py copies the
+    position, angle and visibility out of this object when it draws.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute x: The horizontal coordinate of the frog center
+    # Invariant: x is a float
+    #
+    # Attribute y: The vertical coordinate of the frog center
+    # Invariant: y is a float
+    #
+    # Attribute angle: The heading of the frog
+    # Invariant: angle is one of FROG_NORTH, FROG_SOUTH, FROG_EAST or FROG_WEST
+    #
+    # Attribute visible: Whether the frog is alive and on the screen
+    # Invariant: visible is a boolean
+    #
+    # Attribute _width: The width of the frog image
+    # Invariant: _width is a number > 0
+    #
+    # Attribute _height: The height of the frog image
+    # Invariant: _height is a number > 0
+    #
+    # Attribute _hitbox: The (left,top,right,bottom) offsets of the frog hitbox
+    # Invariant: _hitbox is a 4-element tuple of numbers
+    #
+    # Attribute _prevx: The horizontal coordinate before the last update
+    # Invariant: _prevx is a float
+    #
+    # Attribute _prevy: The vertical coordinate before the last update
+    # Invariant: _prevy is a float
+
+    # INITIALIZER
+    def __init__(self,x_pos,y_pos):
+        """
+        Initializes the frog facing north
+
+        Parameter x_pos: Indicates starting x-coordinate pixel location
+        Precondition: x_pos is a float
+
+        Parameter y_pos: Indicates starting y-coordinate pixel location
+        Precondition: y_pos is a float
+        """
+        self.x = float(x_pos)
+        self.y = float(y_pos)
+        self.angle = FROG_NORTH
+        self.visible = True
+        (self._width,self._height) = object_size('frog')
+        self._hitbox = object_type('frog').getHitbox()
+        self.snapshot()
+
+    # ADDITIONAL METHODS
+    def snapshot(self):
+        """
+        Remembers the current position as the position before the next update
+        """
+        self._prevx = self.x
+        self._prevy = self.y
+
+    def lerp(self,alpha):
+        """
+        Returns the (x,y) position a fraction alpha of the way through the last update
+
+        Parameter alpha: The fraction of the last update
+        Precondition: alpha is a float in 0..1
+        """
+        return (self._prevx+(self.x-self._prevx)*alpha,
+                self._prevy+(self.y-self._prevy)*alpha)
+
+    def getBox(self):
+        """
+        Returns the bounding box (l,t,r,b) of the frog
+        """
+        return bbox(self.x,self.y,self._width,self._height,self.angle,self._hitbox)
+
+    def getShape(self):
+        """
+        Returns the shape of the frog for pixel collisions (see solid_points)
+
+        The mask is None if the frog image has no mask.
+        """
+        return (object_mask('frog'),self.x,self.y,self._width,self._height,self.angle)
+
+
+class Simulation(object):
+    """
+    This class simulates a single level of Froggit without drawing it.
+
+    The simulation owns the frog and the lane states, and it applies all of the game
+    rules: moving the obstacles, moving the frog, killing it on roads and in water,
+    carrying it on logs and filling the exits.  It needs nothing from Kivy.  The input
+    passed to update only needs an is_key_down method, so scripted input works as well
+    as a GInput.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute _startingfrogx: The x-coordinate starting position for the frog
+    # Invariant: _startingfrogx is a float
+    #
+    # Attribute _startingfrogy: The y-coordinate starting position for the frog
+    # Invariant: _startingfrogy is a float
+    #
+    # Attribute _frog: The frog state
+    # Invariant: _frog is a FrogState
+    #
+    # Attribute _lanes: The lane states, bottom to top
+    # Invariant: _lanes is a list of LaneState
+    #
+    # Attribute _time: The time in seconds that the obstacles have been moving
+    # Invariant: _time is a float >= 0
+    #
+    # Attribute _laststep: The dt of the last update
+    # Invariant: _laststep is a float >= 0
+    #
+    # Attribute _rowindex: The lanes that can reach each grid row
+    # Invariant: _rowindex is a list with one entry per lane; entry r is the list of
+    #            lanes (bottom to top) whose background or obstacles reach row r
+    #
+    # Attribute _width: Indicates pixel width of the level
+    # Invariant: _width is an integer
+    #
+    # Attribute _height: Indicates pixel height of the level (including the lives row)
+    # Invariant: _height is an integer
+    #
+    # Attribute _livesleft: Indicates how many lives left for player
+    # Invariant: _livesleft is an integer
+    #
+    # Attribute _speed: The number of seconds between frog moves
+    # Invariant: _speed is a float > 0
+    #
+    # Attribute _pixels: Whether the frog collides with the solid pixels of obstacles
+    # Invariant: _pixels is a bool
+    #
+    # Attribute _cooldownperiod: Indicates time left before Frog can move again
+    # Invariant: _cooldownperiod is a float
+    #
+    # Attribute _iscollidingwithexit: Indicates if Frog collides with lilipad
+    # Invariant: _iscollidingwithexit is a boolean
+    #
+    # Attribute _iscollidingwithhedgelane: If Frog collides Hedge lane
+    # Invariant: _iscollidingwithhedgelane is a boolean
+    #
+    # Attribute _justaddedFROGSAFEobject: Whether safe Frog just added
+    # Invariant: _justaddedFROGSAFEobject is a boolean
+    #
+    # Attribute _wongame: Indicates whether game is won
+    # Invariant: _wongame is a boolean
+    #
+    # Attribute _iscollidingwithwaterlane: If Frog collides Water lane
+    # Invariant: _iscollidingwithwaterlane is a boolean
+    #
+    # Attribute _iscollidingwithlog: If Frog collides with log obstacle
+    # Invariant: _iscollidingwithlog is a boolean
+    #
+    # Attribute _events: What happened to the frog during the last update
+    # Invariant: _events is a list of EVENT_HOP, EVENT_DEATH and EVENT_EXIT (from
+    #            consts.py), in the order they happened, with no repeats
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getFrog(self):
+        """
+        Returns the frog state
+        """
+        return self._frog
+
+    def getLanes(self):
+        """
+        Returns the list of lane states, bottom to top
+        """
+        return self._lanes
+
+    def getWidth(self):
+        """
+        Returns the pixel width of the level
+        """
+        return self._width
+
+    def getHeight(self):
+        """
+        Returns the pixel height of the level (including the lives row)
+        """
+        return self._height
+
+    def getFrogVisible(self):
+        """
+        Returns whether or not the frog is visible
+        """
+        return self._frog.visible
+
+    def setFrogVisible(self,value):
+        """
+        Sets whether the frog is visible
+
+        Parameter value: Sets whether frog is visible
+        Precondition: value an boolean
+        """
+        self._frog.visible = value
+
+    def setFrogOriginalLocation(self):
+        """
+        Sets the frog to the original location described in JSON file
+        """
+        self._frog.x = self._startingfrogx
+        self._frog.y = self._startingfrogy
+        self._frog.snapshot()
+
+    def getFrogLives(self):
+        """
+        Returns how many frog lives left
+        """
+        return self._livesleft
+
+    def setFrogLives(self,value):
+        """
+        Sets how many frogs lives are left
+
+        Parameter value: Sets how many lives left in game
+        Precondition: value an integer
+        """
+        self._livesleft = value
+
+    def setFrogIscollidingWithExit(self,value):
+        """
+        Sets the self._iscollidingwithexit attribute
+
+        Parameter value: Sets whether frog is collding with an exit
+        Precondition: value an boolean
+        """
+        self._iscollidingwithexit = value
+
+    def getFrogIsCollidingWithExit(self):
+        """
+        Returns whether frog is colliding with exit
+        """
+        return self._iscollidingwithexit
+
+    def getWonGame(self):
+        """
+        Returns whether the user won the game
+        """
+        return self._wongame
+
+    # INITIALIZER
+    def __init__(self,level,speed=FROG_SPEED,pixels=PIXEL_COLLISIONS):
+        """
+        Initializes the frog and the lanes from the level file
+
+        Parameter level: The level to play, compiled or as read from the JSON file
+        Preconditon: level is a LevelData or a valid JSON level
+
+        Parameter speed: The number of seconds between frog moves
+        Precondition: speed is a number (int or float) > 0
+
+        Parameter pixels: Whether the frog collides with the solid pixels of the cars
+        and logs inside their hitboxes, instead of the whole hitboxes
+        Precondition: pixels is a bool
+        """
+        if not isinstance(level,LevelData):
+            level = compile_level(level)
+        self._width = level.getSize()[0]*GRID_SIZE
+        self._height = (level.getSize()[1]+1)*GRID_SIZE
+
+        self._startingfrogx = level.getStart()[0]*GRID_SIZE + GRID_SIZE/2
+        self._startingfrogy = level.getStart()[1]*GRID_SIZE + GRID_SIZE/2
+        self._frog = FrogState(self._startingfrogx,self._startingfrogy)
+
+        self._lanes = []
+        for num_lane in range(level.getLaneCount()):
+            self._lanes.append(LaneState(level,num_lane))
+        self._buildRowIndex()
+        self._time = 0.0
+        self._laststep = 0.0
+
+        self._livesleft = FROG_LIVES
+        self._speed = speed
+        self._pixels = pixels
+        self._cooldownperiod = speed
+        self._iscollidingwithexit = False
+        self._iscollidingwithhedgelane = False
+        self._justaddedFROGSAFEobject = False
+        self._wongame = False
+        self._iscollidingwithwaterlane = False
+        self._iscollidingwithlog = False
+        self._events = []
+
+    def getEvents(self):
+        """
+        Returns the list of events (hops, deaths and exits) of the last update
+
+        The views use these to play sound effects.  The list is emptied at the start
+        of every update.
+        """
+        return self._events
+
+    def getTime(self):
+        """
+        Returns the time in seconds that the obstacles have been moving
+        """
+        return self._time
+
+    def getRenderTime(self,alpha):
+        """
+        Returns the obstacle time a fraction alpha of the way through the last update
+
+        This is used to draw in-between frames when the game runs at a fixed step.
+        As the obstacle positions come from the timeline, the result is exact, even
+        for obstacles that wrapped around during the last update.
+
+        Parameter alpha: The fraction of the last update
+        Precondition: alpha is a float in 0..1
+        """
+        return max(0.0,self._time-(1-alpha)*self._laststep)
+
+    def seek(self,time):
+        """
+        Moves every obstacle to where it is at the given time
+
+        This jumps straight to the given time without simulating the frames in
+        between.  Only the obstacles move.  The frog, the lives and the exits are
+        left as they are.
+
+        Parameter time: The time in seconds since the level started
+        Precondition: time is a number (int or float) >= 0
+        """
+        self._time = time
+        for lane in self._lanes:
+            lane.seek(time)
+
+    def positionsAt(self,time):
+        """
+        Returns the obstacle x positions at the given time, without moving anything
+
+        The result is a list with one array per lane (bottom to top), in the same
+        order as the types of that lane.
+
+        Parameter time: The time in seconds since the level started
+        Precondition: time is a number (int or float) >= 0
+        """
+        return [lane.positionsAt(time) for lane in self._lanes]
+
+    def getLanesNear(self,box):
+        """
+        Returns the lanes that might touch the given box, bottom to top
+
+        The lookup uses the row index, so it only depends on how many rows the box
+        spans (at most two for the frog), not on the height of the level.  Every lane
+        that overlaps the box is in the result, but not every lane in the result
+        has to overlap it.
+
+        Parameter box: The box to look up as (l,t,r,b)
+        Precondition: box is a 4-element tuple of numbers
+        """
+        (lo,hi) = rows_touching(box[3],box[1])
+        lo = max(lo,0)
+        hi = min(hi,len(self._rowindex)-1)
+        if lo > hi:
+            return []
+        elif lo == hi:
+            return self._rowindex[lo]
+
+        lanes = set()
+        for row in range(lo,hi+1):
+            lanes.update(self._rowindex[row])
+        return sorted(lanes,key=LaneState.getRow)
+
+    def isDeadly(self,column,row,time):
+        """
+        Returns True if a frog in the given grid square would die at the given time
+
+        The frog dies if a car from any road near that row is there, or if the row is
+        water and there is no log there.  This uses the occupancy tables of the lanes
+        (see LaneState.getOccupancy), so it does not look at individual obstacles.
+
+        Parameter column: The grid column of the square
+        Precondition: column is an int in 0..(level width in grid squares)-1
+
+        Parameter row: The grid row of the square
+        Precondition: row is an int in 0..(number of lanes)-1
+
+        Parameter time: The time in seconds since the level started
+        Precondition: time is a number (int or float) >= 0
+        """
+        for lane in self._rowindex[row]:
+            if lane.getType() == 'road' and lane.isOccupied(column,row,time):
+                return True
+        lane = self._lanes[row]
+        return lane.getType() == 'water' and not lane.isOccupied(column,row,time)
+
+    def collisions(self,box,type='road'):
+        """
+        Returns the obstacles of the given lane type that overlap the box
+
+        The result is a list of (row,indices) pairs, one for each lane of that type
+        with at least one hit.  The indices are an int array into that lane.
+
+        Parameter box: The box to test as (l,t,r,b)
+        Precondition: box is a 4-element tuple of numbers
+
+        Parameter type: The lane type to check
+        Precondition: type is one of 'grass', 'road', 'water' or 'hedge'
+        """
+        result = []
+        for lane in self._lanes:
+            if lane.getType() == type:
+                hits = lane.collisions(box)
+                if len(hits) > 0:
+                    result.append((lane.getRow(),hits))
+        return result
+
+    # UPDATE METHOD TO MOVE THE FROG AND UPDATE ALL OF THE LANES
+    def update(self,dt,input):
+        """
+        Advances the level by one step
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+
+        Parameter input: The user input, used to control the frog
+        Precondition: input has a method is_key_down(key) returning a bool
+        """
+        self._beginningReset()
+        self._events = []
+        self._frog.snapshot()
+        self._laststep = dt
+
+        self._cooldownperiod = self._cooldownperiod - dt
+
+        currentX = self._frog.x
+        currentY = self._frog.y
+
+        self._time = self._time + dt
+        for lane in self._lanes:
+            lane.seek(self._time)
+
+        # Only the lanes that can reach the frog need collision checks
+        for lane in self.getLanesNear(self._frog.getBox()):
+            if lane.getType() == 'road':
+                self._checkForCars(lane)
+            elif lane.getType() == 'hedge':
+                self._checkForHedge(lane,currentX,currentY)
+            elif lane.getType() == 'water':
+                self._checkWaterLane(lane,currentX,currentY,dt)
+
+        self._moveFrogAndReset(currentX,currentY,input)
+
+    # ANY NECESSARY HELPERS (SHOULD BE HIDDEN)
+    def _buildRowIndex(self):
+        """
+        Builds the index from grid rows to the lanes that can reach them
+
+        Most lanes only reach their own row (and touch the rows next to it).  But
+        obstacles taller than GRID_SIZE, like bigcar, stick out into other rows.
+        Those lanes are listed under every row they reach.
+        """
+        self._rowindex = [[] for lane in self._lanes]
+        for lane in self._lanes:
+            (lo,hi) = lane.getReach()
+            for row in range(max(lo,0),min(hi,len(self._lanes)-1)+1):
+                self._rowindex[row].append(lane)
+
+    def _beginningReset(self):
+        """
+        Resets the collision properties from previous frames
+        """
+        self._iscollidingwithlog = False
+        self._iscollidingwithwaterlane = False
+        if self._justaddedFROGSAFEobject:
+            self._justaddedFROGSAFEobject = False
+            self._iscollidingwithhedgelane = False
+            self._iscollidingwithexit = False
+            self._cooldownperiod = self._speed
+
+    def _checkForCars(self,lane):
+        """
+        Checks for collision with frog and cars
+
+        Parameter lane: Indicates which lane
+        Precondition: lane is a road LaneState
+        """
+        shape = self._frog.getShape() if self._pixels else None
+        hits = lane.collisions(self._frog.getBox(),shape)
+        if len(hits) > 0:
+            self._frog.visible = False
+            self._livesleft -= len(hits)
+            self._addEvent(EVENT_DEATH)
+
+    def _checkForHedge(self,lane,currentX,currentY):
+        """
+        Checks for collision with Hedge lane
+
+        Parameter lane: Indicates which lane
+        Precondition: lane is a hedge LaneState
+
+        Parameter currentX: Indicates current x-position of Frog
+        Precondition: currentX is a float
+
+        Parameter currentY: Indicates current y-position of Frog
+        Precondition: currentY is a float
+        """
+        frogbox = self._frog.getBox()
+        if overlaps(lane.getBox(),frogbox):
+            self._iscollidingwithhedgelane = True
+
+        goals = lane.getGoals()
+        for num in lane.containing((currentX,currentY)).tolist():
+            if goals[num]:
+                lane.addSafe((currentX,currentY))
+                self._iscollidingwithexit = True
+                self._justaddedFROGSAFEobject = True
+                self._frog.visible = False
+                self._addEvent(EVENT_EXIT)
+            else:
+                self._iscollidingwithexit = False
+                self._iscollidingwithhedgelane = False
+
+        if len(goals) > 0 and lane.isFull():
+            self._wongame = True
+
+        (safe_w,safe_h) = FROG_SAFE_SIZE
+        for point in lane.getListofSafe():
+            if overlaps(bbox(point[0],point[1],safe_w,safe_h,FROG_SOUTH),frogbox):
+                self._iscollidingwithhedgelane = True
+                self._iscollidingwithexit = False
+
+    def _checkWaterLane(self,lane,currentX,currentY,dt):
+        """
+        Checks for properties of the Water class
+
+        Parameter lane: Indicates which lane
+        Precondition: lane is a water LaneState
+
+        Parameter currentX: Indicates current x-position of Frog
+        Precondition: currentX is a float
+
+        Parameter currentY: Indicates current y-position of Frog
+        Precondition: currentY is a float
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        if overlaps(self._frog.getBox(),lane.getBox()):
+            self._iscollidingwithwaterlane = True
+            logs = len(lane.containing((currentX,currentY),self._pixels))
+            if logs > 0:
+                self._iscollidingwithlog = True
+                self._frog.x += logs*lane.getSpeed()*dt
+
+    def _moveFrogAndReset(self,currentX,currentY,input):
+        """
+        Updates position of Frog and checks if colliding with Hedge
+
+        Parameter currentX: Indicates current x-position of Frog
+        Precondition: currentX is a float
+
+        Parameter currentY: Indicates current y-position of Frog
+        Precondition: currentY is a float
+
+        Parameter input: Allows the Frog to move
+        Precondition: input has a method is_key_down(key) returning a bool
+        """
+        if (self._cooldownperiod <= 0) and (self._iscollidingwithexit == False):
+            before = (self._frog.x,self._frog.y)
+            self._moveFrog(input,currentX,currentY,'w','s','a','d')
+            self._moveFrog(input,currentX,currentY,'up','down','left','right')
+            self._cooldownperiod = self._speed
+            if (self._frog.x,self._frog.y) != before:
+                self._addEvent(EVENT_HOP)
+
+        if (self._iscollidingwithhedgelane == True) and \
+        (self._iscollidingwithexit == False):
+            self._frog.y = currentY - GRID_SIZE
+            self._iscollidingwithhedgelane = False
+
+        if (self._iscollidingwithwaterlane == True) and \
+        (self._iscollidingwithlog == False):
+            self._frog.visible = False
+            self._livesleft -= 1
+            self._addEvent(EVENT_DEATH)
+
+    def _addEvent(self,event):
+        """
+        Adds an event to the events of this update, unless it is there already
+
+        Parameter event: The event
+        Precondition: event is one of EVENT_HOP, EVENT_DEATH or EVENT_EXIT
+        """
+        if not event in self._events:
+            self._events.append(event)
+
+    def _moveFrog(self,input,currentX,currentY,up,down,left,right):
+        """
+        Moves the frog with the given set of direction keys
+
+        Pressing two of the direction keys at once does not move the frog.
+
+        Parameter input: Allows the Frog to move
+        Precondition: input has a method is_key_down(key) returning a bool
+
+        Parameter currentX: Indicates current x-position of Frog
+        Precondition: currentX is a float
+
+        Parameter currentY: Indicates current y-position of Frog
+        Precondition: currentY is a float
+
+        Parameter up: The key that moves the frog north
+        Precondition: up is a string
+
+        Parameter down: The key that moves the frog south
+        Precondition: down is a string
+
+        Parameter left: The key that moves the frog west
+        Precondition: left is a string
+
+        Parameter right: The key that moves the frog east
+        Precondition: right is a string
+        """
+        isup = input.is_key_down(up)
+        isdown = input.is_key_down(down)
+        isleft = input.is_key_down(left)
+        isright = input.is_key_down(right)
+
+        if (isup and isdown) or (isleft and isright) or (isup and isleft) or \
+        (isup and isright) or (isleft and isdown) or (isdown and isright):
+            return
+
+        if isup and (currentY + GRID_SIZE <= self._height-GRID_SIZE):
+            self._frog.y = currentY + GRID_SIZE
+            self._frog.angle = FROG_NORTH
+        if isdown and (currentY - GRID_SIZE >= 0):
+            self._frog.y = currentY - GRID_SIZE
+            self._frog.angle = FROG_SOUTH
+        if isleft and (currentX - GRID_SIZE >= 0):
+            self._frog.x = currentX - GRID_SIZE
+            self._frog.angle = FROG_WEST
+        if isright and (currentX + GRID_SIZE <= self._width):
+            self._frog.x = currentX + GRID_SIZE
+            self._frog.angle = FROG_EAST
+
+
+class Session(object):
+    """
+    This class runs the game states of one Froggit session without drawing them.
+
+    These are the same state changes that Froggit makes in app.py, which now asks
+    this class for them.  Pressing 'S' in STATE_INACTIVE loads the level.  Losing a
+    life (or reaching an exit) switches to STATE_PAUSED, and pressing 'C' there puts
+    the frog back at the start.  The session switches to STATE_COMPLETE when the
+    game is won or the lives run out.
+
+    As everything happens here, a recording of the keys and frame times can be
+    played back through this class, with no window, to get the same game again.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute _level: The level to load when the game starts
+    # Invariant: _level is a LevelData or a valid JSON level
+    #
+    # Attribute _speed: The number of seconds between frog moves
+    # Invariant: _speed is a float > 0
+    #
+    # Attribute _pixels: Whether the simulation uses pixel collisions
+    # Invariant: _pixels is a bool
+    #
+    # Attribute _state: The current state of the game (taken from consts.py)
+    # Invariant: _state is one of STATE_INACTIVE, STATE_ACTIVE, STATE_PAUSED, or
+    #            STATE_COMPLETE at the end of every update
+    #
+    # Attribute _sim: The simulation of the level
+    # Invariant: _sim is a Simulation, or None if the level is not loaded yet
+    #
+    # Attribute _events: The events of the simulation during the last update
+    # Invariant: _events is a list of EVENT_HOP, EVENT_DEATH and EVENT_EXIT
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getState(self):
+        """
+        Returns the current state of the game
+        """
+        return self._state
+
+    def getSimulation(self):
+        """
+        Returns the simulation of the level, or None if it is not loaded yet
+        """
+        return self._sim
+
+    def getEvents(self):
+        """
+        Returns the list of events (hops, deaths and exits) of the last update
+
+        This is empty if the simulation did not step in the last update.
+        """
+        return self._events
+
+    # INITIALIZER
+    def __init__(self,level,speed=FROG_SPEED,pixels=PIXEL_COLLISIONS):
+        """
+        Initializes a session in STATE_INACTIVE
+
+        Parameter level: The level to play, compiled or as read from the JSON file
+        Preconditon: level is a LevelData or a valid JSON level
+
+        Parameter speed: The number of seconds between frog moves
+        Precondition: speed is a number (int or float) > 0
+
+        Parameter pixels: Whether the simulation uses pixel collisions
+        Precondition: pixels is a bool
+        """
+        self._level = level
+        self._speed = speed
+        self._pixels = pixels
+        self._state = STATE_INACTIVE
+        self._sim = None
+        self._events = []
+
+    # UPDATE METHOD TO CHANGE STATE AND STEP THE LEVEL
+    def update(self,dt,input):
+        """
+        Updates the game state, and steps the level if the game is active
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+
+        Parameter input: The user input, used to control the frog and change state
+        Precondition: input has a method is_key_down(key) returning a bool
+        """
+        self._events = []
+        if input.is_key_down('s') and (self._state == STATE_INACTIVE):
+            self._state = STATE_LOADING
+
+        if self._state == STATE_LOADING:
+            self._sim = Simulation(self._level,self._speed,self._pixels)
+            self._state = STATE_ACTIVE
+
+        if self._state == STATE_ACTIVE:
+            if (self._sim.getFrogVisible() == True) and \
+            (self._sim.getWonGame() == False):
+                self._sim.update(dt,input)
+                self._events = self._sim.getEvents()
+            elif (self._sim.getFrogVisible() == False) and \
+            (self._sim.getFrogLives() > 0):
+                self._state = STATE_PAUSED
+            else:
+                self._state = STATE_COMPLETE
+
+        if input.is_key_down('c') and (self._state == STATE_PAUSED):
+            self._sim.setFrogOriginalLocation()
+            self._sim.setFrogVisible(True)
+            self._state = STATE_ACTIVE
+
+
+class ScriptedInput(object):
+    """
+    This class is a stand-in for GInput that holds down the keys it is told to.
+
+    It only has the is_key_down method, which is all that Session and Simulation use.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute _keystate: The keys that are held down
+    # Invariant: _keystate is a set of strings
+
+    def __init__(self):
+        """
+        Initializes an input with no keys held down
+        """
+        self._keystate = set()
+
+    def is_key_down(self,key):
+        """
+        Returns True if key is currently held down
+
+        Parameter key: The key to test
+        Precondition: key is a string
+        """
+        return key in self._keystate
+
+    def apply(self,changes):
+        """
+        Presses and releases keys from a list of recorded key changes
+
+        Each change is the key name with a '+' in front (pressed) or a '-' in front
+        (released), as written by GInput.save.
+
+        Parameter changes: The key changes to apply, in order
+        Precondition: changes is a list of strings starting with '+' or '-'
+        """
+        for change in changes:
+            if change[0] == '+':
+                self._keystate.add(change[1:])
+            else:
+                self._keystate.discard(change[1:])
+
+
+def load_recording(filename):
+    """
+    Returns the pair (info, steps) for an input recording saved by GInput
+
+    The value info is the dictionary of details the game saved with the recording
+    (Froggit saves the level file, the frog speed and whether collisions use pixels).
+    A recording without a 'speed' or 'pixels' gets FROG_SPEED or PIXEL_COLLISIONS,
+    the same defaults as Session.  The value steps is a list with one pair (dt,
+    changes) for each call to update, where changes is the list of key changes to
+    apply before that update.
+
+    Parameter filename: The path to the recording
+    Precondition: filename is a string naming a recording saved by GInput.save
+    """
+    with open(filename) as file:
+        data = json.load(file)
+    info = dict(data.get('info',{}))
+    info.setdefault('speed',FROG_SPEED)
+    info.setdefault('pixels',PIXEL_COLLISIONS)
+    steps = []
+    for step in data['steps']:
+        if type(step) == list:
+            steps.append((step[0],step[1:]))
+        else:
+            steps.append((step,[]))
+    return (info,steps)
+
+
+def replay(filename,level=None):
+    """
+    Returns the Session after playing back an input recording, with no window
+
+    Every recorded step is passed to Session.update with the same dt and keys as
+    when it was recorded, so the game ends up exactly as it was when the recording
+    was saved.  The level, the frog speed and the collision mode come from the
+    recording (see load_recording) unless a level is given.
+
+    Parameter filename: The path to the recording
+    Precondition: filename is a string naming a recording saved by Froggit
+
+    Parameter level: The level to play, or None to load the recorded one
+    Precondition: level is a LevelData, a valid JSON level, or None
+    """
+    (info,steps) = load_recording(filename)
+    if level is None:
+        level = load_level(info['level'])
+    session = Session(level,info['speed'],info['pixels'])
+    keys = ScriptedInput()
+    for (dt,changes) in steps:
+        keys.apply(changes)
+        session.update(dt,keys)
+    return session
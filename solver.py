@@ -0,0 +1,665 @@
+"""
+Level solver for Froggit
+
+This module decides whether a Froggit level can be won, and finds the fastest way to
+reach each exit.  It searches over the states (grid column, row, time) that the
+frog can be in at each move.  The frog can only move once every FROG_SPEED
+seconds, so time is counted in moves.  Between two moves, the frog is checked every
+animation frame, with the same rules as the simulation: cars kill it, logs carry it,
+and hedges push it back unless it lands in an exit or an opening.  The solver always
+uses the hitboxes, even if PIXEL_COLLISIONS is on.  A route that is safe with the
+hitboxes is also safe with pixel collisions, except that a log may not carry a frog
+whose center is on a transparent pixel.
+
+All of the obstacles move in loops.  If the loops of every lane line up again after
+some number of moves, the search treats the states that many moves apart as the same,
+so it never explores more than one loop of the level.
+
+To check every level in the JSON folder, type
+
+    python solver.py
+
+You can also list the level files to check on the command line.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+from consts import *
+from simulation import *
+from fractions import Fraction
+import numpy as np
+import math
+import sys
+import os
+
+# PRIMARY RULE: The solver is only allowed to access the simulation (and consts.py).
+# Like the simulation, it must never import game2d or Kivy.
+
+# The length of an animation frame in seconds
+SOLVER_STEP   = 1/60
+# The longest time to search, in seconds
+SOLVER_LIMIT  = 120.0
+# The longest loop (in moves) that the search will use to merge states
+SOLVER_PERIOD = 100000
+
+# The moves the frog can make at each step (None is waiting)
+SOLVER_MOVES  = (None,'w','a','s','d')
+
+
+class Solver(object):
+    """
+    This class searches a level for the fastest route to each exit.
+
+    A route is a list with one entry for every move of the frog, where each entry is
+    the key ('w', 'a', 's' or 'd') pressed at that move, or None to wait.  The route
+    starts as soon as the level starts.  Every exit is searched for on its own, with
+    no other frogs in the hedges, so the level can be won if every exit has a route.
+
+    The search steps through the frames between moves exactly like the simulation
+    does (with a frame length of SOLVER_STEP), so every route it finds works in the
+    game.  But to keep the search small, two frogs in the same grid square at the same
+    time phase count as the same state, even though a log may have left them a few
+    pixels apart.  The first one found is kept.  So the search can (rarely) miss a
+    route that needs the frog at a particular spot in a square.
+
+    For speed, the frames between two moves are checked all at once when the frog is
+    on a road (or grass), or riding a single log.  The road checks for frogs in the
+    middle of a grid square are shared by all of the states that need them.
+    """
+    # LIST ALL HIDDEN ATTRIBUTES HERE
+    # Attribute _sim: The simulation of the level (only used for its lanes)
+    # Invariant: _sim is a Simulation that is never updated
+    #
+    # Attribute _dt: The length of an animation frame
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _frames: The number of frames between two moves
+    # Invariant: _frames is an int > 0
+    #
+    # Attribute _times: The level time of each frame (frame 0 is the start)
+    # Invariant: _times is a 1-d float64 array that grows as needed
+    #
+    # Attribute _period: The number of moves after which the obstacles repeat
+    # Invariant: _period is an int > 0, or None if that is more than SOLVER_PERIOD
+    #
+    # Attribute _limit: The largest number of moves to search
+    # Invariant: _limit is an int >= 0
+    #
+    # Attribute _columns: The x coordinate of the center of every grid column
+    # Invariant: _columns is a 1-d float64 array
+    #
+    # Attribute _exits: The exits of the level as (row,index) pairs
+    # Invariant: _exits is a list of pairs of ints
+    #
+    # Attribute _routes: The fastest route to each exit found so far
+    # Invariant: _routes is a dictionary from exits to pairs (route,time)
+    #
+    # Attribute _near: The lanes near the frog for each (y,angle)
+    # Invariant: _near is a dictionary from pairs to lists of LaneState
+    #
+    # Attribute _safe: Whether each column is safe up to a move, by (phase,y,angle)
+    # Invariant: _safe is a dictionary from triples to 1-d bool arrays
+    #
+    # Attribute _positions: The obstacle positions of a lane during one move
+    # Invariant: _positions is a dictionary from (row,move) to 2-d float64 arrays
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getExits(self):
+        """
+        Returns the list of exits in the level as (row,index) pairs
+
+        The index is the position of the exit in the objects of its lane.
+        """
+        return self._exits
+
+    def getRoutes(self):
+        """
+        Returns a dictionary from each reachable exit to the pair (route,time)
+
+        The time is the level time in seconds when the frog reaches the exit.  The
+        exits that cannot be reached are not in the dictionary.  The search must be
+        run with the method solve first.
+        """
+        return self._routes
+
+    def getPeriod(self):
+        """
+        Returns the number of moves after which every obstacle is back where it started
+
+        Returns None if the obstacles take too long to line up again.
+        """
+        return self._period
+
+    # INITIALIZER
+    def __init__(self,level,speed=FROG_SPEED,dt=SOLVER_STEP,limit=SOLVER_LIMIT):
+        """
+        Initializes a solver for the given level
+
+        Parameter level: The level to solve, compiled or as read from the JSON file
+        Preconditon: level is a LevelData or a valid JSON level
+
+        Parameter speed: The number of seconds between frog moves
+        Precondition: speed is a number (int or float) > 0
+
+        Parameter dt: The length of an animation frame
+        Precondition: dt is a number (int or float) > 0
+
+        Parameter limit: The longest time to search, in seconds
+        Precondition: limit is a number (int or float) >= 0
+        """
+        self._sim = Simulation(level,speed,False)
+        self._dt = dt
+
+        # Count the frames the way the simulation counts down the move cooldown
+        self._frames = 0
+        cooldown = speed
+        while cooldown > 0:
+            cooldown = cooldown - dt
+            self._frames += 1
+
+        self._times = np.zeros(1)
+        self._limit = int(limit/(self._frames*dt))
+        self._period = self._findPeriod()
+
+        size = self._sim.getWidth()//GRID_SIZE
+        self._columns = np.arange(size)*GRID_SIZE + GRID_SIZE/2
+        self._exits = []
+        for lane in self._sim.getLanes():
+            if lane.getType() == 'hedge':
+                for pos in lane.getGoals().nonzero()[0].tolist():
+                    self._exits.append((lane.getRow(),pos))
+
+        self._routes = {}
+        self._near = {}
+        self._safe = {}
+        self._positions = {}
+
+    # SEARCH METHODS
+    def solve(self):
+        """
+        Searches for the fastest route to every exit
+
+        The search is breadth-first in the number of moves, so the first route found
+        to an exit is the fastest.  It stops when every exit has a route, when there
+        are no more states to explore, or at the time limit.  It returns True if
+        every exit can be reached.
+        """
+        frog = self._sim.getFrog()
+        start = (frog.x,frog.y,frog.angle)
+        frontier = {start: None}
+        history = []
+        seen = set()
+        move = 0
+        while frontier and move <= self._limit and \
+        len(self._routes) < len(self._exits):
+            history.append(frontier)
+            following = {}
+            for state in frontier:
+                for (key,result) in self._advance(state,move):
+                    if type(result[0]) == str:
+                        if not result[1] in self._routes:
+                            route = self._traceRoute(history,state)
+                            self._routes[result[1]] = (route,result[2])
+                    else:
+                        phase = move+1 if self._period is None else (move+1) % self._period
+                        tag = (int(result[0]//GRID_SIZE),result[1],phase)
+                        if not tag in seen:
+                            seen.add(tag)
+                            following[result] = (state,key)
+            frontier = following
+            move += 1
+        return self.isWinnable()
+
+    def isWinnable(self):
+        """
+        Returns True if the search found a route to every exit
+        """
+        return len(self._exits) > 0 and len(self._routes) == len(self._exits)
+
+    def getFastest(self):
+        """
+        Returns the pair (route,time) for the exit that can be reached first
+
+        Returns None if no exit can be reached.
+        """
+        best = None
+        for exit in self._exits:
+            if exit in self._routes:
+                if best is None or self._routes[exit][1] < best[1]:
+                    best = self._routes[exit]
+        return best
+
+    def getSteps(self,route):
+        """
+        Returns the input steps that play the given route in a Session
+
+        The result is a list of (dt, changes) pairs in the same format as the
+        function load_recording.  The first step presses 'S' to start the game, and
+        each move holds its key down for the one frame where the frog moves.
+
+        Parameter route: The route to play
+        Precondition: route is a list of keys from SOLVER_MOVES
+        """
+        steps = []
+        held = set()
+        last = (len(route)+1)*self._frames
+        for frame in range(1,last+1):
+            wanted = set()
+            if frame == 1:
+                wanted.add('s')
+            if frame % self._frames == 0 and frame//self._frames <= len(route):
+                key = route[frame//self._frames-1]
+                if not key is None:
+                    wanted.add(key)
+            changes = ['-'+key for key in sorted(held-wanted)]
+            changes += ['+'+key for key in sorted(wanted-held)]
+            steps.append((self._dt,changes))
+            held = wanted
+        return steps
+
+    # ANY NECESSARY HELPERS (SHOULD BE HIDDEN)
+    def _findPeriod(self):
+        """
+        Returns the number of moves after which every obstacle is back where it started
+
+        Returns None if that is more than SOLVER_PERIOD moves.
+        """
+        tick = Fraction(self._dt).limit_denominator(1000000)*self._frames
+        period = 1
+        for lane in self._sim.getLanes():
+            if lane.getPeriod() is None or len(lane.getTypes()) == 0:
+                continue
+            span = Fraction(lane.getPeriod()*abs(lane.getSpeed())).limit_denominator(1000)
+            speed = Fraction(abs(lane.getSpeed())).limit_denominator(1000)
+            ratio = span/(speed*tick)
+            period = period*ratio.numerator//math.gcd(period,ratio.numerator)
+            if period > SOLVER_PERIOD:
+                return None
+        return period
+
+    def _getTimes(self,move):
+        """
+        Returns the level times of the frames during the given move
+
+        These are the frames after the last move, up to and including the frame of
+        this move.  The times add up dt the same way the simulation does.
+
+        Parameter move: The move number (0 is the first move)
+        Precondition: move is an int >= 0
+        """
+        last = (move+1)*self._frames
+        if last >= len(self._times):
+            more = np.full(last+1-len(self._times),self._dt)
+            more[0] += self._times[-1]
+            self._times = np.concatenate((self._times,np.cumsum(more)))
+        return self._times[move*self._frames+1:last+1]
+
+    def _getPositions(self,lane,move):
+        """
+        Returns the positions of the obstacles in a lane for every frame of a move
+
+        The result is a 2-d array with one row per frame.
+
+        Parameter lane: The lane to look up
+        Precondition: lane is a LaneState of this level
+
+        Parameter move: The move number (0 is the first move)
+        Precondition: move is an int >= 0
+        """
+        key = (lane.getRow(),move)
+        if not key in self._positions:
+            times = self._getTimes(move)
+            xs = lane.positionsAt(times[:,np.newaxis])
+            self._positions[key] = np.broadcast_to(xs,(len(times),len(lane.getTypes())))
+        return self._positions[key]
+
+    def _getFrogBox(self,x,y,angle):
+        """
+        Returns the hitbox (l,t,r,b) of a frog at (x,y) with the given heading
+
+        Parameter x: The horizontal coordinate of the frog center
+        Precondition: x is a number
+
+        Parameter y: The vertical coordinate of the frog center
+        Precondition: y is a number
+
+        Parameter angle: The heading of the frog
+        Precondition: angle is one of FROG_NORTH, FROG_SOUTH, FROG_EAST or FROG_WEST
+        """
+        frog = object_type('frog')
+        (width,height) = frog.getSize()
+        return bbox(x,y,width,height,angle,frog.getHitbox())
+
+    def _getNear(self,y,angle):
+        """
+        Returns the lanes that might touch a frog at height y with the given heading
+
+        Parameter y: The vertical coordinate of the frog center
+        Precondition: y is a number
+
+        Parameter angle: The heading of the frog
+        Precondition: angle is one of FROG_NORTH, FROG_SOUTH, FROG_EAST or FROG_WEST
+        """
+        key = (y,angle)
+        if not key in self._near:
+            box = self._getFrogBox(0,y,angle)
+            self._near[key] = self._sim.getLanesNear(box)
+        return self._near[key]
+
+    def _getKind(self,y,angle):
+        """
+        Returns the kind of lane that a frog at height y with this heading is in
+
+        The result is 'road' if only grass and roads touch the frog, 'water' if the
+        only lane that can hurt it is a single water lane, and 'hedge' otherwise.
+
+        Parameter y: The vertical coordinate of the frog center
+        Precondition: y is a number
+
+        Parameter angle: The heading of the frog
+        Precondition: angle is one of FROG_NORTH, FROG_SOUTH, FROG_EAST or FROG_WEST
+        """
+        (l,t,r,b) = self._getFrogBox(0,y,angle)
+        strip = (-math.inf,t,math.inf,b)
+        kinds = set()
+        for lane in self._getNear(y,angle):
+            if lane.getType() == 'water' and overlaps(lane.getBox(),strip):
+                kinds.add('water')
+            elif lane.getType() == 'hedge' and overlaps(lane.getBox(),strip):
+                kinds.add('hedge')
+        if kinds == set():
+            return 'road'
+        elif kinds == {'water'} and len([lane for lane in self._getNear(y,angle)
+                                         if lane.getType() == 'water']) == 1:
+            return 'water'
+        return 'hedge'
+
+    def _getSafe(self,y,angle,move,xs=None):
+        """
+        Returns whether the frog survives the frames up to a move at each position
+
+        The result is a bool array with one entry per position in xs.  If xs is None,
+        the positions are the centers of the grid columns, and the result is cached.
+        This is only for frogs in lanes where nothing but the roads can hurt them.
+
+        Parameter y: The vertical coordinate of the frog center
+        Precondition: y is a number
+
+        Parameter angle: The heading of the frog
+        Precondition: angle is one of FROG_NORTH, FROG_SOUTH, FROG_EAST or FROG_WEST
+
+        Parameter move: The move number (0 is the first move)
+        Precondition: move is an int >= 0
+
+        Parameter xs: The horizontal coordinates of the frog
+        Precondition: xs is a 1-d float64 array or None
+        """
+        phase = move if self._period is None else move % self._period
+        key = (phase,y,angle)
+        if xs is None:
+            if key in self._safe:
+                return self._safe[key]
+            positions = self._columns
+        else:
+            positions = xs
+
+        (l,t,r,b) = self._getFrogBox(0,y,angle)
+        lefts = positions+l
+        rights = positions+r
+        safe = np.ones(len(positions),dtype=bool)
+        for lane in self._getNear(y,angle):
+            if lane.getType() != 'road' or len(lane.getTypes()) == 0:
+                continue
+            (ol,ot,orr,ob) = lane.getExtents()
+            rows = (ob <= t) & (b <= ot)
+            if not rows.any():
+                continue
+            obs = self._getPositions(lane,move)[:,rows]
+            x0 = (obs-ol[rows])[:,:,np.newaxis]
+            x1 = (obs+orr[rows])[:,:,np.newaxis]
+            hits = (x0 <= rights) & (lefts <= x1)
+            safe &= ~hits.any(axis=(0,1))
+        if xs is None:
+            self._safe[key] = safe
+        return safe
+
+    def _advance(self,state,move):
+        """
+        Returns the results of every move from the given state
+
+        The frog is in the given state right after the previous move.  This method
+        plays the frames up to the given move, and then tries each of SOLVER_MOVES.
+        The result is a list of (key,result) pairs, where result is either the new
+        state (x,y,angle) or a triple ('exit',exit,time) if the frog reached an exit
+        on the way.  A frog that dies has no results.
+
+        Parameter state: The frog position and heading as (x,y,angle)
+        Precondition: state is a triple of numbers
+
+        Parameter move: The move number (0 is the first move)
+        Precondition: move is an int >= 0
+        """
+        (x,y,angle) = state
+        kind = self._getKind(y,angle)
+        if kind == 'road':
+            column = (x-GRID_SIZE/2)/GRID_SIZE
+            if column == int(column) and 0 <= column < len(self._columns):
+                alive = self._getSafe(y,angle,move)[int(column)]
+            else:
+                alive = self._getSafe(y,angle,move,np.array([x]))[0]
+            return self._moveAll(x,y,angle,x,y,False) if alive else []
+        elif kind == 'water':
+            result = self._ride(state,move)
+            if not result is None:
+                return result
+        return self._play(state,move)
+
+    def _ride(self,state,move):
+        """
+        Returns the results of every move from a state in a water lane, or None
+
+        This is a faster version of the method _play for the usual case, where the
+        frog stays on exactly one log (or falls in the water) and is in the water lane
+        for every frame.  As the frog moves with the log, all of the frames can be
+        checked at once.  If anything else happens, this method returns None.
+
+        Parameter state: The frog position and heading as (x,y,angle)
+        Precondition: state is a triple of numbers
+
+        Parameter move: The move number (0 is the first move)
+        Precondition: move is an int >= 0
+        """
+        (x,y,angle) = state
+        lane = [lane for lane in self._getNear(y,angle) if lane.getType() == 'water'][0]
+        if len(lane.getTypes()) == 0:
+            return []
+
+        step = lane.getSpeed()*self._dt
+        xs = np.full(self._frames,step)
+        xs[0] = x
+        xs = np.cumsum(xs)
+
+        (l,t,r,b) = self._getFrogBox(0,y,angle)
+        if (xs[0]+r < 0) or (xs[-1]+l > self._sim.getWidth()) or \
+        (xs[-1]+r < 0) or (xs[0]+l > self._sim.getWidth()):
+            return None
+
+        (ol,ot,orr,ob) = lane.getExtents()
+        logs = self._getPositions(lane,move)
+        inside = (logs-ol <= xs[:,np.newaxis]) & (xs[:,np.newaxis] <= logs+orr) & \
+                 (ob <= y) & (y <= ot)
+        counts = inside.sum(axis=1)
+        if (counts == 1).all():
+            return self._moveAll(xs[-1],y,angle,xs[-1]+step,y,False)
+        first = int((counts != 1).argmax())
+        if counts[first] == 0:
+            return []
+        return None
+
+    def _play(self,state,move):
+        """
+        Returns the results of every move from the given state, one frame at a time
+
+        This method follows the rules of Simulation.update exactly, for every lane
+        near the frog.  The result is the same as for the method _advance.
+
+        Parameter state: The frog position and heading as (x,y,angle)
+        Precondition: state is a triple of numbers
+
+        Parameter move: The move number (0 is the first move)
+        Precondition: move is an int >= 0
+        """
+        (x,y,angle) = state
+        lanes = self._getNear(y,angle)
+        times = self._getTimes(move)
+        for frame in range(self._frames):
+            cx = x
+            cy = y
+            box = self._getFrogBox(x,y,angle)
+            dead = False
+            hedge = False
+            water = False
+            log = False
+            for lane in lanes:
+                if len(lane.getTypes()) > 0:
+                    (ol,ot,orr,ob) = lane.getExtents()
+                    xs = self._getPositions(lane,move)[frame]
+                    x0 = xs-ol
+                    x1 = xs+orr
+                if lane.getType() == 'road' and len(lane.getTypes()) > 0:
+                    if ((x0 <= box[2]) & (box[0] <= x1) & (ob <= box[1]) &
+                        (box[3] <= ot)).any():
+                        dead = True
+                elif lane.getType() == 'hedge':
+                    if overlaps(lane.getBox(),box):
+                        hedge = True
+                    if len(lane.getTypes()) > 0:
+                        inside = (x0 <= cx) & (cx <= x1) & (ob <= cy) & (cy <= ot)
+                        for pos in inside.nonzero()[0].tolist():
+                            if not lane.getGoals()[pos]:
+                                hedge = False
+                            else:
+                                exit = (lane.getRow(),pos)
+                                return [(None,('exit',exit,float(times[frame])))]
+                elif lane.getType() == 'water' and overlaps(box,lane.getBox()):
+                    water = True
+                    if len(lane.getTypes()) > 0:
+                        inside = (x0 <= cx) & (cx <= x1) & (ob <= cy) & (cy <= ot)
+                        logs = int(inside.sum())
+                        if logs > 0:
+                            log = True
+                            x += logs*lane.getSpeed()*self._dt
+            if dead or (water and not log):
+                return []
+            if frame == self._frames-1:
+                return self._moveAll(cx,cy,angle,x,y,hedge)
+            if hedge:
+                y = cy - GRID_SIZE
+        return []
+
+    def _moveAll(self,cx,cy,angle,x,y,hedge):
+        """
+        Returns the (key,state) pairs for every move in the frame of a move
+
+        Moves are made from the position (cx,cy) at the start of the frame, while
+        (x,y) is the position after the lanes (so a log may have carried the frog).
+        Moves that end in the same state as an earlier move are left out.
+
+        Parameter cx: The horizontal coordinate of the frog at the start of the frame
+        Precondition: cx is a number
+
+        Parameter cy: The vertical coordinate of the frog at the start of the frame
+        Precondition: cy is a number
+
+        Parameter angle: The heading of the frog
+        Precondition: angle is one of FROG_NORTH, FROG_SOUTH, FROG_EAST or FROG_WEST
+
+        Parameter x: The horizontal coordinate of the frog after the lanes
+        Precondition: x is a number
+
+        Parameter y: The vertical coordinate of the frog after the lanes
+        Precondition: y is a number
+
+        Parameter hedge: Whether the frog was pushed back by a hedge in this frame
+        Precondition: hedge is a boolean
+        """
+        width = self._sim.getWidth()
+        height = self._sim.getHeight()
+        result = []
+        states = set()
+        for key in SOLVER_MOVES:
+            (nx,ny,nangle) = (x,y,angle)
+            if key == 'w' and (cy + GRID_SIZE <= height-GRID_SIZE):
+                (ny,nangle) = (cy + GRID_SIZE,FROG_NORTH)
+            elif key == 's' and (cy - GRID_SIZE >= 0):
+                (ny,nangle) = (cy - GRID_SIZE,FROG_SOUTH)
+            elif key == 'a' and (cx - GRID_SIZE >= 0):
+                (nx,nangle) = (cx - GRID_SIZE,FROG_WEST)
+            elif key == 'd' and (cx + GRID_SIZE <= width):
+                (nx,nangle) = (cx + GRID_SIZE,FROG_EAST)
+            if hedge:
+                ny = cy - GRID_SIZE
+            if not (nx,ny,nangle) in states:
+                states.add((nx,ny,nangle))
+                result.append((key,(nx,ny,nangle)))
+        return result
+
+    def _traceRoute(self,history,state):
+        """
+        Returns the route that leads to the given state in the last step of history
+
+        Parameter history: The states found at each move, with how they were reached
+        Precondition: history is a list of dictionaries from states to pairs
+        (previous state,key), or None for the start
+
+        Parameter state: The state to trace back from
+        Precondition: state is a key of the last dictionary in history
+        """
+        route = []
+        for step in range(len(history)-1,0,-1):
+            (state,key) = history[step][state]
+            route.append(key)
+        route.reverse()
+        return route
+
+
+def _main(argv):
+    """
+    Checks the levels from the command line, printing whether each one can be won
+
+    Every argument must name a level file in the JSON folder, by name or by path.
+    Other arguments are reported and skipped.  With no arguments, every level in
+    the JSON folder is checked.
+
+    Parameter argv: The command line arguments (without the script name)
+    Precondition: argv is a list of strings
+    """
+    levels = []
+    for arg in argv:
+        name = level_file(arg)
+        if name is None:
+            print('%s: not a level file in %s (skipped)' % (arg,JSON_FOLDER))
+        else:
+            levels.append(name)
+    if argv == []:
+        for name in sorted(os.listdir(JSON_FOLDER)):
+            if name != OBJECT_DATA:
+                levels.append(name)
+
+    for name in levels:
+        level = load_level(name)
+        if level is None:
+            print('%s: not a valid level' % name)
+            continue
+        solver = Solver(level)
+        solver.solve()
+        found = len(solver.getRoutes())
+        result = 'winnable' if solver.isWinnable() else 'NOT winnable'
+        fastest = solver.getFastest()
+        best = 'none' if fastest is None else '%.2fs' % fastest[1]
+        print('%s: %s (%d of %d exits, fastest %s)' %
+              (name,result,found,len(solver.getExits()),best))
+
+
+if __name__ == '__main__':
+    _main(sys.argv[1:])
@@ -0,0 +1,14 @@
+"""
+Test configuration for Froggit
+
+The tests import the game modules directly, so the folder above this one (with
+app.py and the simulation) is put on the module search path.  None of the tests
+need Kivy or a window.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import os
+import sys
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
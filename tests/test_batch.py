@@ -0,0 +1,77 @@
+"""
+Tests for the batch runner of Froggit
+
+A recording played by the pool of workers must give the same result as playing it
+in this process, and as the function replay.  The command line options are checked
+too.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import itertools
+import json
+
+import pytest
+
+import batch
+import simulation
+import solver
+from consts import *
+
+
+def _record(path,steps,pixels=False):
+    """
+    Saves input steps as a recording of easy1.json, in the format of GInput
+    """
+    info = {'level': 'easy1.json', 'speed': FROG_SPEED, 'pixels': pixels}
+    steps = [[dt]+changes if changes else dt for (dt,changes) in steps]
+    path.write_text(json.dumps({'version': 1, 'info': info, 'steps': steps}))
+    return str(path)
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    """
+    Returns recordings of easy1.json: a solver route, and random keys with pixels
+    """
+    search = solver.Solver(simulation.load_level('easy1.json'))
+    search.solve()
+    route = _record(tmp_path / 'route.json',search.getSteps(search.getFastest()[0]))
+    steps = itertools.islice(batch.random_steps(5),1500)
+    hops = _record(tmp_path / 'random.json',steps,True)
+    return [route,hops]
+
+
+def test_pool_matches_replay(recordings):
+    pooled = []
+    for results in batch.run(['easy1.json'],recordings,workers=2,batchsize=1):
+        pooled.extend(results)
+    pooled.sort(key=lambda result: recordings.index(result['script']))
+    assert [result['level'] for result in pooled] == ['easy1.json']*2
+
+    level = simulation.load_level('easy1.json')
+    for (path,result) in zip(recordings,pooled):
+        serial = batch.simulate(level,path)
+        serial.update(level='easy1.json',script=path)
+        assert result == serial
+
+        sim = simulation.replay(path).getSimulation()
+        assert result['won'] == sim.getWonGame()
+        assert result['time'] == sim.getTime()
+        assert sum(result['deaths']) == FROG_LIVES-sim.getFrogLives()
+    assert pooled[0]['exittime'] is not None
+    assert sum(pooled[0]['deaths']) == 0
+
+
+@pytest.mark.parametrize('option',['--runs=x','--workers=0','--workers=x',
+                                   '--batch=0','--runs=-1','--rnus=3','-h'])
+def test_bad_options(option,capsys):
+    assert batch._main([option,'easy1.json']) == 2
+    out = capsys.readouterr().out
+    assert option in out.splitlines()[0]
+    assert out.splitlines()[1].startswith('usage: python batch.py')
+
+
+def test_pixels_option(capsys):
+    assert batch._main(['--pixels','--runs=2','--workers=1','easy1.json']) == 0
+    assert capsys.readouterr().out.startswith('easy1.json: 2 runs')
@@ -0,0 +1,61 @@
+"""
+Tests for the command line arguments of Froggit
+
+Only the game reads sys.argv (in __main__.py).  Importing consts.py must leave the
+constants alone, so that the other scripts and the tests can have their own options.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import importlib
+import importlib.util
+import os
+import sys
+
+import consts
+
+# The game script, loaded as a module (so that it does not start the game)
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                     '__main__.py')
+_SPEC = importlib.util.spec_from_file_location('froggit',_PATH)
+froggit = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(froggit)
+
+# The constants that the command line can change
+CHANGED = ('DEFAULT_LEVEL','FROG_SPEED','UPDATE_RATE','RECORD_FILE','REPLAY_FILE',
+           'PIXEL_COLLISIONS')
+
+
+def test_import_ignores_argv(monkeypatch):
+    defaults = [getattr(consts,name) for name in CHANGED]
+    monkeypatch.setattr(sys,'argv',['solver.py','easy1.json','0.2','30','--pixels'])
+    try:
+        importlib.reload(consts)
+        assert [getattr(consts,name) for name in CHANGED] == defaults
+    finally:
+        importlib.reload(consts)
+
+
+def test_parse_args(monkeypatch):
+    for name in CHANGED:
+        monkeypatch.setattr(consts,name,getattr(consts,name))
+    froggit.parse_args(['froggit','--record=out.json','easy1','0.5','--pixels','120'])
+    assert consts.DEFAULT_LEVEL == 'easy1.json'
+    assert consts.FROG_SPEED == 0.5
+    assert consts.UPDATE_RATE == 120
+    assert consts.RECORD_FILE == 'out.json'
+    assert consts.REPLAY_FILE is None
+    assert consts.PIXEL_COLLISIONS
+
+
+def test_parse_args_keeps_defaults(monkeypatch):
+    for name in CHANGED:
+        monkeypatch.setattr(consts,name,getattr(consts,name))
+    defaults = [getattr(consts,name) for name in CHANGED]
+    froggit.parse_args(['froggit'])
+    assert [getattr(consts,name) for name in CHANGED] == defaults
+    froggit.parse_args(['froggit','hard.JSON','slow','-1','--replay=in.json'])
+    assert consts.DEFAULT_LEVEL == 'hard.JSON'
+    assert consts.FROG_SPEED == defaults[1]
+    assert consts.UPDATE_RATE == defaults[2]
+    assert consts.REPLAY_FILE == 'in.json'
@@ -0,0 +1,102 @@
+"""
+Tests for the atlas packer of game2d
+
+The packer does not need Kivy, but the game2d package does.  So the module is loaded
+straight from its file.  Every packing is checked for regions that overlap or that
+do not fit on their page.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import importlib.util
+import itertools
+import os
+import shutil
+import pytest
+
+# The atlas module, loaded without the rest of game2d
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SPEC = importlib.util.spec_from_file_location('gatlas',os.path.join(_ROOT,'game2d','gatlas.py'))
+gatlas = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(gatlas)
+
+# The folder with the game images
+IMAGE_FOLDER = os.path.join(_ROOT,'Images')
+
+
+def _check(manifest,folder,padding):
+    """
+    Checks that the regions of a manifest fit on their pages and do not overlap
+
+    Every region is checked with its padding, so the padding of two regions cannot
+    overlap either.
+    """
+    (pagewidth, pageheight) = manifest['pagesize']
+    regions = manifest['images']
+    for (name,(page,x,y,width,height)) in regions.items():
+        assert (width,height) == gatlas.png_size(os.path.join(folder,name))
+        assert 0 <= page < len(manifest['pages'])
+        assert padding <= x and x+width+padding <= pagewidth
+        assert padding <= y and y+height+padding <= pageheight
+
+    listed = [name for page in manifest['pages'] for name in page]
+    assert len(listed) == len(set(listed))
+    for (page,names) in enumerate(manifest['pages']):
+        for name in names:
+            assert regions[name][0] == page
+        for (first,second) in itertools.combinations(names,2):
+            (a, b) = (regions[first], regions[second])
+            apart = (a[1]+a[3]+padding <= b[1]-padding or b[1]+b[3]+padding <= a[1]-padding or
+                     a[2]+a[4]+padding <= b[2]-padding or b[2]+b[4]+padding <= a[2]-padding)
+            assert apart, '%s and %s overlap' % (first,second)
+
+
+def test_game_images_fit_on_one_page():
+    manifest = gatlas.pack_images(IMAGE_FOLDER)
+    _check(manifest,IMAGE_FOLDER,gatlas.ATLAS_PADDING)
+    assert len(manifest['pages']) == 1
+    assert sorted(manifest['images']) == sorted(os.listdir(IMAGE_FOLDER))
+
+
+@pytest.mark.parametrize('pagesize,padding',[(256,0),(256,2),(300,5),(512,1)])
+def test_small_pages(pagesize,padding):
+    manifest = gatlas.pack_images(IMAGE_FOLDER,pagesize=pagesize,padding=padding)
+    _check(manifest,IMAGE_FOLDER,padding)
+    assert len(manifest['pages']) > 1
+    for name in os.listdir(IMAGE_FOLDER):
+        size = gatlas.png_size(os.path.join(IMAGE_FOLDER,name))
+        assert (name in manifest['images']) == (max(size)+2*padding <= pagesize)
+
+
+def test_shelves_are_tallest_first():
+    manifest = gatlas.pack_images(IMAGE_FOLDER,pagesize=512)
+    order = [name for page in manifest['pages'] for name in page]
+    heights = [manifest['images'][name][4] for name in order]
+    assert heights == sorted(heights,reverse=True)
+
+    # A shelf is as tall as its first image, so nothing starts inside a shelf below it
+    for names in manifest['pages']:
+        rows = [manifest['images'][name][2] for name in names]
+        assert rows == sorted(rows)
+
+
+def test_identical_images_share_a_region(tmp_path):
+    for name in ('car1.png','car2.png','truck1.png'):
+        shutil.copy(os.path.join(IMAGE_FOLDER,name),str(tmp_path / name))
+    shutil.copy(os.path.join(IMAGE_FOLDER,'car2.png'),str(tmp_path / 'car3.png'))
+    (tmp_path / 'notes.txt').write_text('not an image')
+
+    manifest = gatlas.pack_images(str(tmp_path))
+    _check(manifest,str(tmp_path),gatlas.ATLAS_PADDING)
+    regions = manifest['images']
+    assert sorted(regions) == ['car1.png','car2.png','car3.png','truck1.png']
+    assert regions['car3.png'] == regions['car2.png']
+    assert sorted(manifest['pages'][0]) == ['car1.png','car2.png','truck1.png']
+
+
+def test_different_images_do_not_share():
+    # No two of the game images have the same contents
+    names = sorted(os.listdir(IMAGE_FOLDER))
+    manifest = gatlas.pack_images(IMAGE_FOLDER,names)
+    spots = [tuple(manifest['images'][name][:3]) for name in names]
+    assert len(set(spots)) == len(names)
@@ -0,0 +1,112 @@
+"""
+Tests for the sound mixer of game2d
+
+The mixer module does not need Kivy, but the game2d package does.  So the module is
+loaded straight from its file, and played through a NullSink with a fake clock.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import importlib.util
+import os
+import wave
+
+import pytest
+
+# The mixer module, loaded without the rest of game2d
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                     'game2d','gmixer.py')
+_SPEC = importlib.util.spec_from_file_location('gmixer',_PATH)
+gmixer = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(gmixer)
+
+
+class Clock(object):
+    """
+    A fake clock for a NullSink, which only moves when the test sets it
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingSink(gmixer.NullSink):
+    """
+    A NullSink that also keeps every voice that it makes, in order
+    """
+
+    def __init__(self,folder,clock):
+        super().__init__(folder,clock)
+        self.voices = []
+
+    def load(self,source):
+        voice = super().load(source)
+        if not voice is None:
+            self.voices.append(voice)
+        return voice
+
+
+@pytest.fixture
+def folder(tmp_path):
+    """
+    Returns a folder with a silent WAV file 'beep.wav' that is one second long
+    """
+    with wave.open(str(tmp_path / 'beep.wav'),'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(8000)
+        file.writeframes(b'\x00\x00'*8000)
+    return tmp_path
+
+
+def test_plays_free_voices_first(folder):
+    clock = Clock()
+    sink = RecordingSink(str(folder),clock)
+    mixer = gmixer.GMixer(sink,3)
+    for time in (0.0,0.1,0.2):
+        clock.now = time
+        assert mixer.play('beep.wav')
+    assert [voice._start for voice in sink.voices] == [0.0,0.1,0.2]
+    assert mixer.stats['steals'] == 0
+    assert mixer.stats['playing'] == 3
+
+
+def test_steals_oldest_voice(folder):
+    clock = Clock()
+    sink = RecordingSink(str(folder),clock)
+    mixer = gmixer.GMixer(sink,2)
+    for time in (0.0,0.1,0.2,0.3,0.4):
+        clock.now = time
+        assert mixer.play('beep.wav')
+    # The voices alternate, since the one that started first is always stolen
+    assert [voice._start for voice in sink.voices] == [0.4,0.3]
+    assert mixer.stats == {'plays': 5, 'steals': 3, 'loads': 1, 'sounds': 1,
+                           'playing': 2}
+    assert sink.log == [('beep.wav',time) for time in (0.0,0.1,0.2,0.3,0.4)]
+
+
+def test_reuses_finished_voice(folder):
+    clock = Clock()
+    sink = RecordingSink(str(folder),clock)
+    mixer = gmixer.GMixer(sink,2)
+    mixer.play('beep.wav')
+    clock.now = 0.5
+    mixer.play('beep.wav')
+    # The first voice has finished, so it is used again instead of stealing
+    clock.now = 1.2
+    mixer.play('beep.wav')
+    assert [voice._start for voice in sink.voices] == [1.2,0.5]
+    assert mixer.stats['steals'] == 0
+    assert mixer.is_playing('beep.wav')
+    clock.now = 5.0
+    assert not mixer.is_playing('beep.wav')
+
+
+def test_missing_file_does_not_play(folder):
+    mixer = gmixer.GMixer(gmixer.NullSink(str(folder),Clock()),2)
+    assert not mixer.play('missing.wav')
+    assert not 'missing.wav' in mixer
+    assert mixer.stats['plays'] == 0
@@ -0,0 +1,231 @@
+"""
+Tests for the graphics objects of game2d
+
+These objects are made of Kivy instructions, so the tests are skipped if Kivy is not
+installed.  No window is needed, as nothing is drawn.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import math
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+pytest.importorskip('kivy')
+from game2d import GRectangle, GBatch
+from game2d.gmode import RELEASE
+
+
+def _boxes(count,seed):
+    """
+    Returns a list of rectangles with random positions, sizes and angles
+    """
+    rand = np.random.RandomState(seed)
+    boxes = []
+    for pos in range(count):
+        boxes.append(GRectangle(x=float(rand.uniform(-50,50)),y=float(rand.uniform(-50,50)),
+                                width=float(rand.uniform(1,20)),height=float(rand.uniform(1,20)),
+                                angle=float(rand.uniform(0,360))))
+    return boxes
+
+
+def _corners(box):
+    """
+    Returns the corners of a rectangle in world coordinates, counter-clockwise
+    """
+    radians = math.radians(box.angle)
+    (c, s) = (math.cos(radians), math.sin(radians))
+    (w, h) = (box.width/2, box.height/2)
+    return [(box.x+c*x-s*y, box.y+s*x+c*y) for (x,y) in ((-w,-h),(w,-h),(w,h),(-w,h))]
+
+
+def _cross(o,a,b):
+    """
+    Returns the cross product of the vectors o->a and o->b
+    """
+    return (a[0]-o[0])*(b[1]-o[1])-(a[1]-o[1])*(b[0]-o[0])
+
+
+def _overlap(poly0,poly1):
+    """
+    Returns True if two convex polygons (counter-clockwise) share a point
+
+    This does not use separating axes.  Two convex polygons meet if an edge of one
+    crosses an edge of the other, or if one of them is inside the other.
+    """
+    def inside(point,poly):
+        return all(_cross(poly[pos-1],poly[pos],point) >= 0 for pos in range(len(poly)))
+
+    def crosses(a,b,c,d):
+        return (min(_cross(a,b,c),_cross(a,b,d)) <= 0 <= max(_cross(a,b,c),_cross(a,b,d)) and
+                min(_cross(c,d,a),_cross(c,d,b)) <= 0 <= max(_cross(c,d,a),_cross(c,d,b)))
+
+    for pos in range(len(poly0)):
+        for other in range(len(poly1)):
+            if crosses(poly0[pos-1],poly0[pos],poly1[other-1],poly1[other]):
+                return True
+    return inside(poly0[0],poly1) or inside(poly1[0],poly0)
+
+
+def _untransform(box,point):
+    """
+    Returns a point in the local coordinates of a rectangle, one step at a time
+
+    This undoes the translation, then the rotation, then the scale, without matrices.
+    """
+    (x, y) = (point[0]-box.x, point[1]-box.y)
+    radians = math.radians(box.angle)
+    (c, s) = (math.cos(radians), math.sin(radians))
+    (x, y) = (c*x+s*y, -s*x+c*y)
+    (sx, sy) = box.scale if type(box.scale) == tuple else (box.scale,box.scale)
+    return (x/sx, y/sy)
+
+
+def test_collides_matches_polygons():
+    boxes = _boxes(60,7)
+    hits = 0
+    for first in range(len(boxes)):
+        for second in range(first+1,len(boxes)):
+            (box0, box1) = (boxes[first], boxes[second])
+            expected = _overlap(_corners(box0),_corners(box1))
+            assert box0.collides(box1) == expected
+            assert box1.collides(box0) == expected
+            hits += expected
+    assert 0 < hits < 60*59/2
+
+
+@pytest.mark.parametrize('angle',[17,30,45,60,123])
+def test_touching_edges_collide(angle):
+    radians = math.radians(angle)
+    (c, s) = (math.cos(radians), math.sin(radians))
+    for (w,h) in ((10,4),(7,3)):
+        box0 = GRectangle(x=1,y=2,width=w,height=h,angle=angle)
+        # Side by side along the rotated x axis, sharing an edge
+        box1 = GRectangle(x=1+w*c,y=2+w*s,width=w,height=h,angle=angle)
+        assert box0.collides(box1) and box1.collides(box0)
+        # Pulled apart along that axis by a hair
+        box1 = GRectangle(x=1+(w+1e-6)*c,y=2+(w+1e-6)*s,width=w,height=h,angle=angle)
+        assert not box0.collides(box1) and not box1.collides(box0)
+
+
+def test_separated_only_along_a_rotated_axis():
+    # Two long thin boxes on parallel diagonals: the bounding boxes overlap a lot
+    box0 = GRectangle(x=0,y=0,width=40,height=2,angle=45)
+    box1 = GRectangle(x=-3,y=3,width=40,height=2,angle=45)
+    (l0,t0,r0,b0) = box0._bbox()
+    (l1,t1,r1,b1) = box1._bbox()
+    assert l1 < r0 and l0 < r1 and b1 < t0 and b0 < t1
+    assert not box0.collides(box1) and not box1.collides(box0)
+
+    # A box turned a multiple of 90 degrees against a rotated one
+    box2 = GRectangle(x=12,y=-12,width=4,height=4,angle=90)
+    assert box2._bbox()[0] < box0._bbox()[2] and box2._bbox()[2] > box0._bbox()[0]
+    assert not box0.collides(box2) and not box2.collides(box0)
+    box2.x = 11
+    box2.y = 11
+    assert box0.collides(box2) and box2.collides(box0)
+
+
+@pytest.mark.parametrize('scale',[1,2.5,(0.5,3)])
+def test_transform_points_matches_each_point(scale):
+    rand = np.random.RandomState(5)
+    points = rand.uniform(-100,100,(40,2))
+    for box in _boxes(10,6):
+        box.scale = scale
+        result = box.transform_points(points)
+        assert result.shape == (40,2)
+        for (point,local) in zip(points,result):
+            assert np.allclose(local,_untransform(box,point))
+            other = box.transform(tuple(point.tolist()))
+            assert np.allclose(local,(other.x,other.y))
+
+
+def test_transform_points_follows_changes():
+    box = GRectangle(x=1,y=2,width=4,height=6,angle=30)
+    points = [(0,0),(5,5),(-3,8)]
+    box.transform_points(points)
+    box.x = 10
+    box.angle = 75
+    box.scale = 2
+    expected = [_untransform(box,point) for point in points]
+    assert np.allclose(box.transform_points(points),expected)
+    assert np.allclose(box.transform_points((5,5)),[expected[1]])
+
+
+def test_batch_moves_the_objects():
+    boxes = _boxes(12,1)
+    batch = GBatch(boxes)
+    start = np.array([(box.x,box.y) for box in boxes])
+    assert np.array_equal(batch.positions,start)
+
+    offsets = np.arange(12,dtype=float)
+    batch.move_by(offsets,-2.5)
+    batch.move_by(dy=1)
+    expected = start+np.column_stack((offsets,np.full(12,-1.5)))
+    assert np.allclose(batch.positions,expected)
+    assert np.allclose([(box.x,box.y) for box in boxes],expected)
+
+
+def test_batch_moves_one_coordinate():
+    boxes = _boxes(6,2)
+    batch = GBatch(boxes)
+    ys = [box.y for box in boxes]
+    batch.move_to(x=np.linspace(0,10,6))
+    assert np.allclose([box.x for box in boxes],np.linspace(0,10,6))
+    assert [box.y for box in boxes] == ys
+    batch.move_to(y=7)
+    assert [box.y for box in boxes] == [7.0]*6
+    assert np.allclose(batch.positions,[(box.x,box.y) for box in boxes])
+
+
+def test_batch_rebuilds_the_matrices():
+    boxes = _boxes(5,3)
+    for box in boxes:
+        box.affine          # Build the matrices before the move
+    batch = GBatch(boxes)
+    batch.move_by(3,-4)
+    for (box,(x,y)) in zip(boxes,batch.positions):
+        assert np.allclose(box.affine[:2,2],(x,y))
+        assert np.allclose(box.transform_points([(x,y)]),[(0,0)])
+
+
+def test_batch_sync():
+    boxes = _boxes(4,4)
+    batch = GBatch(boxes)
+    boxes[2].x = 100
+    boxes[2].y = -100
+    batch.sync()
+    batch.move_by(1,1)
+    assert (boxes[2].x,boxes[2].y) == (101,-99)
+    assert np.allclose(batch.positions,[(box.x,box.y) for box in boxes])
+
+
+@pytest.mark.skipif(RELEASE,reason='release mode does not check values')
+@pytest.mark.parametrize('attribute,value',[('x','1'),('width',-2),('hitbox',(1,2,3)),
+                                            ('scale',(1,)),('fillcolor','nocolor')])
+def test_bad_values_are_caught(attribute,value):
+    box = GRectangle(x=0,y=0,width=4,height=4)
+    with pytest.raises(AssertionError,match='is not'):
+        setattr(box,attribute,value)
+
+
+def test_release_mode_skips_the_checks():
+    # Release mode is chosen on import, so it needs a Python of its own.  A tile needs
+    # a window to make its texture, and it looks for the image from the repository root
+    code = ('from kivy.core.window import Window\n'
+            'from game2d import GRectangle, GTile, GameApp\n'
+            'GameApp.images = "."\n'
+            'box = GRectangle(x=0,y=0,width=4,height=4)\n'
+            'box.width = -2\n'
+            'tile = GTile(x=0,y=0,width=10,height=10,source="Images/grass.png")\n'
+            'assert not hasattr(tile,"__dict__")\n'
+            'print(box.width, sorted(GTile.__slots__))\n')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ,GAME2D_RELEASE='1',KIVY_NO_ARGS='1')
+    result = subprocess.run([sys.executable,'-c',code],cwd=root,env=env,
+                            capture_output=True,text=True,timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split('\n')[-2] == "-2.0 ['_source', '_texture']"
@@ -0,0 +1,109 @@
+"""
+Tests for the PNG decoder of the game2d preloader
+
+The decoder runs in worker threads, so it must not use Kivy.  Its pixels are checked
+against Pillow, for the game images and for every kind of PNG it claims to read.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import io
+import os
+import struct
+import zlib
+import numpy as np
+import pytest
+
+pytest.importorskip('kivy')
+from game2d import gpreload
+
+# The folder with the game images
+IMAGE_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'Images')
+
+
+def _pillow_rgba(data):
+    """
+    Returns the RGBA bytes that Pillow decodes from the given PNG file contents
+    """
+    Image = pytest.importorskip('PIL.Image')
+    with Image.open(io.BytesIO(data)) as image:
+        return (image.width,image.height,image.convert('RGBA').tobytes())
+
+
+@pytest.mark.parametrize('name',sorted(os.listdir(IMAGE_FOLDER)))
+def test_images_match_pillow(name):
+    with open(os.path.join(IMAGE_FOLDER,name),'rb') as file:
+        data = file.read()
+    assert gpreload._decode_png(data) == _pillow_rgba(data)
+
+
+@pytest.mark.parametrize('level',[0,1,6,9])
+@pytest.mark.parametrize('mode',['RGBA','LA','RGB','L','P'])
+def test_modes_match_pillow(mode,level):
+    Image = pytest.importorskip('PIL.Image')
+    rand = np.random.RandomState(7)
+    rgba = rand.randint(0,256,(29,41,4)).astype(np.uint8)
+    image = Image.fromarray(rgba,'RGBA')
+    buffer = io.BytesIO()
+    if mode == 'P':
+        image = image.convert('RGB').quantize(256)
+        image.save(buffer,'PNG',compress_level=level,transparency=bytes([0,128]+[255]*254))
+    else:
+        image.convert(mode).save(buffer,'PNG',compress_level=level)
+    data = buffer.getvalue()
+    assert gpreload._decode_png(data) == _pillow_rgba(data)
+
+
+def _encode(pixels,kind):
+    """
+    Returns the contents of an RGBA PNG file with every row using the given filter
+
+    Pillow picks the filters itself, and it seldom picks Average.  So this encodes the
+    file directly, to be sure every filter is undone properly.
+    """
+    (height,width) = pixels.shape[:2]
+    rows = pixels.reshape(height,width*4).astype(np.int64)
+    above = np.zeros(width*4,dtype=np.int64)
+    raw = b''
+    for row in rows:
+        left = np.concatenate((np.zeros(4,dtype=np.int64),row[:-4]))
+        corner = np.concatenate((np.zeros(4,dtype=np.int64),above[:-4]))
+        if kind == 0:
+            guess = 0
+        elif kind == 1:
+            guess = left
+        elif kind == 2:
+            guess = above
+        elif kind == 3:
+            guess = (left+above)//2
+        else:
+            base = left+above-corner
+            (da, db, dc) = (abs(base-left), abs(base-above), abs(base-corner))
+            guess = np.where((da <= db) & (da <= dc),left,np.where(db <= dc,above,corner))
+        raw += bytes([kind])+((row-guess) & 255).astype(np.uint8).tobytes()
+        above = row
+
+    def chunk(kind,data):
+        return struct.pack('>I',len(data))+kind+data+struct.pack('>I',zlib.crc32(kind+data))
+    header = struct.pack('>IIBBBBB',width,height,8,6,0,0,0)
+    return (b'\x89PNG\r\n\x1a\n'+chunk(b'IHDR',header)+chunk(b'IDAT',zlib.compress(raw))+
+            chunk(b'IEND',b''))
+
+
+@pytest.mark.parametrize('kind',[0,1,2,3,4])
+def test_filters_are_undone(kind):
+    rand = np.random.RandomState(kind)
+    pixels = rand.randint(0,256,(11,13,4)).astype(np.uint8)
+    result = gpreload._decode_png(_encode(pixels,kind))
+    assert result == (13,11,pixels.tobytes())
+
+
+def test_other_files_are_left_to_kivy():
+    assert gpreload._decode_png(b'GIF89a') is None
+    Image = pytest.importorskip('PIL.Image')
+    buffer = io.BytesIO()
+    Image.new('RGBA',(8,8)).save(buffer,'PNG',optimize=False)
+    data = bytearray(buffer.getvalue())
+    data[24] = 16   # Claim 16 bits per channel
+    assert gpreload._decode_png(bytes(data)) is None
@@ -0,0 +1,57 @@
+"""
+Tests for the fixed-step loop arithmetic of game2d
+
+The module is loaded straight from its file, since the game2d package needs Kivy.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import importlib.util
+import os
+import random
+
+import pytest
+
+# The fixed-step module, loaded without the rest of game2d
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                     'game2d','gstep.py')
+_SPEC = importlib.util.spec_from_file_location('gstep',_PATH)
+gstep = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(gstep)
+
+
+def test_short_frame_runs_no_update():
+    (steps,left,alpha) = gstep.fixed_steps(0.004,1/120,8)
+    assert steps == 0
+    assert left == 0.004
+    assert alpha == pytest.approx(0.48)
+
+
+def test_frame_runs_whole_steps():
+    assert gstep.fixed_steps(0.625,0.25,8) == (2,0.125,0.5)
+    assert gstep.fixed_steps(0.75,0.25,8) == (3,0.0,0.0)
+
+
+def test_long_frame_is_clamped():
+    (steps,left,alpha) = gstep.fixed_steps(1.0+0.0025,0.01,8)
+    # Only 8 of the 100 steps run, and the other 92 are dropped
+    assert steps == 8
+    assert left == pytest.approx(0.0025)
+    assert alpha == pytest.approx(0.25)
+
+
+def test_many_frames_keep_time():
+    rand = random.Random(3)
+    frames = [rand.uniform(0,0.03) for frame in range(5000)]
+    (timestep,maxsteps) = (1/120,4)
+    accumulator = 0.0
+    total = 0
+    for dt in frames:
+        (steps,accumulator,alpha) = gstep.fixed_steps(accumulator+dt,timestep,maxsteps)
+        assert 0 <= steps <= maxsteps
+        assert 0 <= accumulator < timestep
+        assert 0 <= alpha < 1
+        assert alpha == pytest.approx(accumulator/timestep)
+        total += steps
+    # No frame is longer than maxsteps allow, so no time is dropped
+    assert total*timestep+accumulator == pytest.approx(sum(frames))
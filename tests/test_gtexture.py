@@ -0,0 +1,128 @@
+"""
+Tests for the texture cache of game2d
+
+The texture module does not need Kivy, but the game2d package does.  So the module
+is loaded straight from its file, and the cache is given fake textures.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import gc
+import importlib.util
+import os
+
+# The texture module, loaded without the rest of game2d
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                     'game2d','gtexture.py')
+_SPEC = importlib.util.spec_from_file_location('gtexture',_PATH)
+gtexture = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(gtexture)
+
+
+class Texture(object):
+    """
+    A fake texture, which only knows its file name
+    """
+
+    def __init__(self,name):
+        self.name = name
+
+
+class Owner(object):
+    """
+    A fake drawable, which can hold a texture
+    """
+    pass
+
+
+def _loader(sizes):
+    """
+    Returns a loader for a cache, with the given size in bytes for each file
+
+    Files that are not in sizes cannot be loaded.  The loader also keeps a list of
+    every file that it loads, in order, as its attribute calls.
+    """
+    def load(name):
+        load.calls.append(name)
+        if not name in sizes:
+            return None
+        return (Texture(name),sizes[name])
+    load.calls = []
+    return load
+
+
+def test_unused_textures_are_evicted_oldest_first():
+    load = _loader({'a': 40, 'b': 40, 'c': 40, 'd': 40})
+    cache = gtexture.GTextureCache(load,100)
+    cache.get('a')
+    cache.get('b')
+    cache.get('a')      # Now b is the least recently used
+    cache.get('c')
+    assert not 'b' in cache
+    assert list(cache._entries) == ['a','c']
+    cache.get('d')
+    assert list(cache._entries) == ['c','d']
+    assert cache.stats == {'hits': 1, 'misses': 4, 'evictions': 2, 'textures': 2,
+                           'held': 0, 'bytes': 80}
+    assert cache.resident == 80
+
+
+def test_held_textures_survive_the_budget():
+    load = _loader({'a': 60, 'b': 60, 'c': 60})
+    cache = gtexture.GTextureCache(load,100)
+    first = Owner()
+    second = Owner()
+    assert cache.hold(first,'a').name == 'a'
+    assert cache.hold(second,'b').name == 'b'
+    # Both are pinned, so the cache goes over its budget instead of dropping them
+    assert cache.resident == 120
+    assert 'a' in cache and 'b' in cache
+
+    cache.get('c')
+    assert not 'c' in cache
+    assert cache.stats['evictions'] == 1
+    assert cache.stats['held'] == 2
+
+    # Holding another texture releases the old one, which may then be dropped
+    cache.hold(first,'b')
+    assert not 'a' in cache
+    assert cache._entries['b'][2] == 2
+
+
+def test_released_texture_is_kept_until_needed():
+    load = _loader({'a': 60, 'b': 60})
+    cache = gtexture.GTextureCache(load,100)
+    owner = Owner()
+    cache.hold(owner,'a')
+    cache.release('a')
+    assert 'a' in cache
+    cache.get('b')
+    assert not 'a' in cache
+    assert load.calls == ['a','b']
+
+
+def test_garbage_collected_owner_releases_texture():
+    load = _loader({'a': 60, 'b': 60})
+    cache = gtexture.GTextureCache(load,100)
+    owner = Owner()
+    cache.hold(owner,'a')
+    cache.get('b')
+    assert 'a' in cache and not 'b' in cache
+
+    del owner
+    gc.collect()
+    assert cache.stats['held'] == 0
+    assert cache._owners == {}
+    cache.get('b')
+    assert list(cache._entries) == ['b']
+
+
+def test_lowering_budget_evicts():
+    load = _loader({'a': 30, 'b': 30, 'c': 30})
+    cache = gtexture.GTextureCache(load,100)
+    for name in ('a','b','c'):
+        cache.get(name)
+    cache.budget = 40
+    assert list(cache._entries) == ['c']
+    assert cache.get('missing') is None
+    assert cache.stats['misses'] == 4
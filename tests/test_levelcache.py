@@ -0,0 +1,221 @@
+"""
+Tests for the compiled level cache and the object types of Froggit
+
+The cache tests work on a copy of the JSON folder, so they never touch the real
+Cache folder.  The object types are checked against OBJECT_DATA, and the alpha
+reader for the collision masks is checked against Pillow, when it is installed.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import levelcache
+import simulation
+from consts import *
+
+
+@pytest.fixture
+def folder(tmp_path,monkeypatch):
+    """
+    Returns a copy of the JSON folder (with easy1.json) that the cache reads from
+    """
+    folder = tmp_path / 'JSON'
+    folder.mkdir()
+    for name in ('easy1.json',OBJECT_DATA):
+        shutil.copy(os.path.join(levelcache.JSON_FOLDER,name),str(folder / name))
+    monkeypatch.setattr(levelcache,'JSON_FOLDER',str(folder))
+    monkeypatch.setattr(levelcache,'CACHE_FOLDER',str(tmp_path / 'Cache'))
+    monkeypatch.setattr(levelcache,'_OBJECTS_HASH',None)
+    return folder
+
+
+def _cache(folder):
+    """
+    Returns the path of the compiled copy of easy1.json in the given folder
+    """
+    return os.path.join(str(folder.parent),'Cache','easy1.lvl')
+
+
+def _age(path):
+    """
+    Sets the time stamp of a file far in the past, to see if it is written again
+    """
+    os.utime(path,ns=(10**9,10**9))
+
+
+def _isAged(path):
+    """
+    Returns True if a file still has the time stamp set by _age
+    """
+    return os.stat(path).st_mtime_ns == 10**9
+
+
+def _same(first,second):
+    """
+    Returns True if two compiled levels have the same contents
+    """
+    if (first.getSize(),first.getStart(),first.getOffscreen()) != \
+       (second.getSize(),second.getStart(),second.getOffscreen()):
+        return False
+    if first.getLaneCount() != second.getLaneCount():
+        return False
+    for lane in range(first.getLaneCount()):
+        if (first.getLaneType(lane) != second.getLaneType(lane) or
+            first.getLaneSpeed(lane) != second.getLaneSpeed(lane) or
+            list(first.getObjectTypes(lane)) != list(second.getObjectTypes(lane)) or
+            not np.array_equal(first.getObjectPositions(lane),
+                               second.getObjectPositions(lane))):
+            return False
+    return True
+
+
+def test_cache_round_trip(folder):
+    compiled = levelcache.compile_level(levelcache.load_json('easy1.json'))
+    level = levelcache.load_level('easy1.json')
+    assert os.path.isfile(_cache(folder))
+    assert _same(level,compiled)
+
+    _age(_cache(folder))
+    again = levelcache.load_level('easy1.json')
+    assert _isAged(_cache(folder))
+    assert _same(again,compiled)
+
+
+def test_cache_trusts_same_contents(folder):
+    levelcache.load_level('easy1.json')
+    _age(_cache(folder))
+    os.utime(str(folder / 'easy1.json'))
+    assert levelcache.load_level('easy1.json') is not None
+    assert _isAged(_cache(folder))
+
+
+def test_cache_remade_when_level_changes(folder):
+    levelcache.load_level('easy1.json')
+    data = levelcache.load_json('easy1.json')
+    data['lanes'][1]['speed'] = 123
+    (folder / 'easy1.json').write_text(json.dumps(data))
+    level = levelcache.load_level('easy1.json')
+    assert level.getLaneSpeed(1) == 123
+    assert levelcache._readCache(_cache(folder))[1].getLaneSpeed(1) == 123
+
+
+def test_cache_remade_when_objects_change(folder,monkeypatch):
+    levelcache.load_level('easy1.json')
+    _age(_cache(folder))
+    with open(str(folder / OBJECT_DATA),'a') as file:
+        file.write('\n')
+    monkeypatch.setattr(levelcache,'_OBJECTS_HASH',None)
+    assert levelcache.load_level('easy1.json') is not None
+    assert not _isAged(_cache(folder))
+    header = levelcache._readCache(_cache(folder))[0]
+    assert header['source']['objects'] == levelcache._objectsHash()
+
+
+def test_cache_remade_when_rules_change(folder,monkeypatch):
+    levelcache.load_level('easy1.json')
+    _age(_cache(folder))
+    monkeypatch.setattr(levelcache,'LEVEL_RULES',levelcache.LEVEL_RULES+1)
+    assert levelcache.load_level('easy1.json') is not None
+    assert not _isAged(_cache(folder))
+    header = levelcache._readCache(_cache(folder))[0]
+    assert header['source']['rules'] == levelcache.LEVEL_RULES
+
+
+def test_cache_remade_for_old_version(folder):
+    levelcache.load_level('easy1.json')
+    magic = levelcache.CACHE_MAGIC
+    with open(_cache(folder),'r+b') as file:
+        file.write(magic[:-1]+bytes([magic[-1]-1]))
+    _age(_cache(folder))
+    assert levelcache._readCache(_cache(folder)) is None
+    assert levelcache.load_level('easy1.json') is not None
+    assert levelcache._readCache(_cache(folder)) is not None
+
+
+def test_invalid_level_is_not_cached(folder):
+    data = levelcache.load_json('easy1.json')
+    data['lanes'][1]['objects'][0]['type'] = 'spaceship'
+    (folder / 'easy1.json').write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        levelcache.compile_level(data)
+    assert levelcache.load_level('easy1.json') is None
+    assert not os.path.exists(_cache(folder))
+
+
+def test_object_types_are_shared():
+    images = levelcache.object_data()['images']
+    for name in images:
+        kind = levelcache.object_type(name)
+        assert kind is levelcache.object_type(name)
+        assert kind.getFile() == images[name]['file']
+        assert kind.getSize() == tuple(images[name]['size'])
+        assert kind.getHitbox() == tuple(images[name].get('hitbox',(0,0,0,0)))
+    assert levelcache.object_type('spaceship') is None
+
+
+def test_lanes_share_object_types():
+    sim = simulation.Simulation(levelcache.load_level('complete.json'))
+    for lane in sim.getLanes():
+        for (name,kind) in zip(lane.getTypes(),lane.getKinds()):
+            assert kind is levelcache.object_type(name)
+
+
+def test_objects_must_match_lane():
+    data = levelcache.load_json('easy1.json')
+    data['lanes'][1]['objects'][0]['type'] = 'log1'
+    problems = levelcache.check_level(data)
+    assert [path for (path,message) in problems] == [('lanes',1,'objects',0,'type')]
+    assert 'cannot have an object' in problems[0][1]
+
+
+@pytest.mark.parametrize('name',sorted(os.listdir(levelcache.IMAGE_FOLDER)))
+def test_alpha_matches_pillow(name):
+    Image = pytest.importorskip('PIL.Image')
+    path = os.path.join(levelcache.IMAGE_FOLDER,name)
+    alpha = levelcache._readAlpha(path)
+    assert alpha is not None
+    with Image.open(path) as image:
+        expected = np.asarray(image.convert('RGBA'))[:,:,3]
+    assert np.array_equal(alpha,expected)
+
+
+@pytest.mark.parametrize('mode',['RGBA','LA','RGB','L','P'])
+def test_alpha_matches_pillow_for_modes(mode,tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    rand = np.random.RandomState(5)
+    rgba = rand.randint(0,256,(37,53,4)).astype(np.uint8)
+    rgba[:,:20,3] = np.arange(20,dtype=np.uint8)*12
+    image = Image.fromarray(rgba,'RGBA')
+    if mode == 'P':
+        image = image.convert('RGB').quantize(256)
+        image.info['transparency'] = bytes([0,128]+[255]*254)
+    else:
+        image = image.convert(mode)
+    path = str(tmp_path / 'image.png')
+    image.save(path)
+
+    with Image.open(path) as saved:
+        expected = np.asarray(saved.convert('RGBA'))[:,:,3]
+    assert np.array_equal(levelcache._readAlpha(path),expected)
+
+
+def test_alpha_rejects_other_files(tmp_path):
+    path = tmp_path / 'image.png'
+    path.write_bytes(b'not a png file')
+    assert levelcache._readAlpha(str(path)) is None
+    assert levelcache._readAlpha(str(tmp_path / 'missing.png')) is None
+
+
+def test_mask_matches_alpha():
+    mask = levelcache.object_mask('car1')
+    alpha = levelcache._readAlpha(os.path.join(levelcache.IMAGE_FOLDER,'car1.png'))
+    assert (mask.getHeight(),mask.getWidth()) == alpha.shape
+    bits = np.unpackbits(mask.getBits(),axis=1)[:,:mask.getWidth()]
+    assert np.array_equal(bits.astype(bool),alpha >= MASK_ALPHA)
+    assert mask is levelcache.object_mask('car1')
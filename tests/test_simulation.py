@@ -0,0 +1,273 @@
+"""
+Tests for the headless simulation of Froggit
+
+These check that replaying a recording is deterministic, and that the closed form
+positions of the obstacles (positionsAt) agree with moving them frame by frame.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import json
+import random
+
+import numpy as np
+import pytest
+
+import simulation
+from consts import *
+
+# The levels to test (every valid level in the JSON folder)
+LEVELS = ['easy1.json','easy2.json','multihedge.json','roadsonly.json',
+          'bigones.json','complete.json']
+
+
+def _play(level,seed,frames=3000,pixels=False):
+    """
+    Returns the pair (session,steps) after playing random keys on a level
+
+    The steps are in the format saved by GInput, so they can be written to a file
+    and played back with simulation.replay.
+
+    Parameter level: The level file to play
+    Precondition: level is a string naming a level in the JSON folder
+
+    Parameter seed: The seed for the random keys and frame times
+    Precondition: seed is an int
+
+    Parameter pixels: Whether collisions use pixels
+    Precondition: pixels is a bool
+    """
+    rand = random.Random(seed)
+    session = simulation.Session(simulation.load_level(level),FROG_SPEED,pixels)
+    keys = simulation.ScriptedInput()
+    steps = []
+    for frame in range(frames):
+        changes = []
+        if rand.random() < 0.1:
+            key = rand.choice('wasd')
+            changes.append(('-' if keys.is_key_down(key) else '+')+key)
+        keys.apply(changes)
+        dt = rand.uniform(0.01,0.03)
+        session.update(dt,keys)
+        steps.append([dt]+changes if changes else dt)
+    return (session,steps)
+
+
+def _state(session):
+    """
+    Returns everything about a session that a replay has to reproduce
+    """
+    sim = session.getSimulation()
+    frog = sim.getFrog()
+    xs = [lane.getXs().tolist() for lane in sim.getLanes()]
+    safe = [list(lane.getListofSafe()) for lane in sim.getLanes()]
+    return (session.getState(),sim.getTime(),sim.getFrogLives(),frog.x,frog.y,
+            frog.angle,xs,safe)
+
+
+@pytest.mark.parametrize('level',LEVELS)
+def test_replay_is_deterministic(level,tmp_path):
+    (session,steps) = _play(level,LEVELS.index(level))
+    path = tmp_path / 'recording.json'
+    info = {'level': level, 'speed': FROG_SPEED}
+    path.write_text(json.dumps({'version': 1, 'info': info, 'steps': steps}))
+
+    first = simulation.replay(str(path))
+    second = simulation.replay(str(path))
+    assert _state(first) == _state(session)
+    assert _state(second) == _state(session)
+
+
+def test_replay_keeps_pixels(tmp_path):
+    (session,steps) = _play('complete.json',3,pixels=True)
+    path = tmp_path / 'recording.json'
+    info = {'level': 'complete.json', 'speed': FROG_SPEED, 'pixels': True}
+    path.write_text(json.dumps({'version': 1, 'info': info, 'steps': steps}))
+    assert _state(simulation.replay(str(path))) == _state(session)
+
+
+def test_recording_defaults(tmp_path,monkeypatch):
+    path = tmp_path / 'recording.json'
+    path.write_text(json.dumps({'version': 1, 'info': {'level': 'easy1.json'},
+                                'steps': [0.1,[0.1,'+s']]}))
+    monkeypatch.setattr(simulation,'PIXEL_COLLISIONS',True)
+    (info,steps) = simulation.load_recording(str(path))
+    assert info == {'level': 'easy1.json', 'speed': FROG_SPEED, 'pixels': True}
+    assert steps == [(0.1,[]),(0.1,['+s'])]
+
+
+@pytest.mark.parametrize('level',LEVELS)
+def test_positions_match_stepping(level):
+    sim = simulation.Simulation(simulation.load_level(level))
+    rand = random.Random(7)
+    moved = [lane.getXs().copy() for lane in sim.getLanes()]
+    keys = simulation.ScriptedInput()
+    time = 0.0
+    for frame in range(2000):
+        dt = rand.uniform(0.005,0.05)
+        sim.update(dt,keys)
+        time += dt
+        # Move the obstacles the slow way, wrapping them at the offscreen buffer
+        for (lane,xs) in zip(sim.getLanes(),moved):
+            limit = lane.getBuffer()*GRID_SIZE
+            xs += lane.getSpeed()*dt
+            xs[xs > sim.getWidth()+limit] -= sim.getWidth()+2*limit
+            xs[xs < -limit] += sim.getWidth()+2*limit
+
+    before = [lane.getXs().copy() for lane in sim.getLanes()]
+    expected = sim.positionsAt(time)
+    for (lane,xs,stepped,old) in zip(sim.getLanes(),expected,moved,before):
+        assert np.allclose(xs,lane.getXs())
+        assert np.allclose(xs,stepped,atol=1e-6)
+        assert np.array_equal(lane.getXs(),old)
+
+
+def test_seek_matches_positions():
+    sim = simulation.Simulation(simulation.load_level('complete.json'))
+    expected = sim.positionsAt(1234.5)
+    sim.seek(1234.5)
+    for (lane,xs) in zip(sim.getLanes(),expected):
+        assert np.array_equal(lane.getXs(),xs)
+
+
+def _isOccupied(lane,column,row,time):
+    """
+    Returns True if an obstacle covers a grid square at the given time, the slow way
+
+    This is the definition used by LaneState.getOccupancy, checked one obstacle at a
+    time with the functions bbox, overlaps and contains.
+    """
+    x = column*GRID_SIZE + GRID_SIZE/2
+    y = row*GRID_SIZE + GRID_SIZE/2
+    frog = simulation.object_type('frog')
+    (width,height) = frog.getSize()
+    box = simulation.bbox(x,y,width,height,FROG_NORTH,frog.getHitbox())
+    xs = lane.positionsAt(time)
+    for (pos,kind) in zip(xs.tolist(),lane.getKinds()):
+        (w,h) = kind.getSize()
+        other = simulation.bbox(pos,lane.getCenter(),w,h,lane.getAngle(),kind.getHitbox())
+        if lane.getType() == 'road' and simulation.overlaps(box,other):
+            return True
+        if lane.getType() == 'water' and simulation.contains(other,(x,y)):
+            return True
+    return False
+
+
+@pytest.mark.parametrize('level',LEVELS)
+def test_occupancy_matches_overlaps(level):
+    sim = simulation.Simulation(simulation.load_level(level))
+    columns = int(sim.getWidth()//GRID_SIZE)
+    rand = random.Random(11)
+    for lane in sim.getLanes():
+        period = lane.getPeriod()
+        slices = 1 if period is None else len(lane.getOccupancy(lane.getRow()))
+        picks = [0,1,slices-1]+[rand.randrange(slices) for pos in range(12)]
+        for row in range(max(0,lane.getRow()-3),lane.getRow()+4):
+            for pick in picks:
+                time = pick*OCCUPANCY_STEP
+                expected = [_isOccupied(lane,column,row,time) for column in range(columns)]
+                # The same slice in later loops of the lane gives the same answer
+                for loop in (0,1,7):
+                    later = time if period is None else time+loop*period
+                    found = [lane.isOccupied(column,row,later) for column in range(columns)]
+                    assert found == expected, (lane.getRow(),row,pick,loop)
+
+
+@pytest.mark.parametrize('level',LEVELS)
+def test_occupancy_wraps_at_period(level):
+    sim = simulation.Simulation(simulation.load_level(level))
+    columns = int(sim.getWidth()//GRID_SIZE)
+    for lane in sim.getLanes():
+        period = lane.getPeriod()
+        if period is None:
+            continue
+        row = lane.getRow()
+        slices = len(lane.getOccupancy(row))
+        assert slices == int(np.ceil(period/OCCUPANCY_STEP))
+        # The start of the next loop counts as a slice at the time period
+        starts = [pick*OCCUPANCY_STEP for pick in range(slices)]+[period]
+        for offset in (-0.6,-0.45,-0.25,0,0.25,0.45):
+            for loop in (1,2,9):
+                time = loop*period+offset*OCCUPANCY_STEP
+                phase = time-(loop-1)*period if offset < 0 else offset*OCCUPANCY_STEP
+                nearest = min(starts,key=lambda start: abs(start-phase))
+                assert abs(nearest-phase) <= OCCUPANCY_STEP/2
+                nearest = 0 if nearest == period else nearest
+                expected = [_isOccupied(lane,column,row,nearest) for column in range(columns)]
+                found = [lane.isOccupied(column,row,time) for column in range(columns)]
+                assert found == expected, (lane.getRow(),offset,loop)
+
+
+def _frogBoxes(sim,rand):
+    """
+    Returns a list of frog boxes spread over a level, in every direction
+
+    Half of the boxes are centered on a row boundary, so they straddle two rows.
+    """
+    frog = simulation.object_type('frog')
+    (width,height) = frog.getSize()
+    boxes = []
+    rows = int(sim.getHeight()//GRID_SIZE)
+    for row in range(rows):
+        for y in (row*GRID_SIZE+GRID_SIZE/2,row*GRID_SIZE):
+            for angle in (0,90,180,270):
+                x = rand.uniform(-GRID_SIZE,sim.getWidth()+GRID_SIZE)
+                boxes.append(simulation.bbox(x,y,width,height,angle,frog.getHitbox()))
+    return boxes
+
+
+def _obstacleBoxes(lane):
+    """
+    Returns the box of every obstacle in a lane, one at a time with bbox
+    """
+    boxes = []
+    for (x,kind) in zip(lane.getXs().tolist(),lane.getKinds()):
+        (width,height) = kind.getSize()
+        boxes.append(simulation.bbox(x,lane.getCenter(),width,height,lane.getAngle(),
+                                     kind.getHitbox()))
+    return boxes
+
+
+@pytest.mark.parametrize('level',LEVELS)
+def test_lane_collisions_match_overlaps(level):
+    sim = simulation.Simulation(simulation.load_level(level))
+    rand = random.Random(13)
+    for time in (0,rand.uniform(0,100),rand.uniform(100,1000)):
+        sim.seek(time)
+        boxes = _frogBoxes(sim,rand)
+        for lane in sim.getLanes():
+            others = _obstacleBoxes(lane)
+            for box in boxes:
+                expected = [num for num in range(len(others))
+                            if simulation.overlaps(box,others[num])]
+                assert lane.collisions(box).tolist() == expected
+                point = ((box[0]+box[2])/2,(box[1]+box[3])/2)
+                expected = [num for num in range(len(others))
+                            if simulation.contains(others[num],point)]
+                assert lane.containing(point).tolist() == expected
+
+
+@pytest.mark.parametrize('level',LEVELS)
+def test_lanes_near_match_all_lanes(level):
+    sim = simulation.Simulation(simulation.load_level(level))
+    rand = random.Random(17)
+    for time in (0,rand.uniform(0,100)):
+        sim.seek(time)
+        for box in _frogBoxes(sim,rand):
+            near = sim.getLanesNear(box)
+            assert [lane.getRow() for lane in near] == \
+                   sorted(set(lane.getRow() for lane in near))
+
+            # Every lane that the box touches, checked against all lanes
+            touched = [lane for lane in sim.getLanes()
+                       if simulation.overlaps(box,lane.getBox()) or
+                       any(simulation.overlaps(box,other) for other in _obstacleBoxes(lane))]
+            for lane in touched:
+                assert lane in near
+
+            # And only the lanes that reach the rows of the box inside the level
+            (lo,hi) = simulation.rows_touching(box[3],box[1])
+            (lo,hi) = (max(lo,0),min(hi,len(sim.getLanes())-1))
+            reaching = [lane for lane in sim.getLanes() if lo <= hi and
+                        lane.getReach()[0] <= hi and lo <= lane.getReach()[1]]
+            assert near == reaching
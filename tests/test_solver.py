@@ -0,0 +1,39 @@
+"""
+Tests for the level solver of Froggit
+
+Every route that the solver finds is played in a headless Session.  The frog has
+to reach the exit of the route, without losing a life.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import pytest
+
+import simulation
+import solver
+
+# The levels to test (every valid level in the JSON folder)
+LEVELS = ['easy1.json','easy2.json','multihedge.json','roadsonly.json',
+          'bigones.json','complete.json']
+
+
+@pytest.mark.parametrize('level',LEVELS)
+def test_routes_reach_exits(level):
+    data = simulation.load_json(level)
+    search = solver.Solver(data)
+    search.solve()
+    assert search.isWinnable()
+
+    for (exit,(route,time)) in search.getRoutes().items():
+        session = simulation.Session(data)
+        keys = simulation.ScriptedInput()
+        for (dt,changes) in search.getSteps(route):
+            keys.apply(changes)
+            session.update(dt,keys)
+
+        sim = session.getSimulation()
+        lane = sim.getLanes()[exit[0]]
+        assert sim.getFrogLives() == 3
+        assert len(lane.getListofSafe()) == 1
+        assert exit[1] in lane.containing(lane.getListofSafe()[0]).tolist()
+        assert sim.getTime() == pytest.approx(time,abs=0.05)
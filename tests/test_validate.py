@@ -0,0 +1,103 @@
+"""
+Tests for the level validator of Froggit
+
+These pin the line and column that validate_file reports for each kind of problem,
+and check the command line options of the validator.  No level is compiled.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+import json
+import os
+
+import pytest
+
+import validate
+from consts import *
+
+
+def _write(tmp_path,data):
+    """
+    Returns the pair (path,text) after writing a level to a file, one value a line
+    """
+    text = json.dumps(data,indent=2)
+    path = tmp_path / 'level.json'
+    path.write_text(text)
+    return (str(path),text)
+
+
+def _position(text,offset):
+    """
+    Returns the (line,column) of an offset in text, counting from 1
+    """
+    line = text.count('\n',0,offset)+1
+    return (line,offset-(text.rfind('\n',0,offset)+1)+1)
+
+
+def _value(text,key):
+    """
+    Returns the (line,column) of the value for the first appearance of a key in text
+    """
+    return _position(text,text.index('"%s": ' % key)+len(key)+4)
+
+
+def test_syntax_error_location():
+    path = os.path.join(validate.JSON_FOLDER,'error1.json')
+    assert validate.validate_file(path,False) == [(68,2,'Expecting value')]
+
+
+def test_missing_key_location():
+    path = os.path.join(validate.JSON_FOLDER,'error2.json')
+    assert validate.validate_file(path,False) == [(1,1,"the level has no 'start'")]
+
+
+def test_unknown_object_type(tmp_path):
+    data = validate.load_json('easy1.json')
+    data['lanes'][3]['objects'][1]['type'] = 'spaceship'
+    (path,text) = _write(tmp_path,data)
+    where = _position(text,text.index('"spaceship"'))
+    assert validate.validate_file(path,False) == \
+           [where+("lane 3 has an unknown object type 'spaceship'",)]
+
+
+def test_overlapping_obstacles(tmp_path):
+    data = validate.load_json('easy1.json')
+    objects = data['lanes'][3]['objects']
+    objects[1]['position'] = objects[0]['position']
+    (path,text) = _write(tmp_path,data)
+    # The problem is at the start of the second object (the car5)
+    where = _position(text,text.rfind('{',0,text.index('"car5"')))
+    assert validate.validate_file(path,False) == \
+           [where+('lane 3 has objects 0 and 1 that overlap',)]
+
+
+def test_start_errors(tmp_path):
+    data = validate.load_json('easy1.json')
+    data['start'] = [5,1]
+    (path,text) = _write(tmp_path,data)
+    assert validate.validate_file(path,False) == \
+           [_value(text,'start')+('the start [5, 1] is on a road lane, not grass',)]
+
+    data['start'] = [11,0]
+    (path,text) = _write(tmp_path,data)
+    assert validate.validate_file(path,False) == \
+           [_value(text,'start')+('the start [11, 0] is outside of the level',)]
+
+
+def test_exit_errors(tmp_path):
+    data = validate.load_json('easy1.json')
+    for lane in data['lanes']:
+        lane['objects'] = [obj for obj in lane.get('objects',[])
+                           if not validate.object_type(obj['type']).isGoal()]
+    (path,text) = _write(tmp_path,data)
+    assert validate.validate_file(path,False) == \
+           [_value(text,'lanes')+('the level has no exits',)]
+
+
+@pytest.mark.parametrize('option',['--workers=0','--workers=x','--workers=-2',
+                                   '--wokers=4','--help'])
+def test_bad_options(option,capsys):
+    assert validate._main([option]) == 2
+    out = capsys.readouterr().out
+    assert option in out.splitlines()[0]
+    assert out.splitlines()[1].startswith('usage: python validate.py')
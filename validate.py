@@ -0,0 +1,240 @@
+"""
+Level validator for Froggit
+
+This module checks level files before they are played.  A level with a mistake in it
+is not found until the game tries to load it, and then all the game can say is that
+the level did not load.  This checks every file for JSON syntax errors and for all of
+the problems found by check_level in levelcache.py, and reports each one with the
+line and column where it is.  Files with no problems are compiled into the Cache
+folder in the same pass, so the game never has to parse them.  The files are checked
+by a pool of worker processes.
+
+To check every level in the JSON folder, type
+
+    python validate.py
+
+You can also give other folders or level files on the command line.  Every problem
+is printed as file:line:column: message, and the exit status is 1 if any file has a
+problem.
+
+Nicholas J. Runje (njr85)
+18 October 2026
+"""
+from consts import *
+from levelcache import *
+import concurrent.futures
+import multiprocessing
+import bisect
+import json
+import re
+import sys
+import os
+
+# PRIMARY RULE: The validator is only allowed to access levelcache.py (and consts.py).
+# Like the simulation, it must never import game2d or Kivy.
+
+# A JSON number, as in the JSON standard
+_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?')
+# The white space allowed between JSON tokens
+_SPACE = re.compile(r'[ \t\n\r]*')
+# The other JSON values (the last three are allowed by the json module)
+_LITERALS = ('true','false','null','NaN','Infinity','-Infinity')
+
+
+def validate_file(path,save=True):
+    """
+    Returns the list of problems with a level file
+
+    Each problem is a triple (line,column,message), where the line and column start
+    at 1.  They are both None for a problem that is not at any one place, such as a
+    file that cannot be read.  If the file has no problems and save is True, the
+    compiled level is saved in the Cache folder next to the folder of the file.
+
+    Parameter path: The path to the level file
+    Precondition: path is a string
+
+    Parameter save: Whether to compile the file if it is valid
+    Precondition: save is a bool
+    """
+    try:
+        with open(path,encoding='utf-8') as file:
+            text = file.read()
+    except (OSError,UnicodeDecodeError) as e:
+        return [(None,None,'the file cannot be read (%s)' % e)]
+
+    try:
+        json_dict = json.loads(text)
+    except json.JSONDecodeError as e:
+        return [(e.lineno,e.colno,e.msg)]
+
+    problems = check_level(json_dict)
+    if problems == []:
+        if save and not save_level(path,compile_level(json_dict)):
+            return [(None,None,'the compiled level cannot be saved')]
+        return []
+
+    positions = locate(text)
+    result = []
+    for (where,message) in problems:
+        while not where in positions:
+            where = where[:-1]
+        result.append(positions[where]+(message,))
+    return result
+
+
+def locate(text):
+    """
+    Returns a dictionary giving the position of every value in a JSON text
+
+    The keys are paths, as in check_level: tuples of the keys and list indices that
+    lead to a value, with the empty tuple for the whole text.  The values are pairs
+    (line,column) of where the value starts, counting from 1.
+
+    Parameter text: The JSON text
+    Precondition: text is a string that json.loads accepts
+    """
+    offsets = {}
+    _locateValue(text,0,(),offsets)
+
+    starts = [0]+[match.end() for match in re.finditer('\n',text)]
+    result = {}
+    for (path,offset) in offsets.items():
+        line = bisect.bisect_right(starts,offset)
+        result[path] = (line,offset-starts[line-1]+1)
+    return result
+
+
+def run(paths,workers=None,save=True):
+    """
+    Yields the pair (path,problems) for every level file, in order
+
+    The files are checked (and compiled) by a pool of worker processes.  The problems
+    are as returned by validate_file.
+
+    Parameter paths: The level files to check
+    Precondition: paths is a list of strings
+
+    Parameter workers: The number of worker processes, or None for one per core
+    Precondition: workers is an int > 0 or None
+
+    Parameter save: Whether to compile the files that are valid
+    Precondition: save is a bool
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+        mp_context=context) as pool:
+        results = pool.map(validate_file,paths,[save]*len(paths))
+        for (path,problems) in zip(paths,results):
+            yield (path,problems)
+
+
+def _locateValue(text,offset,path,offsets):
+    """
+    Records the offset of a JSON value and everything in it, returning where it ends
+
+    Parameter text: The JSON text
+    Precondition: text is a string that json.loads accepts
+
+    Parameter offset: Where to start looking for the value (white space is skipped)
+    Precondition: offset is an int >= 0
+
+    Parameter path: The path to the value
+    Precondition: path is a tuple
+
+    Parameter offsets: The offsets found so far, by path
+    Precondition: offsets is a dictionary
+    """
+    offset = _SPACE.match(text,offset).end()
+    offsets[path] = offset
+    char = text[offset]
+    if char == '"':
+        return json.decoder.scanstring(text,offset+1)[1]
+    elif char == '{' or char == '[':
+        close = '}' if char == '{' else ']'
+        offset = _SPACE.match(text,offset+1).end()
+        index = 0
+        while text[offset] != close:
+            if char == '{':
+                (key,offset) = json.decoder.scanstring(text,offset+1)
+                offset = _SPACE.match(text,offset).end()+1    # Skip the colon
+            else:
+                key = index
+            offset = _locateValue(text,offset,path+(key,),offsets)
+            offset = _SPACE.match(text,offset).end()
+            if text[offset] == ',':
+                offset = _SPACE.match(text,offset+1).end()
+            index += 1
+        return offset+1
+
+    for literal in _LITERALS:
+        if text.startswith(literal,offset):
+            return offset+len(literal)
+    return _NUMBER.match(text,offset).end()
+
+
+def _findLevels(folder):
+    """
+    Returns the sorted list of paths to the level files in a folder
+
+    Every JSON file in the folder is a level file, except for OBJECT_DATA.
+
+    Parameter folder: The folder to search
+    Precondition: folder is a string naming a folder
+    """
+    paths = []
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith('.json') and name != OBJECT_DATA:
+            paths.append(os.path.join(folder,name))
+    return paths
+
+
+def _main(argv):
+    """
+    Runs the validator from the command line, returning the exit status
+
+    The options are --workers=N and --no-compile (to only check the files).  Any
+    other argument is a folder of levels or a level file.  With no folders or files,
+    every level in the JSON folder is checked.  An unknown option (or a number of
+    workers that is not a positive int) stops the validator with exit status 2,
+    before anything is checked.
+
+    Parameter argv: The command line arguments (without the script name)
+    Precondition: argv is a list of strings
+    """
+    workers = None
+    save = True
+    paths = []
+    for arg in argv:
+        value = arg[len('--workers='):]
+        if arg.startswith('--workers=') and value.isdigit() and int(value) > 0:
+            workers = int(value)
+        elif arg == '--no-compile':
+            save = False
+        elif arg.startswith('-'):
+            kind = 'invalid' if arg.startswith('--workers=') else 'unknown'
+            print('%s option %s' % (kind,arg))
+            print('usage: python validate.py [--workers=N] [--no-compile] '
+                  '[folder ...] [level.json ...]')
+            return 2
+        elif os.path.isdir(arg):
+            paths.extend(_findLevels(arg))
+        else:
+            paths.append(arg)
+    if argv == [] or all(arg.startswith('--') for arg in argv):
+        paths = _findLevels(JSON_FOLDER)
+
+    failed = 0
+    for (path,problems) in run(paths,workers,save):
+        for (line,column,message) in problems:
+            if line is None:
+                print('%s: %s' % (path,message))
+            else:
+                print('%s:%d:%d: %s' % (path,line,column,message))
+        failed += problems != []
+    print('%d of %d level files are valid' % (len(paths)-failed,len(paths)))
+    return 1 if failed > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(_main(sys.argv[1:]))